@@ -15,49 +15,64 @@ The most important functionalities include functions to
     - calculate a user's worst habit(s) (i.e., the habit(s) with the longest streak of all habits)
 """
 
-from datetime import date, timedelta
-
-import pandas as pd
+import sys
+from datetime import date
 
+import cache
 import db
 import habit as hb
+import profiling
+from results import Table
+from periods import calculate_period_index, calculate_period_indices
 
 
-def create_data_frame(database, table: str):
-    """create a pandas dataframe from one of the database tables
+def create_data_frame(database, table: str, filters: dict = None):
+    """create a pandas dataframe from one of the database tables. Only the rows matching the filters are read from
+    the database.
 
     :param database: the database which contains the desired tables and data ('sqlite3.connection')
     :param table: the table to be created - either "Habit", "HabitAppUser" or "Completions" ('str')
+    :param filters: a dictionary ('dict') with column names ('str') as keys and the values the columns must equal
+    as values (optional), e.g. {"FKUserID": 1}
     :return: a data frame containing the table's data ('pandas.core.frame.DataFrame')
     """
-    habit_columns = ["PKHabitID", "FKUserID", "Name", "Periodicity", "CreationTime"]
-    user_columns = ["PKUserID", "UserName"]
-    completions_columns = ["PKCompletionsID", "FKHabitID", "CompletionDate", "CompletionTime"]
-    column_names = {"Habit": habit_columns, "HabitAppUser": user_columns, "Completions": completions_columns}
-    sql_query = pd.read_sql_query(f'''SELECT * FROM {table}''', database)
-    return pd.DataFrame(sql_query, columns=column_names[table])
+    import pandas as pd  # pandas is only imported when a data frame is created, which speeds up the app's start
+    sql_query, parameters = db.build_select_query(table, filters)
+    data = pd.read_sql_query(sql_query, database, params=parameters)
+    return pd.DataFrame(data, columns=db.TABLE_COLUMNS[table])
 
 
 def check_for_username(user):
-    """check if the entered username is already used in the database where the user data is stored
+    """check if the entered username is already used in the database where the user data is stored. If it is,
+    the user's id is stored in the user's 'user_id' attribute.
 
     :param user: the user ('user.UserDB')
     :return: True if the user name already exists, false if not ('bool')
     """
-    user_df = create_data_frame(user.database, "HabitAppUser")
-    users = list(user_df["UserName"])
-    return True if user.username in users else False
+    user_id = db.return_username_index(user.database).get(user.username)
+    if user_id is None:  # the user might have been created through another database connection
+        users = db.select_rows(user.database, "HabitAppUser", {"UserName": user.username}, ["PKUserID"])
+        if len(users) > 0:
+            user_id = users[0][0]
+            cache.note_username(user.database, user.username, user_id)
+    if user_id is not None:
+        user.user_id = user_id
+    return True if user_id is not None else False
 
 
-def show_habit_data(user):
+def show_habit_data(user, periodicity: str = None):
     """filter the 'Habit' table for habit data of a user
 
     :param user: the user for whom habit data is to be shown ('user.UserDB')
+    :param periodicity: the periodicity of the habits to be shown ('str', optional). If not provided, all of the
+    user's habits are shown.
     :return: a data frame containing only the user's habits and their data ('pandas.core.frame.DataFrame')
     """
     user_id = db.find_user_id(user)
-    habit_df = create_data_frame(user.database, "Habit")
-    return habit_df.loc[habit_df["FKUserID"] == user_id]
+    filters = {"FKUserID": user_id}
+    if periodicity:
+        filters["Periodicity"] = periodicity
+    return create_data_frame(user.database, "Habit", filters)
 
 
 def return_completions(habit):
@@ -67,9 +82,20 @@ def return_completions(habit):
     :return: a list (list) containing all completion dates ('str') of the habit
     """
     habit_id = db.find_habit_id(habit)
-    completions_df = create_data_frame(habit.database, "Completions")
-    habit_data = completions_df.loc[completions_df["FKHabitID"] == habit_id]
-    return habit_data["CompletionDate"].to_list()
+    habit_data = db.select_rows(habit.database, "Completions", {"FKHabitID": habit_id}, ["CompletionDate"])
+    return [completion_date for (completion_date,) in habit_data]
+
+
+def return_completion_days(habit):
+    """return a list of a habit's completion days, i.e., its completion dates as number of days since the first of
+    January 1970, which do not have to be parsed
+
+    :param habit: the habit for which the completion days are to be returned ('habit.HabitDB')
+    :return: a list (list) containing all completion days ('int') of the habit
+    """
+    habit_id = db.find_habit_id(habit)
+    habit_data = db.select_rows(habit.database, "Completions", {"FKHabitID": habit_id}, ["CompletionDay"])
+    return [completion_day for (completion_day,) in habit_data]
 
 
 def return_ordered_periodicities(user):
@@ -90,164 +116,80 @@ def return_habit_info(user, periodicity: str = None):
 
     :param user: the user for whom habit information is to be returned ('user.UserDB')
     :param periodicity: the periodicity for which information is to be returned ('str')
-    :return: a data frame containing the name, periodicity and creation time of the desired habits
-    ('pandas.core.frame.DataFrame')
+    :return: a table containing the name, periodicity and creation time of the desired habits ('results.Table')
     """
-    habit_info = show_habit_data(user)
+    filters = {"FKUserID": db.find_user_id(user)}
     if periodicity:
-        habit_info = habit_info.loc[habit_info["Periodicity"] == periodicity].reset_index()
-    return habit_info[["Name", "Periodicity", "CreationTime"]]
-
-
-def str_to_date(str_dates: list):
-    """convert a list of string dates into a list of datetime dates
-
-    :param str_dates: list ('list') of strings dates ('str')
-    :return: a list ('list') of datetime dates ('date')
-    """
-    return list(map(lambda x: date.fromisoformat(x), str_dates))
-
-
-def weekly_start(check_date):
-    """for the given date, determine the date of the preceding Monday (to determine the period start for weekly
-    habits). The period start is defined as the date of the beginning of the period (i.e., every day
-    for daily habits and every Monday for weekly habits etc.).
+        filters["Periodicity"] = periodicity
+    columns = ["Name", "Periodicity", "CreationTime"]
+    return Table(columns, db.select_rows(user.database, "Habit", filters, columns))
 
-    :param check_date: the completion date for which the period start is to be determined ('date')
-    :return: the date of the Monday before the passed in date ('date')
-    """
-    diff_to_monday = timedelta(days=check_date.weekday())
-    return check_date - diff_to_monday
-
-
-def monthly_start(check_date):
-    """determine the first day of the month of the specified date
-
-    :param check_date: the completion date for which the period start is to be determined ('date')
-    :return: the first day of the passed in month ('date')
-    """
-    diff_to_first = timedelta(days=check_date.day - 1)
-    return check_date - diff_to_first
-
-
-def yearly_start(check_date):
-    """determine the first day of the year of the specified date
 
-    :param check_date: the completion date for which the period start is to be determined ('date')
-    :return: the first day of the passed in year ('date')
-    """
-    return date.fromisoformat(f"{check_date.year}-01-01")
-
-
-def calculate_period_starts(periodicity: str, check_dates):
-    """for each completion date of a habit, calculate the period start. The period start is defined as the
-    date of the beginning of the period (i.e., every day for daily habits and every Monday for weekly habits etc.)
-
-    :param periodicity: the habit's periodicity ('str')
-    :param check_dates: a list ('list') of the habit's completion dates (dates: 'date' or 'str')
-    :return: a list ('list') of period starts ('date') - can contain duplicates
-    """
-    if isinstance(check_dates[0], str):  # are dates already in date format?
-        check_dates = str_to_date(check_dates)
-    period_start_funcs = {
-        "daily": (lambda x: x),
-        "weekly": weekly_start,
-        "monthly": monthly_start,
-        "yearly": yearly_start
-    }
-    period_start_func = period_start_funcs[periodicity]  # determine the correct function to calculate period starts
-    return list(map(period_start_func, check_dates))  # calculate for each completion date the period start
-
-
-def calculate_one_period_start(periodicity: str, check_date):
-    """calculate the beginning of the period in which a habit with the specified periodicity was completed
+# prepare for streak and break analysis (periods are compared by their indices, i.e., with integer arithmetic)
+def tidy_starts(period_indices: list):
+    """remove duplicates in the inserted list and sort its elements
 
-    :param periodicity: the habit's periodicty ('str')
-    :param check_date: the date the habit was checked off ('date')
-    :return: the start of the period ('date')
+    :param period_indices: a list ('list') of period indices ('int')
+    :return: a sorted list ('list') of period indices ('int') without duplicates
     """
-    period_start = calculate_period_starts(periodicity, [check_date])
-    return period_start[0]
+    return sorted(list(set(period_indices)))
 
 
-def tidy_starts(period_starts: list):
-    """remove duplicates in the inserted list and sort its elements
+def calculate_element_diffs(final_periods: list):
+    """calculate the differences between two consecutive elements in a list
 
-    :param period_starts: a list ('list') of period starts ('date')
-    :return: a sorted list ('list') of period starts ('date') without duplicates
+    :param final_periods: a list ('list') of numbers ('int'), e.g., the positions of a habit's streak breaks
+    :return: a list ('list') of differences ('int') between two consecutive elements
     """
-    return sorted(list(set(period_starts)))
+    return [t - s for s, t in zip(final_periods, final_periods[1:])]
 
 
-def return_allowed_time(periodicity: str):
-    """check what time difference is allowed between two habit completions according to the habit's periodicity
-    so that the streak is not broken
+def add_future_period_index(tidy_period_indices: list, periodicity: str):
+    """add the index of a future period to calculate streaks and breaks correctly
 
+    :param tidy_period_indices: the sorted list ('list') of period indices ('int') without duplicates
     :param periodicity: the habit's periodicity ('str')
-    :return: the allowed time difference ('timedelta')
+    :return: a list ('list') of period indices ('int') including the future period
     """
-    timeliness = {"daily": timedelta(days=1),
-                  "weekly": timedelta(days=7),
-                  "monthly": timedelta(days=32),  # if a habit has not been completed in a month, the timedelta is at
-                  # least 58 days
-                  "yearly": timedelta(days=366)
-                  }
-    return timeliness[periodicity]
+    cur_period = calculate_period_index(periodicity, date.today())
+    tidy_period_indices.append(cur_period + 2)  # at least one period distance to the current period
+    return tidy_period_indices
 
 
-def add_future_period(tidy_period_starts: list, periodicity: str):
-    """add a future period to calculate streaks and breaks correctly
+def calculate_final_period_indices(check_days: list, periodicity: str):
+    """turn a habit's completion days into a clean list of the indices of the periods, in which the habit was
+    performed at least once, including a future period to correctly calculate streaks and breaks. The indices of
+    two consecutive periods differ by exactly one.
 
-    :param tidy_period_starts: the sorted list ('list') of period starts ('dates') without duplicates
+    :param check_days: a list ('list') of the habit's completion days ('int', number of days since the first of
+    January 1970)
     :param periodicity: the habit's periodicity ('str')
-    :return: a list ('list') of period starts ('date') including the calculated future period
+    :return: a clean list ('list') of period indices ('int')
     """
-    period_starts = tidy_period_starts  # to not change the actual list
-    duration = return_allowed_time(periodicity)  # approximate duration of a period
-    future_period = calculate_one_period_start(periodicity, date.today() + 2 * duration)  # calculate a future period
-    # with at least one period distance to the current period
-    period_starts.append(future_period)
-    return period_starts
+    period_indices = calculate_period_indices(periodicity, check_days)
+    return add_future_period_index(tidy_starts(period_indices), periodicity)
 
 
-# prepare for streak and break analysis
-def return_final_period_starts(habit):
-    """prepare for streak and break analysis by performing all functions necessary to return a clean list of periods,
-    in which the habit was performed at least once, including the future period to correctly calculate streaks and
-    break indices.
+def return_final_period_indices(habit):
+    """return a clean list of the indices of the periods, in which the habit was performed at least once,
+    including a future period to correctly calculate streaks and breaks.
 
     :param habit: the habit which is to be analyzed ('habit.HabitDB')
-    :return: a clean list ('list') of period starts ('date'), denoting the start of periods,
-    in which the habit was performed at least once
+    :return: a clean list ('list') of period indices ('int')
     """
-    check_dates = return_completions(habit)
-    period_starts = calculate_period_starts(habit.periodicity, check_dates)
-    tidy_periods = tidy_starts(period_starts)
-    return add_future_period(tidy_periods, habit.periodicity)
+    check_days = return_completion_days(habit)
+    return calculate_final_period_indices(check_days, habit.periodicity)
 
 
-def calculate_element_diffs(final_periods: list):
-    """calculate the differences between two consecutive elements in a list
+def calculate_break_positions(final_indices: list):
+    """for the final period indices, return the positions of the periods, after which a habit streak was broken
+    (i.e., the positions after which a consecutive period is missing)
 
-    :param final_periods: clean list ('list') of dates ('date') that correspond to the start
-     of the periods, in which the habit was checked off at least once, including one future period
-    :return: a list ('list') of differences ('timedelta') between two consecutive period starts
+    :param final_indices: clean list ('list') of the indices ('int') of the periods, in which the habit was
+    checked off at least once, including one future period
+    :return: a list ('list') of the positions ('int') which indicate the break of a streak
     """
-    return [t - s for s, t in zip(final_periods, final_periods[1:])]
-
-
-def calculate_break_indices(final_periods: list, periodicity: str):
-    """for the final periods, return the indices of the periods, after which a habit streak was broken
-    (i.e., the indices after which a consecutive period is missing)
-
-    :param final_periods: clean list ('list') of dates ('date') that correspond to the start
-     of the periods, in which the habit was checked off at least once, including one future period
-    :param periodicity: the habit's periodicity ('str')
-    :return: a list ('list') of the indices ('int') which indicate the break of a streak
-    """
-    diffs = calculate_element_diffs(final_periods)
-    allowed_time = return_allowed_time(periodicity)
-    return [index for index, value in enumerate(diffs) if value > allowed_time]
+    return [position for position, (s, t) in enumerate(zip(final_indices, final_indices[1:])) if t - s > 1]
 
 
 def calculate_streak_lengths(habit):
@@ -257,11 +199,21 @@ def calculate_streak_lengths(habit):
     :param habit: the habit for which the streak lengths are to be calculated ('habit.HabitDB')
     :return: a list ('list') of the habit's streak lengths ('int')
     """
-    final_periods = return_final_period_starts(habit)
-    break_indices = calculate_break_indices(final_periods, habit.periodicity)  # due to the added future period,
-    # there is always at least one break index, even if no streak has been broken yet
+    final_indices = return_final_period_indices(habit)
+    return calculate_streak_lengths_of_indices(final_indices)
+
+
+def calculate_streak_lengths_of_indices(final_indices: list):
+    """calculate the length of each streak from a habit's final period indices
+
+    :param final_indices: clean list ('list') of the indices ('int') of the periods, in which the habit was
+    checked off at least once, including one future period
+    :return: a list ('list') of the habit's streak lengths ('int')
+    """
+    break_positions = calculate_break_positions(final_indices)  # due to the added future period,
+    # there is always at least one break position, even if no streak has been broken yet
     streak_lengths = [-1]  # because otherwise the following calculation does not consider the first streak
-    streak_lengths[1:] = break_indices  # append the remaining break indices
+    streak_lengths[1:] = break_positions  # append the remaining break positions
     return calculate_element_diffs(streak_lengths)
 
 
@@ -281,9 +233,25 @@ def habit_creator(user):
     :param user: the user for whom the habit list is to be created ('user.UserDB')
     :return: a list ('list') of the user's habits ('habit.HabitDB')
     """
-    habit_data = show_habit_data(user)
-    names_and_periodicity = habit_data[["Name", "Periodicity"]].values.tolist()
-    return list(map(lambda x: hb.HabitDB(x[0], x[1], user), names_and_periodicity))
+    habit_rows = db.select_rows(user.database, "Habit", {"FKUserID": db.find_user_id(user)},
+                                ["Name", "Periodicity", "PKHabitID"])
+    return list(map(lambda x: hb.HabitDB(x[0], x[1], user, x[2]), habit_rows))
+
+
+def return_habit_registry(user):
+    """return the registry of the user's habits, which maps the habit names to the habits. The registry is created
+    only once per database connection and is renewed after one of the user's habits has been created, modified or
+    deleted, so that habits can be looked up by name without querying the database.
+
+    :param user: the user whose habit registry is to be returned ('user.UserDB')
+    :return: a dictionary ('dict') with the habit names ('str') as keys and the habits ('habit.HabitDB') as values
+    """
+    user_id = db.find_user_id(user)
+    connection_cache = cache.return_connection_cache(user.database)
+    habit_registries = connection_cache.habit_registries if connection_cache is not None else {}
+    if user_id not in habit_registries:
+        habit_registries[user_id] = {habit.name: habit for habit in habit_creator(user)}
+    return habit_registries[user_id]
 
 
 def calculate_longest_streak_per_habit(completed_habits: list):
@@ -297,7 +265,7 @@ def calculate_longest_streak_per_habit(completed_habits: list):
         return None
     else:
         habit_names = [habit.name for habit in completed_habits]
-        longest_streaks = map(calculate_longest_streak, completed_habits)
+        longest_streaks = [habit.take_snapshot().best_streak for habit in completed_habits]  # cached statistics
         return dict(zip(habit_names, longest_streaks))
 
 
@@ -321,21 +289,17 @@ def calculate_longest_streak_of_all(completed_habits: list):
         return longest_streak_of_all, best_habits
 
 
-def completed_in_period(final_periods: list, periodicity: str, period: str):
+def completed_in_period_index(final_indices: list, periodicity: str, period: str):
     """check if the habit was completed in the specified period.
 
-    :param period: the period to check for, either "current" or "previous" ('str')
-    :param final_periods: clean list ('list') of dates ('date') that correspond to the start
-     of the periods, in which the habit was checked off at least once, including one future period
+    :param final_indices: clean list ('list') of the indices ('int') of the periods, in which the habit was
+    checked off at least once, including one future period
     :param periodicity: the habit's periodicity ('str')
-    :return: true if the list of final periods contains the previous period, false otherwise ('bool')
+    :param period: the period to check for, either "current" or "previous" ('str')
+    :return: true if the list of final period indices contains the specified period, false otherwise ('bool')
     """
-    cur_period_start = calculate_one_period_start(periodicity, date.today())
-    if period == "current":
-        return True if cur_period_start in final_periods else False
-    else:
-        prev_period_start = calculate_one_period_start(periodicity, cur_period_start - timedelta(days=1))
-        return True if prev_period_start in final_periods else False
+    cur_period = calculate_period_index(periodicity, date.today())
+    return (cur_period if period == "current" else cur_period - 1) in final_indices
 
 
 def calculate_curr_streak(habit):
@@ -346,34 +310,95 @@ def calculate_curr_streak(habit):
     :return: the current streak (i.e., the current number of consecutive periods in a row, in which the user has
     completed the habit at least once) ('int')
     """
-    final_periods = return_final_period_starts(habit)
+    final_indices = return_final_period_indices(habit)
+    return calculate_curr_streak_of_indices(final_indices, habit.periodicity)
+
+
+def calculate_curr_streak_of_indices(final_indices: list, periodicity: str):
+    """calculate the current streak from a habit's final period indices
+
+    :param final_indices: clean list ('list') of the indices ('int') of the periods, in which the habit was
+    checked off at least once, including one future period
+    :param periodicity: the habit's periodicity ('str')
+    :return: the current streak ('int')
+    """
     # if a habit was not completed in the previous period, the current streak is either 0 (not completed in
     # the current period) or 1 (completed in the current period)
-    if not completed_in_period(final_periods, habit.periodicity, "previous"):
-        return 0 if not completed_in_period(final_periods, habit.periodicity, "current") else 1
+    if not completed_in_period_index(final_indices, periodicity, "previous"):
+        return 0 if not completed_in_period_index(final_indices, periodicity, "current") else 1
     else:
-        streak_lengths = calculate_streak_lengths(habit)
+        streak_lengths = calculate_streak_lengths_of_indices(final_indices)
         return streak_lengths[-1]
 
 
+def last_period_is_current(habit_stats, periodicity: str):
+    """check if the last period in which the habit was completed is the current or the previous period, i.e., if
+    the streak ending in that period is still current
+
+    :param habit_stats: the habit's streak summary ('db.HabitStats')
+    :param periodicity: the habit's periodicity ('str')
+    :return: true if the habit was last completed in the current or the previous period, false otherwise ('bool')
+    """
+    cur_period = calculate_period_index(periodicity, date.today())
+    return cur_period - calculate_period_index(periodicity, habit_stats.last_period) in (0, 1)
+
+
+def calculate_curr_streak_of_stats(habit_stats, periodicity: str):
+    """calculate the current streak from a habit's streak summary without reading its completions
+
+    :param habit_stats: the habit's streak summary ('db.HabitStats')
+    :param periodicity: the habit's periodicity ('str')
+    :return: the current streak ('int')
+    """
+    if not habit_stats.last_period:  # the habit has not been completed yet
+        return 0
+    # the streak ending in the last completed period is only current if it ended in the current or previous period
+    return habit_stats.current_run if last_period_is_current(habit_stats, periodicity) else 0
+
+
 def calculate_break_no(habit):
     """calculate how often a habit's streaks were broken since the first completion
 
     :param habit: the habit which is to be analyzed ('habit.HabitDB')
     :return: the number of breaks ('int')
     """
-    final_periods = return_final_period_starts(habit)
-    break_indices = calculate_break_indices(final_periods, habit.periodicity)
+    final_indices = return_final_period_indices(habit)
+    return calculate_break_no_of_indices(final_indices, habit.periodicity)
+
+
+def calculate_break_no_of_indices(final_indices: list, periodicity: str):
+    """calculate the number of streak breaks from a habit's final period indices
+
+    :param final_indices: clean list ('list') of the indices ('int') of the periods, in which the habit was
+    checked off at least once, including one future period
+    :param periodicity: the habit's periodicity ('str')
+    :return: the number of breaks ('int')
+    """
+    break_positions = calculate_break_positions(final_indices)
     # if the habit was executed in the current or the previous period (since the user can then still complete
-    # the habit in the current period), there is one break less than elements in break indices due to the
+    # the habit in the current period), there is one break less than elements in break positions due to the
     # consideration of the future period
-    curr_period = completed_in_period(final_periods, habit.periodicity, "current")
-    prev_period = completed_in_period(final_periods, habit.periodicity, "previous")
+    curr_period = completed_in_period_index(final_indices, periodicity, "current")
+    prev_period = completed_in_period_index(final_indices, periodicity, "previous")
     if curr_period or prev_period:  # for this reason, the break calculation only works for completion dates
         # in the past or at the current date
-        return len(break_indices) - 1
+        return len(break_positions) - 1
     else:
-        return len(break_indices)
+        return len(break_positions)
+
+
+def calculate_break_no_of_stats(habit_stats, periodicity: str):
+    """calculate the number of streak breaks from a habit's streak summary without reading its completions
+
+    :param habit_stats: the habit's streak summary ('db.HabitStats')
+    :param periodicity: the habit's periodicity ('str')
+    :return: the number of breaks ('int')
+    """
+    if not habit_stats.last_period:  # the habit has not been completed yet
+        return 0
+    # if the habit was not completed in the current or the previous period, the current streak is broken as well
+    current_break = 0 if last_period_is_current(habit_stats, periodicity) else 1
+    return habit_stats.breaks + current_break
 
 
 def calculate_completion_rate(habit):
@@ -385,11 +410,22 @@ def calculate_completion_rate(habit):
     :param habit: the habit whose completion rate is to be calculated ('habit.HabitDB')
     :return: the habit's completion rate during the last four weeks ('float')
     """
-    final_periods = return_final_period_starts(habit)
-    no_possible_periods = 28 if habit.periodicity == "daily" else 4
-    cur_period = calculate_one_period_start(habit.periodicity, date.today())
-    period_4_weeks_ago = calculate_one_period_start(habit.periodicity, (cur_period - timedelta(weeks=4)))
-    completed_periods_4_weeks = list(filter(lambda x: period_4_weeks_ago <= x < cur_period, final_periods))
+    final_indices = return_final_period_indices(habit)
+    return calculate_completion_rate_of_indices(final_indices, habit.periodicity)
+
+
+def calculate_completion_rate_of_indices(final_indices: list, periodicity: str):
+    """calculate the completion rate during the last four weeks from a habit's final period indices (only daily or
+    weekly habits)
+
+    :param final_indices: clean list ('list') of the indices ('int') of the periods, in which the habit was
+    checked off at least once, including one future period
+    :param periodicity: the habit's periodicity ('str')
+    :return: the habit's completion rate during the last four weeks ('float')
+    """
+    no_possible_periods = 28 if periodicity == "daily" else 4
+    cur_period = calculate_period_index(periodicity, date.today())
+    completed_periods_4_weeks = [x for x in final_indices if cur_period - no_possible_periods <= x < cur_period]
     return len(completed_periods_4_weeks) / no_possible_periods
 
 
@@ -403,7 +439,7 @@ def calculate_completion_rate_per_habit(completed_habits: list):
     """
     frequent_habits = [habit for habit in completed_habits if habit.periodicity in ("daily", "weekly")]
     habit_names = [habit.name for habit in frequent_habits]
-    completion_rates = list(map(calculate_completion_rate, frequent_habits))
+    completion_rates = [habit.take_snapshot().completion_rate for habit in frequent_habits]  # cached statistics
     return dict(zip(habit_names, completion_rates))
 
 
@@ -412,24 +448,53 @@ def calculate_worst_completion_rate_of_all(completed_habits: list):
 
     :param completed_habits: a list ('list') of completed habits ('habit.HabitDB')
     :return: a tuple ('tuple') containing the lowest completion rate ('float') and the name(s) of the
-    habit(s) ('str') that have the lowest completion rate(s)
+    habit(s) ('str') that have the lowest completion rate(s), both None if none of the daily or weekly habits has
+    been completed
     """
     completion_rates = calculate_completion_rate_per_habit(completed_habits)
+    if not completion_rates:  # if none of the user's daily or weekly habits have been completed
+        return None, None
     lowest_completion_rate = completion_rates[min(completion_rates, key=completion_rates.get)]
     worst_habits = [key for (key, value) in completion_rates.items() if value == lowest_completion_rate]  # it is
     # possible that two habits have the same completion rates. In this way, both are returned
     return lowest_completion_rate, worst_habits
 
 
+def calculate_user_summary(user):
+    """calculate a user's summary statistics: the longest streak of all habits and the corresponding habit(s), as well
+    as the lowest completion rate of all daily and weekly habits and the corresponding habit(s). The summary is
+    cached until the user's data changes or the day changes.
+
+    :param user: the user whose summary statistics are to be calculated ('user.UserDB')
+    :return: a tuple ('tuple') containing the longest streak ('int'), the names of the habits with the longest
+    streak ('list'), the lowest completion rate ('float') and the names of the habits with the lowest completion rate
+    ('list'). The values are None if none of the user's (daily or weekly) habits has been completed.
+    """
+    def calculate():
+        completed_habits = user.completed_habits
+        longest_streak, best_habits = calculate_longest_streak_of_all(completed_habits)
+        lowest_completion_rate, worst_habits = None, None
+        user_periodicities = return_ordered_periodicities(user)
+        if "daily" in user_periodicities or "weekly" in user_periodicities:  # the completion rate is only
+            # calculated for daily and weekly habits
+            lowest_completion_rate, worst_habits = calculate_worst_completion_rate_of_all(completed_habits)
+        return longest_streak, best_habits, lowest_completion_rate, worst_habits
+
+    return cache.return_cached(user.database, ("user summary", db.find_user_id(user)), calculate)
+
+
 def find_completed_habits(habit_list: list):
     """from a list of habits, identify the habits that have been completed at least once.
 
     :param habit_list: a list ('list') of habits ('habit.HabitDB')
     :return: a list ('list') of habits ('habit.HabitDB') that have been completed at least once
     """
-    check_dates = list(map(return_completions, habit_list))
-    habit_indices = [index for index, value in enumerate(check_dates) if len(value) > 0]
-    return [habit for index, habit in enumerate(habit_list) if index in habit_indices]
+    completed_ids = set()
+    users = {db.find_user_id(habit.user): habit.user for habit in habit_list}
+    for user_id, user in users.items():  # one query per user instead of loading the completions of each habit
+        completed_ids |= cache.return_cached(user.database, ("completed habits", user_id),
+                                             lambda: db.find_completed_habit_ids(user.database, user_id))
+    return [habit for habit in habit_list if db.find_habit_id(habit) in completed_ids]
 
 
 def analysis_index():
@@ -442,24 +507,32 @@ def analyze_all_habits(habit_list: list):
     """provide a detailed analysis of a user's habits that have been completed at least once.
 
     :param habit_list: a list ('list') of all defined habits ('habit.HabitDB') of a user
-    :return: a dataframe ('pandas.core.frame.DataFrame') containing a detailed analysis for each habit
+    :return: a table ('results.Table') containing a detailed analysis for each habit (one column per habit)
     """
     completed_habits = find_completed_habits(habit_list)
     habit_names = [habit.name for habit in completed_habits]
     analysis_data = [habit.analyze_habit() for habit in completed_habits]
-    analysis_dict = dict(zip(habit_names, analysis_data))
-    pd.set_option("display.max_columns", None)  # to show all columns
-    return pd.DataFrame(analysis_dict, index=analysis_index())
+    return Table(habit_names, list(zip(*analysis_data)) if analysis_data else [], analysis_index())
 
 
 def present_habit_analysis(data: list, habit_name: str):
-    """present the analysis of a habit as a data frame.
+    """present the analysis of a habit as a table.
 
     :param data: a list ('list') of the habit's statistics such as the longest streak, the current streak etc.
     :param habit_name: the name of the habit whose analysis is to be presented ('str')
-    :return: a dataframe presenting the habit's statistics ('pandas.core.frame.DataFrame')
+    :return: a table presenting the habit's statistics ('results.Table')
+    """
+    return Table([habit_name], [(value,) for value in data], analysis_index())
+
+
+def list_to_table(analysis: list, data: list):
+    """turn two lists into a table.
+
+    :param analysis: a list ('list') containg the names ('str') of statistics that were calculated
+    :param data: a list ('list') containing the data that is to be displayed
+    :return: a table ('results.Table') with the two lists as columns
     """
-    return pd.DataFrame(data, index=analysis_index(), columns=[habit_name])
+    return Table(["Analysis", "Data"], list(zip(analysis, data)))
 
 
 def list_to_df(analysis: list, data: list):
@@ -469,4 +542,8 @@ def list_to_df(analysis: list, data: list):
     :param data: a list ('list') containing the data that is to be displayed
     :return: a dataframe ('pandas.core.frame.DataFrame') with the two lists as columns
     """
-    return pd.DataFrame({'Analysis': analysis, 'Data': data})
+    return list_to_table(analysis, data).to_data_frame()
+
+
+# the module's public functions are only wrapped if profiling is enabled (see the profiling module)
+profiling.instrument_module(sys.modules[__name__])
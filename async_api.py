@@ -0,0 +1,92 @@
+"""This module contains the habit tracker's asynchronous service interface, which can be used by asyncio-based
+applications (e.g., a web backend) without blocking their event loop. The database and analysis work is run on a
+bounded pool of worker threads, each of which uses one connection of a connection pool at a time, so that no
+connection is used by two operations at once.
+
+The most important functionalities include functions to
+    - create habits (and the user if they do not exist yet)
+    - check off habits
+    - analyze all habits of a user
+
+Usage example:
+    async with HabitService(ConnectionPool("main.db")) as service:
+        await service.create_habit("HarryP", "Feed Hedwig", "daily")
+        await service.check_off("HarryP", "Feed Hedwig")
+        report = await service.analyze_user("HarryP")
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import batch
+
+
+class HabitService:
+    """Every HabitService instance runs the operations of asyncio-based applications on a bounded number of worker
+    threads. By default, there is one worker thread per connection of the connection pool.
+
+    Attributes:
+        pool ('pool.ConnectionPool'): the connection pool which lends the database connections to the worker threads
+        executor ('concurrent.futures.ThreadPoolExecutor'): the worker threads
+    """
+
+    def __init__(self, pool, max_workers: int = None):
+        self.pool = pool
+        self.executor = ThreadPoolExecutor(max_workers if max_workers else pool.max_connections,
+                                           thread_name_prefix="habit-service")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    def call_with_connection(self, function, *args):
+        """call a function with a connection of the pool (run in a worker thread)
+
+        :param function: the function ('function') which is called with the connection and the arguments
+        :return: the function's return value
+        """
+        with self.pool.connection() as database:
+            return function(database, *args)
+
+    async def run(self, function, *args):
+        """run a function in a worker thread without blocking the event loop
+
+        :param function: the function ('function') which is called with a database connection and the arguments
+        :return: the function's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.call_with_connection, function, *args)
+
+    async def create_habit(self, username: str, habit_name: str, periodicity: str):
+        """create a habit (and the user if they do not exist yet)
+
+        :param username: the name of the user who creates the habit ('str')
+        :param habit_name: the name of the habit ('str')
+        :param periodicity: the periodicity of the habit ('str')
+        """
+        await self.run(batch.create_habits, username, periodicity, [habit_name])
+
+    async def check_off(self, username: str, habit_name: str, check_datetime: str = None):
+        """check off a habit of a user
+
+        :param username: the name of the user ('str')
+        :param habit_name: the name of the habit ('str')
+        :param check_datetime: the datetime of the check-off ('str', optional). If not provided, the current datetime
+        is taken.
+        """
+        await self.run(batch.check_off_habits, username, [habit_name], check_datetime)
+
+    async def analyze_user(self, username: str):
+        """analyze all habits of a user
+
+        :param username: the name of the user ('str')
+        :return: a dictionary ('dict') containing the statistics of each habit as well as the user's longest streak
+        and lowest completion rate (see batch.create_report)
+        """
+        return await self.run(batch.create_report, username)
+
+    async def close(self):
+        """wait for the running operations and stop the worker threads (the connection pool is not closed)"""
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
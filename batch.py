@@ -0,0 +1,250 @@
+"""This module contains the habit tracker's non-interactive command line interface, which can be used in scripts
+(e.g., to record completions or to retrieve reports) without answering any prompts. It does not import
+questionary.
+
+The most important functionalities include functions to
+    - create users and habits
+    - check off habits
+    - import completions from a csv file
+    - report the statistics of a user's habits
+    - export a user's habits and completions
+
+Usage examples:
+    python batch.py create HarryP daily "Feed Hedwig" "Conjuring"
+    python batch.py checkoff HarryP "Feed Hedwig" --at "2022-02-01 08:00:00"
+    python batch.py import HarryP completions.csv
+    python batch.py report HarryP
+    python batch.py export HarryP habits.json
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+
+import analyze as ana
+import cache
+import db
+from habit import HabitDB
+from user import UserDB, check_username
+
+PERIODICITIES = ["daily", "weekly", "monthly", "yearly"]
+
+
+def return_user(database, username: str, create: bool = False, commit: bool = True):
+    """return the user with the specified username. If the user is to be created but another connection creates them
+    at the same time, the user created by the other connection is returned.
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param username: the name of the user ('str')
+    :param create: whether the user is to be created if they do not exist yet ('bool')
+    :param commit: whether the creation of the user is committed ('bool'), False if it is committed together with
+    further changes
+    :return: the user ('user.UserDB')
+
+    raise:
+        a ValueError if the user does not exist (and is not to be created) or if the username does not meet the
+        requirements for usernames (see user.check_username)
+    """
+    user = UserDB(username, database)
+    if not ana.check_for_username(user):
+        if not create:
+            raise ValueError(f"A user named {username} does not exist.")
+        error_message = check_username(username)
+        if error_message is not None:
+            raise ValueError(error_message)
+        try:
+            db.add_user(user, commit)
+        except sqlite3.IntegrityError:  # the user has been created by another connection in the meantime
+            cache.clear_indexes(database)
+            if not ana.check_for_username(user):
+                raise
+    return user
+
+
+def create_habits(database, username: str, periodicity: str, habit_names: list):
+    """create habits with the same periodicity (and the user if they do not exist yet). The user and the habits are
+    stored in one transaction.
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param username: the name of the user who creates the habits ('str')
+    :param periodicity: the periodicity of the habits ('str')
+    :param habit_names: the names ('str') of the habits to create ('list')
+    :return: the number of created habits ('int')
+    """
+    user = return_user(database, username, create=True, commit=False)  # committed together with the habits
+    try:
+        existing_names = set(user.habit_names)
+        for habit_name in habit_names:
+            if habit_name in existing_names:
+                raise ValueError(f"The user {username} already has a habit named {habit_name}.")
+            existing_names.add(habit_name)
+        db.add_habits(user, [HabitDB(habit_name, periodicity, user) for habit_name in habit_names])
+    except Exception:
+        database.rollback()  # the user is not stored either
+        cache.clear_indexes(database)
+        raise
+    return len(habit_names)
+
+
+def check_off_habits(database, username: str, habit_names: list, check_datetime: str = None):
+    """check off habits of a user at the same datetime
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param username: the name of the user whose habits are checked off ('str')
+    :param habit_names: the names ('str') of the habits to check off ('list')
+    :param check_datetime: the datetime of the check-off ('str', optional). If not provided, the current datetime is
+    taken.
+    :return: the number of stored completions ('int')
+    """
+    user = return_user(database, username)
+    return db.add_user_completions(user, ((habit_name, check_datetime) for habit_name in habit_names))
+
+
+def read_completions(csv_file):
+    """read completions from a csv file with one completion per row: the habit name and the datetime of the
+    check-off (an optional header row "habit,datetime" is skipped)
+
+    :param csv_file: the opened csv file ('file')
+    :return: a generator ('generator') of tuples ('tuple') containing the habit name ('str') and the datetime
+    ('str' or None if the row does not contain a datetime)
+    """
+    for row_number, row in enumerate(csv.reader(csv_file)):
+        if not row or (row_number == 0 and row[:2] == ["habit", "datetime"]):
+            continue
+        yield row[0], row[1] if len(row) > 1 and row[1] else None
+
+
+def import_completions(database, username: str, csv_file):
+    """import the completions of a user's habits from a csv file. All completions are stored in one transaction, so
+    that either all or none of them are stored.
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param username: the name of the user whose habits were completed ('str')
+    :param csv_file: the opened csv file ('file'), see read_completions
+    :return: the number of stored completions ('int')
+    """
+    user = return_user(database, username)
+    return db.add_user_completions(user, read_completions(csv_file))  # the rows are read while they are stored
+
+
+def create_report(database, username: str):
+    """create a report of the statistics of a user's habits
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param username: the name of the user ('str')
+    :return: a dictionary ('dict') containing the statistics of each habit as well as the user's longest streak and
+    lowest completion rate (None if none of the user's (daily or weekly) habits has been completed)
+    """
+    user = return_user(database, username)
+    habit_reports = []
+    for habit in user.defined_habits:
+        habit_snapshot = habit.take_snapshot()
+        habit_reports.append({
+            "name": habit.name, "periodicity": habit.periodicity,
+            "last_completion": habit_snapshot.last_completion, "longest_streak": habit_snapshot.best_streak,
+            "current_streak": habit_snapshot.current_streak, "breaks": habit_snapshot.breaks_total,
+            "completion_rate": habit_snapshot.completion_rate if habit.periodicity in ("daily", "weekly") else None
+        })
+    completed = [report for report in habit_reports if report["last_completion"]]
+    rated = [report for report in completed if report["completion_rate"] is not None]
+    longest_streak = max((report["longest_streak"] for report in completed), default=None)
+    lowest_completion_rate = min((report["completion_rate"] for report in rated), default=None)
+    return {
+        "user": username, "habits": habit_reports, "longest_streak": longest_streak,
+        "best_habits": [report["name"] for report in completed if report["longest_streak"] == longest_streak],
+        "lowest_completion_rate": lowest_completion_rate,
+        "worst_habits": [report["name"] for report in rated if report["completion_rate"] == lowest_completion_rate]
+    }
+
+
+def export_user_data(database, username: str):
+    """export a user's habits and their completions
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param username: the name of the user ('str')
+    :return: a dictionary ('dict') containing the user's habits, each with its completions ('list')
+    """
+    user = return_user(database, username)
+    habits = {habit.name: {"name": habit.name, "periodicity": habit.periodicity, "completions": []}
+              for habit in user.defined_habits}
+    for habit_name, completion_date, completion_time in db.select_user_completions(user):
+        habits[habit_name]["completions"].append(f"{completion_date} {completion_time}")
+    return {"user": username, "habits": list(habits.values())}
+
+
+def create_parser():
+    """create the parser of the command line arguments
+
+    :return: the parser ('argparse.ArgumentParser')
+    """
+    parser = argparse.ArgumentParser(description="Manage and analyze habits without interactive prompts.")
+    parser.add_argument("--database", default="main.db", help="the database file (default: main.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    habit_parser = subparsers.add_parser("create", help="create habits (and the user if necessary)")
+    habit_parser.add_argument("username")
+    habit_parser.add_argument("periodicity", choices=PERIODICITIES)
+    habit_parser.add_argument("habits", nargs="+", help="the names of the habits")
+
+    checkoff_parser = subparsers.add_parser("checkoff", help="check off habits")
+    checkoff_parser.add_argument("username")
+    checkoff_parser.add_argument("habits", nargs="+", help="the names of the habits")
+    checkoff_parser.add_argument("--at", dest="check_datetime", help="the datetime of the check-off "
+                                                                     "(default: now), e.g. '2022-02-01 08:00:00'")
+
+    import_parser = subparsers.add_parser("import", help="import completions from a csv file (habit,datetime)")
+    import_parser.add_argument("username")
+    import_parser.add_argument("file", type=argparse.FileType("r"), help="the csv file ('-' for stdin)")
+
+    report_parser = subparsers.add_parser("report", help="print the statistics of a user's habits as json")
+    report_parser.add_argument("username")
+
+    export_parser = subparsers.add_parser("export", help="export a user's habits and completions as json")
+    export_parser.add_argument("username")
+    export_parser.add_argument("file", nargs="?", type=argparse.FileType("w"),
+                               help="the json file (default: stdout)")
+    return parser
+
+
+def run_command(database, args):
+    """run the command specified by the parsed command line arguments
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :param args: the parsed command line arguments ('argparse.Namespace')
+    """
+    if args.command == "create":
+        print(f"Created {create_habits(database, args.username, args.periodicity, args.habits)} habit(s).")
+    elif args.command == "checkoff":
+        print(f"Checked off {check_off_habits(database, args.username, args.habits, args.check_datetime)} habit(s).")
+    elif args.command == "import":
+        print(f"Imported {import_completions(database, args.username, args.file)} completion(s).")
+    elif args.command == "report":
+        print(json.dumps(create_report(database, args.username), indent=2))
+    else:  # args.command == "export"
+        export_file = args.file if args.file else sys.stdout
+        json.dump(export_user_data(database, args.username), export_file, indent=2)
+        export_file.write("\n")
+
+
+def main(argv: list = None):
+    """parse the command line arguments and run the command
+
+    :param argv: the command line arguments ('list', optional). If not provided, sys.argv is used.
+    :return: the exit code ('int'): 0 if the command succeeded, 1 if not
+    """
+    args = create_parser().parse_args(argv)
+    database = db.get_db(args.database)
+    try:
+        run_command(database, args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        database.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
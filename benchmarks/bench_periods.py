@@ -0,0 +1,77 @@
+"""This script benchmarks the streak and break calculation based on period indices (integer arithmetic) against
+the previous calculation based on period start dates and timedelta thresholds for long completion histories.
+
+Run it from the repository's root directory:
+
+    python benchmarks/bench_periods.py
+"""
+
+import os
+import random
+import sys
+import timeit
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyze as ana  # noqa: E402
+import periods  # noqa: E402
+
+
+def create_history(no_years: int, periodicity: str, seed: int = 1):
+    """create a completion history with randomly missed periods that ends today
+
+    :param no_years: the number of years covered by the history ('int')
+    :param periodicity: the habit's periodicity ('str')
+    :param seed: the seed of the random number generator ('int')
+    :return: a tuple ('tuple') of the completion dates ('str') and the completion days ('int')
+    """
+    rng = random.Random(seed)
+    today = periods.date_to_day(date.today())
+    step = {"daily": 1, "weekly": 7, "monthly": 30, "yearly": 365}[periodicity]
+    check_days = [day for day in range(today - no_years * 365, today + 1, step) if rng.random() < 0.9]
+    return [str(periods.day_to_date(day)) for day in check_days], check_days
+
+
+def streaks_from_period_starts(check_dates: list, periodicity: str):
+    """calculate the streak lengths, current streak and breaks with period start dates and timedelta thresholds (the
+    calculation the analysis module used before it switched to period indices, kept here as the reference)"""
+    allowed_time = periods.return_allowed_time(periodicity)
+    final_periods = sorted(set(periods.calculate_period_starts(periodicity, check_dates)))
+    final_periods.append(periods.calculate_one_period_start(periodicity, date.today() + 2 * allowed_time))
+    break_indices = [index for index, (s, t) in enumerate(zip(final_periods, final_periods[1:]))
+                     if t - s > allowed_time]
+    streak_lengths = ana.calculate_element_diffs([-1] + break_indices)
+    cur_period_start = periods.calculate_one_period_start(periodicity, date.today())
+    completed = cur_period_start in final_periods or \
+        periods.calculate_previous_period_start(periodicity, cur_period_start) in final_periods
+    return streak_lengths, streak_lengths[-1] if completed else 0, len(break_indices) - completed
+
+
+def streaks_from_period_indices(check_days: list, periodicity: str):
+    """calculate the streak lengths, current streak and breaks with the period index based functions"""
+    final_indices = ana.calculate_final_period_indices(check_days, periodicity)
+    streak_lengths = ana.calculate_streak_lengths_of_indices(final_indices)
+    return streak_lengths, ana.calculate_curr_streak_of_indices(final_indices, periodicity), \
+        ana.calculate_break_no_of_indices(final_indices, periodicity)
+
+
+def main():
+    """benchmark both streak calculations on long completion histories of each periodicity, check that their
+    results agree and print their times and the speedup"""
+    print(f"{'periodicity':<12}{'years':>6}{'completions':>13}{'dates (ms)':>13}{'indices (ms)':>14}{'speedup':>9}")
+    for periodicity, no_years in [("daily", 10), ("daily", 50), ("weekly", 50), ("monthly", 200)]:
+        check_dates, check_days = create_history(no_years, periodicity)
+        assert streaks_from_period_starts(check_dates, periodicity) == \
+               streaks_from_period_indices(check_days, periodicity)  # both calculations must agree
+        number = 20
+        date_time = min(timeit.repeat(lambda: streaks_from_period_starts(check_dates, periodicity),
+                                      number=number, repeat=5)) / number
+        index_time = min(timeit.repeat(lambda: streaks_from_period_indices(check_days, periodicity),
+                                       number=number, repeat=5)) / number
+        print(f"{periodicity:<12}{no_years:>6}{len(check_days):>13}{date_time * 1000:>13.3f}"
+              f"{index_time * 1000:>14.3f}{date_time / index_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""This script benchmarks the import time of the habit tracker's entry points (the cold start before the first
+prompt or command) and fails if the median import time exceeds a budget or if modules that should only be loaded
+on demand (e.g., pandas) are imported at start-up.
+
+Run it from the repository's root directory:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 400 --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ["main", "batch", "pipe"]
+LAZY_MODULES = ["pandas", "numpy", "test_data"]
+
+
+def measure_import(module: str):
+    """import a module in a fresh interpreter and measure the time until the import has finished
+
+    :param module: the name of the module to import ('str')
+    :return: a tuple ('tuple') containing the wall time in milliseconds ('float') and the names of the lazily
+    loaded modules that were imported nevertheless ('list')
+    """
+    code = f"import sys; import {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPOSITORY, capture_output=True, text=True,
+                            check=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, [name for name in result.stdout.strip().split(",") if name]
+
+
+def measure_interpreter():
+    """measure the start-up time of a bare interpreter, which is subtracted from the import times
+
+    :return: the wall time in milliseconds ('float')
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    """parse the command line arguments and measure the median import time of each entry point (without the
+    interpreter's own start-up time) as well as the lazily loaded modules it imports
+
+    :return: the exit code ('int'), 1 if an entry point exceeds the budget or imports lazily loaded modules, else 0
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="the number of measurements per entry point")
+    parser.add_argument("--budget-ms", type=float, default=500,
+                        help="the maximum median import time per entry point in milliseconds")
+    args = parser.parse_args()
+
+    baseline = statistics.median(measure_interpreter() for _ in range(args.runs))
+    failed = False
+    print(f"{'entry point':<12}{'median import time':>20}  lazily loaded modules imported")
+    for module in ENTRY_POINTS:
+        measurements = [measure_import(module) for _ in range(args.runs)]
+        import_time = statistics.median(elapsed for elapsed, _ in measurements) - baseline
+        eager_modules = measurements[0][1]
+        print(f"{module:<12}{import_time:>17.1f} ms  {', '.join(eager_modules) or '-'}")
+        failed = failed or import_time > args.budget_ms or bool(eager_modules)
+    if failed:
+        print(f"Start-up budget of {args.budget_ms:.0f} ms exceeded or lazily loaded modules imported.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
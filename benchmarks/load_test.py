@@ -0,0 +1,169 @@
+"""This script load-tests the habit tracker's HTTP server (server.py). It starts the server on a synthetic dataset
+(or uses a running server), sends a mix of requests from several client threads over kept-alive connections and
+reports the throughput and the latency percentiles.
+
+Run it from the repository's root directory:
+
+    python benchmarks/load_test.py --users 200 --clients 16 --duration 10 --target 100
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --usernames HarryP HermioneG
+
+The script exits with code 1 if the throughput is below the target (requests per second) or if a request failed.
+"""
+
+import argparse
+import http.client
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from urllib.parse import quote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+from pool import ConnectionPool  # noqa: E402
+from server import HabitServer  # noqa: E402
+from synthetic_data import SyntheticData  # noqa: E402
+
+# the share of each kind of request in the mix
+REQUEST_MIX = {"habits": 0.3, "analysis": 0.4, "summary": 0.2, "checkoff": 0.1}
+
+
+def start_server(no_users: int, workers: int, connections: int, directory: str):
+    """store a synthetic dataset in a database file and start the server on a free port
+
+    :param no_users: the number of users of the dataset ('int')
+    :param workers: the number of worker threads of the server ('int')
+    :param connections: the maximum number of database connections of the server ('int')
+    :param directory: the directory in which the database file is stored ('str')
+    :return: a tuple ('tuple') containing the server ('server.HabitServer') and the users' habits ('dict' of
+    username and habit names)
+    """
+    database_path = os.path.join(directory, "load_test.db")
+    database = db.get_db(database_path)
+    synthetic_data = SyntheticData(no_users=no_users, habits_per_user=10, no_years=1, end_date=date.today(), seed=1)
+    synthetic_data.create_test_data(database)
+    user_habits = {user.username: [] for user in synthetic_data.users}
+    for habit in synthetic_data.habits:
+        user_habits[habit.user.username].append(habit.name)
+    database.close()
+    server = HabitServer(("127.0.0.1", 0), ConnectionPool(database_path, connections), workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, {username: habits for username, habits in user_habits.items() if habits}
+
+
+def create_path(user_habits: dict, rng: random.Random):
+    """choose a request from the request mix
+
+    :param user_habits: the users' habit names by username ('dict')
+    :param rng: the random number generator of the client ('random.Random')
+    :return: a tuple ('tuple') containing the request method ('str') and the path ('str')
+    """
+    kind = rng.choices(list(REQUEST_MIX), weights=list(REQUEST_MIX.values()))[0]
+    username = rng.choice(list(user_habits))
+    habit_names = user_habits[username]
+    if kind in ("habits", "summary") or not habit_names:
+        return "GET", f"/users/{quote(username)}/{'summary' if kind == 'summary' else 'habits'}"
+    habit_path = f"/users/{quote(username)}/habits/{quote(rng.choice(habit_names))}"
+    return ("POST", f"{habit_path}/checkoff") if kind == "checkoff" else ("GET", f"{habit_path}/analysis")
+
+
+def run_client(host: str, port: int, user_habits: dict, end_time: float, seed: int, latencies: list, errors: list):
+    """send requests over one kept-alive connection until the end time
+
+    :param host: the server's host ('str')
+    :param port: the server's port ('int')
+    :param user_habits: the users' habit names by username ('dict')
+    :param end_time: the time (time.perf_counter) at which the client stops ('float')
+    :param seed: the seed of the client's random number generator ('int')
+    :param latencies: the list to which the latencies in seconds ('float') are appended
+    :param errors: the list to which the failed requests ('str') are appended
+    """
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    while time.perf_counter() < end_time:
+        method, path = create_path(user_habits, rng)
+        start = time.perf_counter()
+        try:
+            connection.request(method, path)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{method} {path}: {e}")
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status >= 400:
+            errors.append(f"{method} {path}: {response.status}")
+    connection.close()
+
+
+def percentile(values: list, share: float):
+    """return a percentile of sorted values
+
+    :param values: the sorted values ('list')
+    :param share: the share of values below the percentile, e.g., 0.99 for p99 ('float')
+    :return: the percentile ('float')
+    """
+    return values[min(int(share * len(values)), len(values) - 1)] if values else 0.0
+
+
+def main():
+    """parse the command line arguments, send the request mix to the server from several clients for the specified
+    duration and print the throughput, the latency percentiles and the failed requests
+
+    :return: the exit code ('int'), 1 if a request failed or the throughput is below the target, else 0
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="the url of a running server (default: start a server on synthetic data)")
+    parser.add_argument("--usernames", nargs="+",
+                        help="the users whose habit lists and summaries are requested (with --url)")
+    parser.add_argument("--users", type=int, default=200, help="the number of synthetic users (default: 200)")
+    parser.add_argument("--workers", type=int, default=16, help="the server's worker threads (default: 16)")
+    parser.add_argument("--connections", type=int, default=8, help="the server's database connections (default: 8)")
+    parser.add_argument("--clients", type=int, default=16, help="the number of concurrent clients (default: 16)")
+    parser.add_argument("--duration", type=float, default=10, help="the duration in seconds (default: 10)")
+    parser.add_argument("--target", type=float, default=0, help="the minimum throughput in requests per second")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        if args.url:
+            host, port = urlsplit(args.url).hostname, urlsplit(args.url).port
+            user_habits = {username: [] for username in args.usernames or []}
+            if not user_habits:
+                parser.error("--usernames is required with --url")
+        else:
+            server, user_habits = start_server(args.users, args.workers, args.connections, directory)
+            host, port = "127.0.0.1", server.server_port
+        latencies, errors = [], []
+        end_time = time.perf_counter() + args.duration
+        clients = [threading.Thread(target=run_client, args=(host, port, user_habits, end_time, seed, latencies,
+                                                             errors)) for seed in range(args.clients)]
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.perf_counter() - start
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    latencies.sort()
+    throughput = len(latencies) / elapsed
+    print(f"{len(latencies)} requests in {elapsed:.1f} s: {throughput:.1f} requests/s, "
+          f"p50 {percentile(latencies, 0.5) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, "
+          f"{len(errors)} error(s)")
+    for error in errors[:10]:
+        print(f"    {error}")
+    if errors or throughput < args.target:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""This script benchmarks the hot paths of the analysis and database modules on synthetic datasets of several sizes.
+It reports the throughput (operations per second) and the peak memory allocated by each benchmark, stores the results
+as json and compares them with the results of a previous run, so that regressions between commits are detected.
+
+Run it from the repository's root directory:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --sizes small medium --baseline results.json --threshold 0.2
+
+The script exits with code 1 if the throughput of a benchmark is more than the threshold (default: 20 %) below the
+throughput in the baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyze as ana  # noqa: E402
+import cache  # noqa: E402
+import db  # noqa: E402
+from synthetic_data import SyntheticData  # noqa: E402
+
+# the number of users of each dataset (with ten habits per user on average)
+SIZES = {"small": 20, "medium": 200, "large": 2000}
+END_DATE = date(2022, 12, 31)  # fixed, so that all runs use the same data
+
+
+def create_dataset(no_users: int):
+    """create an in-memory database containing a synthetic population
+
+    :param no_users: the number of users ('int')
+    :return: the synthetic data ('synthetic_data.SyntheticData'), which holds the database connection
+    """
+    synthetic_data = SyntheticData(no_users=no_users, habits_per_user=10, no_years=3, end_date=END_DATE, seed=1)
+    synthetic_data.create_test_data(db.get_db(":memory:"))
+    return synthetic_data
+
+
+def measure(operation, items: list, min_time: float = 0.2, repeat: int = 5):
+    """run an operation for every item and measure the throughput and the peak memory allocated during one pass
+    over all items. The passes are repeated until the minimum time has passed, and the best of several such rounds
+    is reported to reduce noise. Cached results are invalidated before every operation, so that the uncached hot
+    path is measured.
+
+    :param operation: the function ('function') to benchmark, called with one item
+    :param items: the items ('list') the operation is called with
+    :param min_time: the minimum measuring time per round in seconds ('float')
+    :param repeat: the number of rounds ('int')
+    :return: a dictionary ('dict') containing the number of operations per second ('float') and the peak memory
+    in KiB ('float')
+    """
+    def run_pass():
+        for item in items:
+            cache.note_write(database)
+            operation(item)
+
+    database = items[0].database
+    tracemalloc.start()
+    run_pass()
+    peak_memory = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    ops_per_sec = 0
+    for _ in range(repeat):
+        no_operations, start = 0, time.perf_counter()
+        while time.perf_counter() - start < min_time:
+            run_pass()
+            no_operations += len(items)
+        ops_per_sec = max(ops_per_sec, no_operations / (time.perf_counter() - start))
+    return {"ops_per_sec": ops_per_sec, "peak_memory_kib": peak_memory}
+
+
+def run_benchmarks(size: str, synthetic_data):
+    """run all benchmarks on one dataset
+
+    :param size: the name of the dataset's size ('str')
+    :param synthetic_data: the dataset ('synthetic_data.SyntheticData')
+    :return: a dictionary ('dict') with the benchmark names ('str') as keys and their results ('dict') as values
+    """
+    habits = [habit for habit in synthetic_data.habits if db.find_habit_stats(habit).completion_count > 0][:200]
+    users = [user for user in synthetic_data.users if user.completed_habits][:20]
+    benchmarks = {
+        "calculate_longest_streak": (ana.calculate_longest_streak, habits),
+        "calculate_curr_streak": (ana.calculate_curr_streak, habits),
+        "calculate_break_no": (ana.calculate_break_no, habits),
+        "calculate_completion_rate": (ana.calculate_completion_rate,
+                                      [habit for habit in habits if habit.periodicity in ("daily", "weekly")]),
+        "UserDB.analyze_habits": (lambda user: user.analyze_habits(), users),
+        "find_completed_habits": (lambda user: ana.find_completed_habits(user.defined_habits), users),
+        "db.add_completion": (lambda habit: db.add_completion(habit, "2022-12-31 12:00:00.000000"), habits),
+    }
+    results = {}
+    for name, (operation, items) in benchmarks.items():
+        results[f"{size}/{name}"] = measure(operation, items)
+        print(f"{size:<8}{name:<28}{results[f'{size}/{name}']['ops_per_sec']:>14.1f}"
+              f"{results[f'{size}/{name}']['peak_memory_kib']:>16.1f}")
+    return results
+
+
+def return_commit():
+    """return the hash of the current git commit
+
+    :return: the hash ('str') or None if it cannot be determined
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(results: dict, baseline: dict, threshold: float):
+    """compare the throughput of each benchmark with the baseline
+
+    :param results: the results of the current run ('dict')
+    :param baseline: the results of a previous run ('dict')
+    :param threshold: the tolerated relative decrease in throughput ('float'), e.g., 0.2 for 20 %
+    :return: the names ('str') of the benchmarks whose throughput decreased by more than the threshold ('list')
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+        print(f"{name:<40}{change * 100:>+9.1f} %")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """parse the command line arguments, run the benchmarks on the datasets of the selected sizes and compare the
+    throughput with the baseline, if one is provided
+
+    :return: the exit code ('int'), 1 if the throughput regressed by more than the threshold, else 0
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"],
+                        help="the dataset sizes to benchmark (default: small medium)")
+    parser.add_argument("--output", help="the json file in which the results are stored")
+    parser.add_argument("--baseline", help="a json file with the results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="the tolerated relative decrease in throughput (default: 0.2)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'size':<8}{'benchmark':<28}{'ops/sec':>14}{'peak KiB':>16}")
+    for size in args.sizes:
+        results.update(run_benchmarks(size, create_dataset(SIZES[size])))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"commit": return_commit(), "created": str(datetime.now()), "python": platform.python_version(),
+                       "results": results}, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_results(results, json.load(baseline_file)["results"], args.threshold)
+        if regressions:
+            print(f"Throughput regressions of more than {args.threshold * 100:.0f} %: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""This module contains the habit tracker's functionalities necessary to analyze the completions of many habits
+at once (e.g., for reports across all users) with vectorized numpy operations instead of one habit at a time.
+
+The most important functionalities include functions to
+    - load the completions of all habits (or of one user's habits) from the database
+    - map completion days to period indices (consecutive periods have consecutive indices)
+    - calculate the longest streak, current streak, number of breaks, completion rate and last completion
+      of every habit in one pass over all completions
+"""
+
+from datetime import date
+
+import numpy as np
+
+import periods
+
+PERIODICITY_CODES = {"daily": 0, "weekly": 1, "monthly": 2, "yearly": 3}
+
+
+def calculate_period_indices(periodicity_codes, days):
+    """map completion days to period indices, so that the indices of two consecutive periods differ by exactly one.
+    The index is the number of days, weeks (starting on Monday), months or years since 1970.
+
+    :param periodicity_codes: the periodicity code (see PERIODICITY_CODES) of each completion ('numpy.ndarray')
+    :param days: the completion days (number of days since the first of January 1970) ('numpy.ndarray')
+    :return: the period index of each completion ('numpy.ndarray')
+    """
+    days = np.asarray(days, dtype=np.int64)
+    dates = days.astype("datetime64[D]")
+    return np.select(
+        [periodicity_codes == 0, periodicity_codes == 1, periodicity_codes == 2],
+        [days, (days + 3) // 7,  # the first of January 1970 was a Thursday, so Monday the 29th of December 1969
+         # starts week 0
+         dates.astype("datetime64[M]").astype(np.int64)],
+        dates.astype("datetime64[Y]").astype(np.int64))
+
+
+def load_completions(database, user_id: int = None):
+    """load the completions of all habits (or of one user's habits) as arrays
+
+    :param database: the database connection which stores the completions ('sqlite3.connection')
+    :param user_id: the id of the user whose completions are to be loaded ('int', optional)
+    :return: a tuple ('tuple') of arrays ('numpy.ndarray') containing the habit id, the periodicity code and the
+    completion day of each completion
+    """
+    cursor = database.cursor()
+    sql_query = """SELECT Completions.FKHabitID, Habit.Periodicity, Completions.CompletionDay FROM Completions
+    JOIN Habit ON Habit.PKHabitID = Completions.FKHabitID"""
+    if user_id is None:
+        cursor.execute(sql_query)
+    else:
+        cursor.execute(sql_query + " WHERE Habit.FKUserID = ?", [user_id])
+    rows = cursor.fetchall()
+    habit_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    periodicity_codes = np.fromiter((PERIODICITY_CODES[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+    days = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+    return habit_ids, periodicity_codes, days
+
+
+def calculate_current_period_indices(today=None):
+    """calculate the index of the current period for each periodicity
+
+    :param today: the current date ('date', optional). If not provided, the current date is taken.
+    :return: an array ('numpy.ndarray') of the current period's index, ordered by periodicity code
+    """
+    today_day = periods.date_to_day(today if today else date.today())
+    codes = np.arange(len(PERIODICITY_CODES))
+    return calculate_period_indices(codes, np.full(len(codes), today_day))
+
+
+def analyze_completions(habit_ids, periodicity_codes, days, today=None):
+    """calculate the statistics of all habits contained in the completion arrays at once. The statistics follow the
+    definitions of the analysis module (e.g., a streak is still current if the habit was completed in the
+    previous period).
+
+    :param habit_ids: the habit id of each completion ('numpy.ndarray')
+    :param periodicity_codes: the periodicity code of each completion ('numpy.ndarray')
+    :param days: the completion day of each completion ('numpy.ndarray')
+    :param today: the current date ('date', optional). If not provided, the current date is taken.
+    :return: a dictionary ('dict') of arrays ('numpy.ndarray') with one element per completed habit, ordered by
+    habit id: "habit_id", "longest_streak", "current_streak", "breaks", "completion_rate" (NaN for monthly and
+    yearly habits), "last_day" and "completion_count"
+    """
+    habit_ids = np.asarray(habit_ids, dtype=np.int64)
+    periodicity_codes = np.asarray(periodicity_codes, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    statistics = ["habit_id", "longest_streak", "current_streak", "breaks", "completion_rate", "last_day",
+                  "completion_count"]
+    if len(habit_ids) == 0:  # none of the habits has been completed yet
+        return {statistic: np.zeros(0, np.int64) for statistic in statistics}
+
+    # sort by habit and period
+    period_indices = calculate_period_indices(periodicity_codes, days)
+    order = np.lexsort((period_indices, habit_ids))
+    habit_ids, codes, period_indices, days = habit_ids[order], periodicity_codes[order], period_indices[order], \
+        days[order]
+    first_of_habit = np.r_[True, habit_ids[1:] != habit_ids[:-1]]
+    completed_habits, completion_counts = np.unique(habit_ids, return_counts=True)
+    last_days = np.maximum.reduceat(days, np.flatnonzero(first_of_habit))
+
+    # keep each completed period of a habit only once
+    unique = first_of_habit | np.r_[True, period_indices[1:] != period_indices[:-1]]
+    habit_ids, codes, period_indices = habit_ids[unique], codes[unique], period_indices[unique]
+
+    # a new streak starts with every habit's first period and after every missing period
+    first_of_habit = np.r_[True, habit_ids[1:] != habit_ids[:-1]]
+    streak_starts = first_of_habit | np.r_[True, period_indices[1:] != period_indices[:-1] + 1]
+    streak_ids = np.cumsum(streak_starts) - 1
+    streak_lengths = np.bincount(streak_ids)
+    habit_starts = np.flatnonzero(first_of_habit)
+    habit_ends = np.r_[habit_starts[1:], len(habit_ids)] - 1
+    habit_streak_starts = streak_ids[habit_starts]  # the index of each habit's first streak
+    longest_streaks = np.maximum.reduceat(streak_lengths, habit_streak_starts)
+    streak_counts = np.diff(np.r_[habit_streak_starts, len(streak_lengths)])
+
+    # the last streak is only current if it ended in the current or the previous period
+    habit_codes = codes[habit_starts]
+    last_periods = period_indices[habit_ends]
+    current_periods = calculate_current_period_indices(today)[habit_codes]
+    is_current = (last_periods == current_periods) | (last_periods == current_periods - 1)
+    last_streaks = streak_lengths[streak_ids[habit_ends]]
+
+    # completion rate: share of the last 28 days (daily habits) or 4 weeks (weekly habits) in which the habit was
+    # completed, not counting the current period
+    window = np.where(habit_codes == 0, 28, 4)
+    periods_per_habit = np.diff(np.r_[habit_starts, len(habit_ids)])
+    row_current_periods = np.repeat(current_periods, periods_per_habit)
+    in_window = (period_indices >= row_current_periods - np.repeat(window, periods_per_habit)) & \
+                (period_indices < row_current_periods)
+    completed_in_window = np.add.reduceat(in_window.astype(np.int64), habit_starts)
+    completion_rates = np.where(habit_codes <= 1, completed_in_window / window, np.nan)
+
+    return dict(zip(statistics, [completed_habits, longest_streaks, np.where(is_current, last_streaks, 0),
+                                 streak_counts - 1 + np.where(is_current, 0, 1), completion_rates, last_days,
+                                 completion_counts]))
+
+
+def analyze_all_habits_at_once(database, user_id: int = None, today=None):
+    """load the completions of all habits (or of one user's habits) and calculate all of their statistics at once
+
+    :param database: the database connection which stores the completions ('sqlite3.connection')
+    :param user_id: the id of the user whose habits are to be analyzed ('int', optional)
+    :param today: the current date ('date', optional). If not provided, the current date is taken.
+    :return: a dictionary ('dict') of arrays ('numpy.ndarray') with the statistics of each completed habit
+    (see analyze_completions)
+    """
+    return analyze_completions(*load_completions(database, user_id), today=today)
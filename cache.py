@@ -0,0 +1,181 @@
+"""This module contains the habit tracker's in-process caches, which avoid recalculating (or reloading) data that
+has not changed since it was last calculated.
+
+The most important functionalities include
+    - a bounded cache which evicts the least recently used entries
+    - the cache of a database connection and the version of the data stored in the database
+    - functions to return cached results and to invalidate them when data is written
+    - functions to keep the index of usernames and the registries of the users' habits up to date (also when other
+      connections change the data)
+"""
+
+from collections import OrderedDict
+from datetime import date
+
+
+class LRUCache:
+    """Every LRUCache instance stores a bounded number of entries. If the cache is full, the least recently used
+    entry is removed.
+
+    Attributes:
+        max_size ('int'): the maximum number of entries
+        entries ('collections.OrderedDict'): the cached entries, ordered from the least to the most recently used
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """return the entry with the specified key and mark it as recently used
+
+        :param key: the key of the entry ('tuple')
+        :param default: the value returned if there is no entry with the key (optional)
+        :return: the cached value or the default value
+        """
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        """store an entry and remove the least recently used entry if the cache is full
+
+        :param key: the key of the entry ('tuple')
+        :param value: the value to be cached
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """remove all entries"""
+        self.entries.clear()
+
+
+class ConnectionCache:
+    """Every ConnectionCache instance holds the cached data of one database connection.
+
+    Attributes:
+        write_version ('int'): the number of writes through the connection, which is part of the data version
+        analysis ('cache.LRUCache'): the cached analysis results
+        usernames ('dict'): the index of all usernames ('str') and their user ids ('int') (None until it is loaded)
+        habit_registries ('dict'): the registry of each user's habits by user id ('int'), mapping the habit names
+                                   ('str') to the habits ('habit.HabitDB')
+        index_version ('int'): the version of the data written by other connections when the username index and the
+                               habit registries were last checked
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.write_version = 0
+        self.analysis = LRUCache(max_size)
+        self.usernames = None
+        self.habit_registries = {}
+        self.index_version = None
+
+    def data_version(self, database):
+        """return the version of the data stored in the database. The version changes with every write through
+        this connection as well as with every commit of other connections to the same database.
+
+        :param database: the database connection which holds the cache ('db.HabitConnection')
+        :return: the data version ('tuple')
+        """
+        cursor = database.cursor()
+        cursor.execute("PRAGMA data_version")  # only changes when other connections commit
+        return self.write_version, cursor.fetchone()[0]
+
+
+def return_connection_cache(database):
+    """return the cache of a database connection
+
+    :param database: the database connection ('sqlite3.connection')
+    :return: the connection's cache ('cache.ConnectionCache') or None if the connection cannot hold a cache
+    (connections that have not been created with db.get_db)
+    """
+    return getattr(database, "cache", None)
+
+
+def note_write(database):
+    """invalidate all cached results of a database connection after data has been written
+
+    :param database: the database connection through which data was written ('sqlite3.connection')
+    """
+    connection_cache = return_connection_cache(database)
+    if connection_cache is not None:
+        connection_cache.write_version += 1
+
+
+def note_username(database, username: str, user_id: int):
+    """add a username to the username index of a database connection (if the index has already been loaded)
+
+    :param database: the database connection which stores the user ('sqlite3.connection')
+    :param username: the name of the user ('str')
+    :param user_id: the user's id ('int')
+    """
+    connection_cache = return_connection_cache(database)
+    if connection_cache is not None and connection_cache.usernames is not None:
+        connection_cache.usernames[username] = user_id
+
+
+def note_habit_change(database, user_id: int):
+    """invalidate the habit registry of a user after one of the user's habits has been created, modified or deleted
+
+    :param database: the database connection through which the habit was changed ('sqlite3.connection')
+    :param user_id: the id of the user whose habit was changed ('int')
+    """
+    connection_cache = return_connection_cache(database)
+    if connection_cache is not None:
+        connection_cache.habit_registries.pop(user_id, None)
+
+
+def clear_indexes(database):
+    """discard the username index and all habit registries of a database connection, e.g., after users or habits
+    have been bulk-loaded. They are reloaded when they are used the next time.
+
+    :param database: the database connection through which the data was written ('sqlite3.connection')
+    """
+    connection_cache = return_connection_cache(database)
+    if connection_cache is not None:
+        connection_cache.usernames = None
+        connection_cache.habit_registries.clear()
+
+
+def refresh_indexes(database):
+    """discard the username index and all habit registries of a database connection if other connections (e.g.,
+    other connections of a connection pool) have committed changes since they were last checked
+
+    :param database: the database connection whose indexes are to be checked ('sqlite3.connection')
+    """
+    connection_cache = return_connection_cache(database)
+    if connection_cache is None:
+        return
+    external_version = connection_cache.data_version(database)[1]
+    if external_version != connection_cache.index_version:
+        clear_indexes(database)
+        connection_cache.index_version = external_version
+
+
+def return_cached(database, key: tuple, calculate):
+    """return a cached result or calculate and cache it. Results are cached per data version and day, so that they
+    are recalculated after data has been written as well as on the next day (e.g., current streaks depend on the
+    current date).
+
+    :param database: the database connection whose data the result is based on ('sqlite3.connection')
+    :param key: the key identifying the result, e.g. ("snapshot", habit_id, periodicity) ('tuple')
+    :param calculate: the function ('function') that calculates the result (without arguments)
+    :return: the (cached) result
+    """
+    connection_cache = return_connection_cache(database)
+    if connection_cache is None:
+        return calculate()
+    full_key = key + (connection_cache.data_version(database), date.today())
+    if full_key not in connection_cache.analysis:
+        connection_cache.analysis.put(full_key, calculate())
+    return connection_cache.analysis.get(full_key)
@@ -2,30 +2,84 @@
 
 The most important functionalities include functions to
     - create the database connection and stucture
+    - upgrade the structure of existing databases
     - store data in the database tables
-    - retrieve data from the tables
+    - maintain a summary of each habit's streaks
+    - retrieve (filtered) data from the tables
     - delete or modify data
 """
 
 import sqlite3
+import sys
+import time
 from sqlite3 import Error
-from datetime import datetime
+from collections import namedtuple
+from datetime import date, datetime
+
+import cache
+import periods
+import profiling
+import tracing
+
+BUSY_TIMEOUT = 5  # the number of seconds a connection waits for a lock held by another connection
+
+
+class HabitConnection(sqlite3.Connection):
+    """This class is used for the connections to the habit tracker's databases. It is a subclass of sqlite3's
+    Connection and additionally holds the connection's cache and, if the connection is traced, its query tracer.
+
+    Attributes:
+        cache ('cache.ConnectionCache'): the cache of results calculated from the connection's data
+        tracer ('tracing.QueryTracer'): the tracer which records the executed statements (None if not traced)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache.ConnectionCache()
+        self.tracer = None
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = tracing.TracingCursor if self.tracer is not None else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        if self.tracer is None:
+            return super().execute(*args, **kwargs)
+        return self.cursor().execute(*args, **kwargs)
+
+    def commit(self):
+        if self.tracer is None:
+            return super().commit()
+        start = time.perf_counter()
+        super().commit()
+        self.tracer.add_latency(time.perf_counter() - start)
 
 
 # create database structure and tables
-def get_db(name: str):
-    """create an sqlite database connection with the specified name containing three tables
+def get_db(name: str, check_same_thread: bool = True):
+    """create an sqlite database connection with the specified name containing three tables. Database files are
+    used in write-ahead logging (WAL) mode, so that several connections (e.g., several command line sessions) can
+    read while one connection writes, and connections wait up to BUSY_TIMEOUT seconds for locks held by other
+    connections instead of failing with "database is locked".
 
     :param name: the name of the database connection ('str')
-    :return: a database connection to the sqlite database with the specified name ('sqlite3.connection')
+    :param check_same_thread: whether the connection may only be used by the thread that created it ('bool'),
+    False for connections shared between threads one at a time (e.g., by a connection pool)
+    :return: a database connection to the sqlite database with the specified name ('db.HabitConnection')
     """
     try:
-        database = sqlite3.connect(name)
+        database = sqlite3.connect(name, timeout=BUSY_TIMEOUT, check_same_thread=check_same_thread,
+                                   factory=HabitConnection)
     except Error as e:
         print(e)
     else:
         database.execute("PRAGMA foreign_keys = 1")  # otherwise, on delete cascade does not work
+        if name not in ("", ":memory:"):  # in-memory databases do not support WAL and are not shared
+            database.execute("PRAGMA journal_mode = WAL")
+            database.execute("PRAGMA synchronous = NORMAL")  # safe in WAL mode, only the last commits may be lost
         create_tables(database)
+        tracing.trace_from_environment(database)  # opt-in tracing of the executed statements
         return database
 
 
@@ -58,29 +112,157 @@ def create_tables(database):
     cursor.execute(completions_table)
 
     database.commit()
+    migrate(database)
+
+
+# versioned schema migrations: the n-th entry contains the statements that upgrade a database from schema version
+# n - 1 to n. New migrations must only ever be appended, never changed.
+MIGRATIONS = [
+    # version 1: secondary indexes for the lookups of users, habits and completions
+    ["CREATE INDEX IF NOT EXISTS CompletionsHabitDate ON Completions(FKHabitID, CompletionDate)",
+     "CREATE INDEX IF NOT EXISTS HabitUserName ON Habit(FKUserID, Name)",
+     "CREATE UNIQUE INDEX IF NOT EXISTS HabitAppUserName ON HabitAppUser(UserName)"],
+    # version 2: summary of each habit's streaks, which is maintained when completions are added. Rows of existing
+    # habits are created by version 4.
+    ["""CREATE TABLE IF NOT EXISTS HabitStats
+    (FKHabitID INTEGER PRIMARY KEY, LastPeriod DATE, CurrentRun INTEGER, BestRun INTEGER, Breaks INTEGER,
+    CompletionCount INTEGER,
+    FOREIGN KEY(FKHabitID) REFERENCES Habit(PKHabitID) ON DELETE CASCADE ON UPDATE CASCADE)"""],
+    # version 3: completion dates as number of days since the first of January 1970, which do not have to be
+    # parsed and can be compared in range filters
+    ["ALTER TABLE Completions ADD COLUMN CompletionDay INTEGER",
+     "UPDATE Completions SET CompletionDay = CAST(julianday(CompletionDate) - julianday('1970-01-01') AS INTEGER)",
+     "DROP INDEX IF EXISTS CompletionsHabitDate",
+     "CREATE INDEX IF NOT EXISTS CompletionsHabitDay ON Completions(FKHabitID, CompletionDay)"],
+    # version 4: summaries of the completed habits which were created before version 2, so that reading a summary
+    # never writes. The periods are numbered like in periods.calculate_period_index; consecutive periods form runs
+    # (streaks), since the difference between a period's index and its rank is the same within a run.
+    ["""WITH PeriodIndices AS (
+    SELECT DISTINCT Habit.PKHabitID AS HabitID, Habit.Periodicity AS Periodicity,
+    CASE Habit.Periodicity WHEN 'daily' THEN Completions.CompletionDay
+    WHEN 'weekly' THEN (Completions.CompletionDay + 3) / 7
+    WHEN 'monthly' THEN (CAST(strftime('%Y', Completions.CompletionDate) AS INTEGER) - 1970) * 12
+    + CAST(strftime('%m', Completions.CompletionDate) AS INTEGER) - 1
+    ELSE CAST(strftime('%Y', Completions.CompletionDate) AS INTEGER) - 1970 END AS PeriodIndex
+    FROM Habit JOIN Completions ON Completions.FKHabitID = Habit.PKHabitID
+    WHERE Habit.PKHabitID NOT IN (SELECT FKHabitID FROM HabitStats)),
+    Runs AS (
+    SELECT HabitID, Periodicity, COUNT(*) AS RunLength, MAX(PeriodIndex) AS LastIndex
+    FROM (SELECT *, PeriodIndex - ROW_NUMBER() OVER (PARTITION BY HabitID ORDER BY PeriodIndex) AS RunID
+    FROM PeriodIndices)
+    GROUP BY HabitID, RunID),
+    RankedRuns AS (
+    SELECT *, MAX(RunLength) OVER (PARTITION BY HabitID) AS BestRun, COUNT(*) OVER (PARTITION BY HabitID) - 1 AS Breaks,
+    ROW_NUMBER() OVER (PARTITION BY HabitID ORDER BY LastIndex DESC) AS RunRank
+    FROM Runs)
+    INSERT INTO HabitStats
+    SELECT HabitID,
+    CASE Periodicity WHEN 'daily' THEN date('1970-01-01', printf('%+d days', LastIndex))
+    WHEN 'weekly' THEN date('1970-01-01', printf('%+d days', LastIndex * 7 - 3))
+    WHEN 'monthly' THEN date('1970-01-01', printf('%+d months', LastIndex))
+    ELSE date('1970-01-01', printf('%+d years', LastIndex)) END,
+    RunLength, BestRun, Breaks, (SELECT COUNT(*) FROM Completions WHERE FKHabitID = HabitID)
+    FROM RankedRuns WHERE RunRank = 1"""],
+]
+
+
+def return_schema_version(database):
+    """return the schema version of the database, which is stored in sqlite's user_version
+
+    :param database: the database connection ('sqlite3.connection')
+    :return: the schema version ('int')
+    """
+    cursor = database.cursor()
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def migrate(database):
+    """upgrade the database's schema in place by applying all migrations that have not been applied yet. Each
+    migration is applied in its own transaction together with the update of the schema version. The transactions
+    take the write lock immediately, so that connections opened at the same time (e.g., by a connection pool) apply
+    each migration only once.
+
+    :param database: the database connection whose schema is to be upgraded ('sqlite3.connection')
+    """
+    version = return_schema_version(database)
+    for new_version, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        cursor = database.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            if return_schema_version(database) >= new_version:  # applied by another connection in the meantime
+                database.rollback()
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {new_version}")
+        except Error:
+            database.rollback()
+            raise
+        else:
+            database.commit()
 
 
 # insert data into tables
-def add_user(user):
+def add_user(user, commit: bool = True):
     """store a new user in the 'HabitAppUser' table
 
     :param user: the user who is to be stored in the database ('user.UserDB')
+    :param commit: whether the change is committed ('bool'), False if it is committed together with further
+    changes (e.g., the user's first habits)
     """
     cursor = user.database.cursor()
     cursor.execute("INSERT INTO HabitAppUser(UserName) VALUES (?)", [user.username])
-    user.database.commit()
+    if commit:
+        user.database.commit()
+    cache.note_write(user.database)
+    user.user_id = cursor.lastrowid
+    cache.note_username(user.database, user.username, user.user_id)
+
+
+def return_username_index(database):
+    """return the index of all usernames stored in the database. The index is loaded only once per database
+    connection and is then kept up to date by add_user, so that usernames can be looked up without querying
+    the database.
+
+    :param database: the database connection which stores the user data ('sqlite3.connection')
+    :return: a dictionary ('dict') of all usernames ('str') and their user ids ('int')
+    """
+    connection_cache = cache.return_connection_cache(database)
+    if connection_cache is not None and connection_cache.usernames is not None:
+        return connection_cache.usernames
+    usernames = dict(select_rows(database, "HabitAppUser", columns=["UserName", "PKUserID"]))
+    if connection_cache is not None:
+        connection_cache.usernames = usernames
+    return usernames
+
+
+def insert_users(database, user_rows):
+    """insert several users with predefined ids into the 'HabitAppUser' table (the change is not committed), e.g.,
+    to bulk-load generated data
+
+    :param database: the database connection in which the users are to be stored ('sqlite3.connection')
+    :param user_rows: an iterable of tuples ('tuple') containing the user id ('int') and the username ('str')
+    """
+    cursor = database.cursor()
+    cursor.executemany("INSERT INTO HabitAppUser(PKUserID, UserName) VALUES (?, ?)", user_rows)
+    cache.note_write(database)
+    cache.clear_indexes(database)
 
 
 def find_user_id(user):
-    """find the user id of the user
+    """find the user id of the user. The id is only looked up in the database if the user does not hold it yet and
+    is then stored in the user's 'user_id' attribute.
 
     :param user: the user, whose user id is to be found ('user.UserDB')
     :return: the user's user id ('int')
     """
-    cursor = user.database.cursor()
-    cursor.execute("SELECT PKUserID FROM HabitAppUser WHERE UserName = ?", [user.username])
-    user_id = cursor.fetchone()
-    return user_id[0]
+    if user.user_id is None:
+        cursor = user.database.cursor()
+        cursor.execute("SELECT PKUserID FROM HabitAppUser WHERE UserName = ?", [user.username])
+        user_id = cursor.fetchone()
+        user.user_id = user_id[0]
+    return user.user_id
 
 
 def add_habit(habit, creation_datetime: str = None):
@@ -96,38 +278,200 @@ def add_habit(habit, creation_datetime: str = None):
     cursor.execute("INSERT INTO Habit(FKUserID, Name, Periodicity, CreationTime) VALUES (?, ?, ?, ?)",
                    (user_id, habit.name, habit.periodicity, creation_datetime))
     habit.database.commit()
+    cache.note_write(habit.database)
+    cache.note_habit_change(habit.database, user_id)
+    habit.habit_id = cursor.lastrowid
+
+
+def add_habits(user, habits: list, creation_datetime: str = None):
+    """store several new habits of a user in the 'Habit' table. All habits are committed together.
+
+    :param user: the user who created the habits ('user.UserDB')
+    :param habits: the habits ('habit.HabitDB') to store ('list')
+    :param creation_datetime: the datetime the habits were created ('str')
+    """
+    cursor = user.database.cursor()
+    user_id = find_user_id(user)
+    if not creation_datetime:
+        creation_datetime = str(datetime.now())
+    try:
+        for habit in habits:
+            cursor.execute("INSERT INTO Habit(FKUserID, Name, Periodicity, CreationTime) VALUES (?, ?, ?, ?)",
+                           (user_id, habit.name, habit.periodicity, creation_datetime))
+            habit.habit_id = cursor.lastrowid
+    except Exception:
+        user.database.rollback()
+        raise
+    user.database.commit()
+    cache.note_write(user.database)
+    cache.note_habit_change(user.database, user_id)
+
+
+def insert_habits(database, habit_rows):
+    """insert several habits with predefined ids into the 'Habit' table (the change is not committed), e.g., to
+    bulk-load generated data
+
+    :param database: the database connection in which the habits are to be stored ('sqlite3.connection')
+    :param habit_rows: an iterable of tuples ('tuple') containing the habit id ('int'), the user id ('int'), the
+    name ('str'), the periodicity ('str') and the creation time ('str') of each habit
+    """
+    cursor = database.cursor()
+    cursor.executemany("INSERT INTO Habit(PKHabitID, FKUserID, Name, Periodicity, CreationTime) "
+                       "VALUES (?, ?, ?, ?, ?)", habit_rows)
+    cache.note_write(database)
+    cache.clear_indexes(database)
 
 
 def find_habit_id(habit):
-    """find the habit id of a habit
+    """find the habit id of a habit. The id is only looked up in the database if the habit does not hold it yet and
+    is then stored in the habit's 'habit_id' attribute (it stays valid if the habit is renamed).
 
     :param habit: the habit for which the id is to be found ('habit.HabitDB')
     :return: the habit's id ('int')
     """
-    cursor = habit.database.cursor()
-    user_id = find_user_id(habit.user)
-    cursor.execute("SELECT PKHabitID FROM Habit WHERE Name = ? AND FKUserID = ?",
-                   (habit.name, user_id))
-    habit_id = cursor.fetchone()
-    return habit_id[0]
+    if habit.habit_id is None:
+        cursor = habit.database.cursor()
+        user_id = find_user_id(habit.user)
+        cursor.execute("SELECT PKHabitID FROM Habit WHERE Name = ? AND FKUserID = ?",
+                       (habit.name, user_id))
+        habit_id = cursor.fetchone()
+        habit.habit_id = habit_id[0]
+    return habit.habit_id
+
+
+def split_check_datetime(check_datetime: str = None):
+    """split the datetime of a habit completion into its date and time
+
+    :param check_datetime: the datetime when the habit was checked off ('str'). If no datetime is provided, the
+    current datetime is taken.
+    :return: a tuple ('tuple') containing the completion date ('str') and the completion time ('str')
+
+    raise:
+        a ValueError if the datetime does not consist of a date and a time (e.g., '2022-02-01 08:00:00')
+    """
+    if not check_datetime:
+        check_datetime = str(datetime.now())
+    try:
+        check_date, check_time = check_datetime.split(" ")
+        datetime.fromisoformat(check_datetime)
+    except ValueError:
+        raise ValueError(f"Invalid datetime '{check_datetime}', expected a date and a time such as "
+                         f"'2022-02-01 08:00:00'.") from None
+    return check_date, check_time
+
+
+def create_completion_row(habit_id: int, check_datetime: str = None):
+    """create the row that stores a habit completion in the 'Completions' table
+
+    :param habit_id: the id of the completed habit ('int')
+    :param check_datetime: the datetime when the habit was checked off ('str'). If no datetime is provided, the
+    current datetime is taken.
+    :return: a tuple ('tuple') containing the habit id ('int'), the completion date ('str'), the completion time
+    ('str') and the completion day ('int', number of days since the first of January 1970)
+    """
+    check_date, check_time = split_check_datetime(check_datetime)
+    return habit_id, check_date, check_time, periods.date_to_day(date.fromisoformat(check_date))
 
 
 def add_completion(habit, check_datetime: str = None):
-    """store a new habit completion in the 'Completions' table
+    """store a new habit completion in the 'Completions' table. The completion and the update of the habit's streak
+    summary are committed together; if one of them fails, the transaction is rolled back.
 
     :param habit: the habit for which a new completion is to be stored ('habit.HabitDB')
     :param check_datetime: the datetime when the habit was checked off ('str')
     """
     cursor = habit.database.cursor()
-    if not check_datetime:
-        check_datetime = str(datetime.now())
-    check_date, check_time = check_datetime.split(" ")
+    completion_row = create_completion_row(find_habit_id(habit), check_datetime)
+    try:
+        cursor.execute("INSERT INTO Completions(FKHabitID, CompletionDate, CompletionTime, CompletionDay) "
+                       "VALUES (?, ?, ?, ?)", completion_row)
+        update_habit_stats(habit, completion_row[1])
+    except Exception:
+        habit.database.rollback()
+        raise
+    habit.database.commit()
+    cache.note_write(habit.database)
+
+
+def insert_completions(database, completion_rows):
+    """insert completions into the 'Completions' table (the change is not committed). If inserting one of the
+    completions fails, the transaction is rolled back, so that none of them is stored.
+
+    :param database: the database connection in which the completions are to be stored ('sqlite3.connection')
+    :param completion_rows: an iterable (e.g., a generator) of completion rows ('tuple', see create_completion_row)
+    :return: the number of stored completions ('int')
+    """
+    cursor = database.cursor()
+    try:
+        cursor.executemany("INSERT INTO Completions(FKHabitID, CompletionDate, CompletionTime, CompletionDay) "
+                           "VALUES (?, ?, ?, ?)", completion_rows)
+    except Exception:
+        database.rollback()
+        raise
+    finally:
+        cache.note_write(database)
+    return cursor.rowcount
+
+
+def add_completions(habit, check_datetimes):
+    """store several completions of a habit in the 'Completions' table. The habit id is only looked up once and
+    all completions are committed together. The datetimes are consumed lazily, so they can be streamed from an
+    iterator.
+
+    :param habit: the habit for which the completions are to be stored ('habit.HabitDB')
+    :param check_datetimes: an iterable of the datetimes ('str') when the habit was checked off. If a datetime is
+    None, the current datetime is taken.
+    """
     habit_id = find_habit_id(habit)
-    cursor.execute("INSERT INTO Completions(FKHabitID, CompletionDate, CompletionTime) VALUES (?, ?, ?)",
-                   (habit_id, check_date, check_time))
+    completion_rows = (create_completion_row(habit_id, check_datetime) for check_datetime in check_datetimes)
+    insert_completions(habit.database, completion_rows)
+    rebuild_habit_stats(habit.database, habit_id, habit.periodicity)
     habit.database.commit()
 
 
+def add_completion_rows(database, completion_rows: list, habits: list):
+    """store prepared completion rows of several habits (possibly of different users) in the 'Completions' table
+    and commit them together (group commit)
+
+    :param database: the database connection in which the completions are to be stored ('sqlite3.connection')
+    :param completion_rows: the completion rows ('tuple', see create_completion_row) to store ('list')
+    :param habits: the completed habits ('habit.HabitDB') whose streak summaries are to be updated ('list')
+    """
+    insert_completions(database, completion_rows)
+    for habit in habits:
+        rebuild_habit_stats(database, find_habit_id(habit), habit.periodicity)
+    database.commit()
+
+
+def add_user_completions(user, habit_completions):
+    """store completions of several habits of a user in the 'Completions' table. The ids of all of the user's
+    habits are looked up once and all completions are committed together. The completions are consumed lazily,
+    so they can be streamed from an iterator.
+
+    :param user: the user whose habits were completed ('user.UserDB')
+    :param habit_completions: an iterable of tuples ('tuple') containing the name of the completed habit ('str')
+    and the datetime when the habit was checked off ('str' or None for the current datetime)
+    :return: the number of stored completions ('int')
+    """
+    cursor = user.database.cursor()
+    cursor.execute("SELECT Name, PKHabitID, Periodicity FROM Habit WHERE FKUserID = ?", [find_user_id(user)])
+    habits = {name: (habit_id, periodicity) for name, habit_id, periodicity in cursor.fetchall()}
+    completed_habits = set()
+
+    def completion_rows():
+        for habit_name, check_datetime in habit_completions:
+            if habit_name not in habits:
+                raise ValueError(f"The user {user.username} does not have a habit named {habit_name}.")
+            completed_habits.add(habit_name)
+            yield create_completion_row(habits[habit_name][0], check_datetime)
+
+    no_completions = insert_completions(user.database, completion_rows())
+    for habit_name in completed_habits:
+        rebuild_habit_stats(user.database, *habits[habit_name])
+    user.database.commit()
+    return no_completions
+
+
 def delete_habit(habit):
     """delete a habit and its corresponding data from the database
 
@@ -137,6 +481,9 @@ def delete_habit(habit):
     cursor = habit.database.cursor()
     cursor.execute("DELETE FROM Habit WHERE PKHabitID == ?", [habit_id])
     habit.database.commit()
+    cache.note_write(habit.database)
+    cache.note_habit_change(habit.database, find_user_id(habit.user))
+    habit.habit_id = None  # the id no longer belongs to the habit
 
 
 def modify_habit(habit, name: str = None, periodicity: str = None):
@@ -152,7 +499,184 @@ def modify_habit(habit, name: str = None, periodicity: str = None):
         cursor.execute("UPDATE Habit SET Name = ? WHERE PKHabitID == ?", (name, habit_id))
     if periodicity:
         cursor.execute("UPDATE Habit SET Periodicity = ? WHERE PKHabitID == ?", (periodicity, habit_id))
+        rebuild_habit_stats(habit.database, habit_id, periodicity)  # the periods change with the periodicity
     habit.database.commit()
+    cache.note_write(habit.database)
+    cache.note_habit_change(habit.database, find_user_id(habit.user))
+
+
+# maintain the habits' streak summaries
+HabitStats = namedtuple("HabitStats", ["last_period", "current_run", "best_run", "breaks", "completion_count"])
+HabitStats.__doc__ = """the streak summary of a habit: the start of the last period in which the habit was completed
+('date' or None), the length of the streak ending in that period ('int'), the longest streak ('int'), the number of
+missed periods between completed periods ('int') and the number of completions ('int')"""
+
+
+def update_habit_stats(habit, check_date: str):
+    """update a habit's streak summary after a completion has been added (the change is not committed). If the
+    completion lies in the period of the last completion or later, the summary is updated in constant time.
+    Otherwise (e.g., when a completion is added for an earlier period), the summary is rebuilt.
+
+    :param habit: the habit that was completed ('habit.HabitDB')
+    :param check_date: the date when the habit was completed ('str')
+    """
+    habit_id = find_habit_id(habit)
+    period = periods.calculate_one_period_start(habit.periodicity, date.fromisoformat(check_date))
+    previous_period = periods.calculate_previous_period_start(habit.periodicity, period)
+    new_run = """CASE WHEN LastPeriod = :period THEN CurrentRun WHEN LastPeriod = :previous THEN CurrentRun + 1
+    ELSE 1 END"""  # the completion either lies in the last period, in the next period or after a break
+    cursor = habit.database.cursor()
+    cursor.execute(f"""UPDATE HabitStats SET CurrentRun = {new_run}, BestRun = MAX(BestRun, {new_run}),
+    Breaks = CASE WHEN LastPeriod IN (:period, :previous) THEN Breaks ELSE Breaks + 1 END,
+    CompletionCount = CompletionCount + 1, LastPeriod = :period
+    WHERE FKHabitID = :habit_id AND LastPeriod <= :period""",
+                   {"period": str(period), "previous": str(previous_period), "habit_id": habit_id})
+    if cursor.rowcount == 0:  # the completion lies before the last period or the habit has no summary yet
+        rebuild_habit_stats(habit.database, habit_id, habit.periodicity)
+
+
+def calculate_habit_stats(periodicity: str, check_days: list):
+    """calculate the streak summary of a habit from all of its completion days
+
+    :param periodicity: the habit's periodicity ('str')
+    :param check_days: a list ('list') of the habit's completion days ('int', number of days since the first of
+    January 1970)
+    :return: the habit's streak summary ('db.HabitStats')
+    """
+    last_index, current_run, best_run, breaks = None, 0, 0, 0
+    for period_index in sorted(set(periods.calculate_period_indices(periodicity, check_days))):
+        if last_index is not None and period_index == last_index + 1:
+            current_run += 1
+        else:
+            breaks += 1 if last_index is not None else 0
+            current_run = 1
+        best_run = max(best_run, current_run)
+        last_index = period_index
+    last_period = periods.calculate_period_start_of_index(periodicity, last_index) if last_index is not None \
+        else None
+    return HabitStats(last_period, current_run, best_run, breaks, len(check_days))
+
+
+def rebuild_habit_stats(database, habit_id: int, periodicity: str):
+    """rebuild a habit's streak summary from all of its completions (the change is not committed)
+
+    :param database: the database connection which stores the habit ('sqlite3.connection')
+    :param habit_id: the habit's id ('int')
+    :param periodicity: the habit's periodicity ('str')
+    :return: the habit's streak summary ('db.HabitStats')
+    """
+    check_days = [row[0] for row in select_rows(database, "Completions", {"FKHabitID": habit_id},
+                                                ["CompletionDay"])]
+    habit_stats = calculate_habit_stats(periodicity, check_days)
+    last_period = str(habit_stats.last_period) if habit_stats.last_period else None
+    cursor = database.cursor()
+    cursor.execute("INSERT OR REPLACE INTO HabitStats VALUES (?, ?, ?, ?, ?, ?)",
+                   (habit_id, last_period) + tuple(habit_stats[1:]))
+    return habit_stats
+
+
+def insert_habit_stats(database, stats_rows):
+    """insert the streak summaries of several habits into the 'HabitStats' table (the change is not committed)
+
+    :param database: the database connection in which the summaries are to be stored ('sqlite3.connection')
+    :param stats_rows: an iterable of tuples ('tuple') containing the habit id ('int') and the habit's streak summary
+    (see db.HabitStats, the last period as 'str')
+    """
+    cursor = database.cursor()
+    cursor.executemany("INSERT OR REPLACE INTO HabitStats VALUES (?, ?, ?, ?, ?, ?)", stats_rows)
+
+
+def find_habit_stats(habit):
+    """return the streak summary of a habit without writing to the database
+
+    :param habit: the habit whose streak summary is to be returned ('habit.HabitDB')
+    :return: the habit's streak summary ('db.HabitStats') or None if the habit does not have a summary (e.g., because
+    it has not been completed yet)
+    """
+    cursor = habit.database.cursor()
+    cursor.execute("SELECT LastPeriod, CurrentRun, BestRun, Breaks, CompletionCount FROM HabitStats "
+                   "WHERE FKHabitID = ?", [find_habit_id(habit)])
+    habit_stats = cursor.fetchone()
+    if habit_stats is None:
+        return None
+    last_period = date.fromisoformat(habit_stats[0]) if habit_stats[0] else None
+    return HabitStats(last_period, *habit_stats[1:])
+
+
+def find_completed_habit_ids(database, user_id: int):
+    """find the ids of a user's habits that have been completed at least once. Instead of loading the completions
+    of each habit, the habits are identified with one query which uses the index on the habit ids of the
+    'Completions' table.
+
+    :param database: the database connection which stores the habits ('sqlite3.connection')
+    :param user_id: the id of the user whose completed habits are to be found ('int')
+    :return: the ids ('int') of the user's completed habits ('set')
+    """
+    cursor = database.cursor()
+    cursor.execute("""SELECT PKHabitID FROM Habit WHERE FKUserID = ? AND EXISTS
+    (SELECT 1 FROM Completions WHERE Completions.FKHabitID = Habit.PKHabitID)""", [user_id])
+    return {row[0] for row in cursor.fetchall()}
+
+
+# retrieve filtered data from tables
+TABLE_COLUMNS = {
+    "Habit": ["PKHabitID", "FKUserID", "Name", "Periodicity", "CreationTime"],
+    "HabitAppUser": ["PKUserID", "UserName"],
+    "Completions": ["PKCompletionsID", "FKHabitID", "CompletionDate", "CompletionTime", "CompletionDay"]
+}
+
+
+def build_select_query(table: str, filters: dict = None, columns: list = None):
+    """build a parameterized query that selects the specified columns of a table and only returns the rows
+    matching the filters, so that filtering is done by sqlite instead of after reading the whole table
+
+    :param table: the table to select from - either "Habit", "HabitAppUser" or "Completions" ('str')
+    :param filters: a dictionary ('dict') with column names ('str') as keys and the values the columns must equal
+    as values (optional)
+    :param columns: the columns ('str') to be selected ('list', optional). If not provided, all columns are selected.
+    :return: a tuple ('tuple') containing the sql query ('str') and its parameters ('list')
+    """
+    table_columns = TABLE_COLUMNS[table]  # raises a KeyError for unknown tables
+    columns = columns if columns else table_columns
+    filters = filters if filters else {}
+    unknown_columns = [column for column in list(columns) + list(filters) if column not in table_columns]
+    if unknown_columns:  # column names cannot be passed as parameters and are therefore checked
+        raise ValueError(f"Unknown column(s) for table {table}: {', '.join(unknown_columns)}")
+    sql_query = f"SELECT {', '.join(columns)} FROM {table}"
+    if filters:
+        sql_query += " WHERE " + " AND ".join(f"{column} = ?" for column in filters)
+    sql_query += f" ORDER BY {table_columns[0]}"  # return the rows in the order they were stored
+    return sql_query, list(filters.values())
+
+
+def select_rows(database, table: str, filters: dict = None, columns: list = None):
+    """return the rows of a table that match the filters
+
+    :param database: the database connection which contains the table ('sqlite3.connection')
+    :param table: the table to select from - either "Habit", "HabitAppUser" or "Completions" ('str')
+    :param filters: a dictionary ('dict') with column names ('str') as keys and the values the columns must equal
+    as values (optional)
+    :param columns: the columns ('str') to be selected ('list', optional). If not provided, all columns are selected.
+    :return: a list ('list') of the matching rows ('tuple')
+    """
+    sql_query, parameters = build_select_query(table, filters, columns)
+    cursor = database.cursor()
+    cursor.execute(sql_query, parameters)
+    return cursor.fetchall()
+
+
+def select_user_completions(user):
+    """select the completions of all of a user's habits, ordered by habit and completion
+
+    :param user: the user whose completions are to be selected ('user.UserDB')
+    :return: a list ('list') of tuples ('tuple') containing the habit name ('str'), the completion date ('str') and
+    the completion time ('str')
+    """
+    cursor = user.database.cursor()
+    cursor.execute("""SELECT Habit.Name, Completions.CompletionDate, Completions.CompletionTime FROM Completions
+    JOIN Habit ON Habit.PKHabitID = Completions.FKHabitID WHERE Habit.FKUserID = ?
+    ORDER BY Habit.PKHabitID, Completions.PKCompletionsID""", [find_user_id(user)])
+    return cursor.fetchall()
 
 
 def check_for_user_data(database):
@@ -162,6 +686,10 @@ def check_for_user_data(database):
     :return: True if data has already been entered, False if not ('bool')
     """
     cursor = database.cursor()
-    cursor.execute("SELECT * From HabitAppUser")
+    cursor.execute("SELECT 1 FROM HabitAppUser LIMIT 1")
     user_data = cursor.fetchall()
     return True if len(user_data) > 0 else False
+
+
+# the module's public functions are only wrapped if profiling is enabled (see the profiling module)
+profiling.instrument_module(sys.modules[__name__])
@@ -14,3 +14,42 @@ class UserNameNotExisting(Exception):
 
     def __str__(self):
         return f'{self.message}'
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Indicate that more SQL statements were executed than allowed by a query budget.
+    Is raised by tracing.query_budget, e.g., in tests that guard the number of statements of an operation.
+
+    Attributes:
+        max_statements ('int'): the maximum number of statements
+        statements ('list'): the executed statements ('str')
+        message ('str'): the error message that can be displayed
+    """
+
+    def __init__(self, max_statements: int, statements: list):
+        self.max_statements = max_statements
+        self.statements = statements
+        self.message = f"{len(statements)} statements were executed, but only {max_statements} are allowed:\n" + \
+            "\n".join(statements)
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.message}'
+
+
+class PoolExhausted(Exception):
+    """Indicate that no connection of a connection pool became available in time.
+    Is raised by pool.ConnectionPool when all connections are in use by other threads for longer than the timeout.
+
+    Attributes:
+        max_connections ('int'): the maximum number of connections of the pool
+        message ('str'): the error message that can be displayed
+    """
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.message = f"All {max_connections} database connections are in use."
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.message}'
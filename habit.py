@@ -1,5 +1,6 @@
 import analyze as ana
 import db
+import snapshot
 
 
 class Habit:
@@ -32,23 +33,24 @@ class HabitDB(Habit):
                             the time frame in which a user wants to complete a habit at least once.
         user ('user.UserDB'): the user who created the habit
         database ('sqlite3.connection'): the database connection which stores user data
+        habit_id ('int'): the habit's primary key in the database (None until the habit is stored or looked up)
     """
 
-    def __init__(self, name: str, periodicity: str, user):
+    def __init__(self, name: str, periodicity: str, user, habit_id: int = None):
         Habit.__init__(self, name, periodicity, user)
         self.database = user.database
+        self.habit_id = habit_id
 
     @property
     def last_completion(self):
         """the date when the habit was last completed ('str', read-only)"""
-        completions = ana.return_completions(self)
-        return None if not completions else max(completions)
+        return self.take_snapshot().last_completion
 
     @property
     def best_streak(self):
         """the habit's longest streak, i.e., the maximum number of consecutive periods in a row, in which the user
         has completed the habit at least once ('int', read-only)"""
-        return ana.calculate_longest_streak(self)
+        return self.return_habit_stats().best_run
 
     @property
     def current_streak(self):
@@ -56,20 +58,39 @@ class HabitDB(Habit):
         the user has completed the habit at least once (no completion in the current period is not
         counted as a break, as the user can still complete the habit in the current period)
         ('int', read-only)"""
-        return ana.calculate_curr_streak(self)
+        return ana.calculate_curr_streak_of_stats(self.return_habit_stats(), self.periodicity)
 
     @property
     def breaks_total(self):
         """the number of breaks (i.e., streak interruptions) since the first habit completion (if
         more than one period has elapsed between two habit completions, this is counted as one break)
         ('int', read-only)"""
-        return ana.calculate_break_no(self)
+        return ana.calculate_break_no_of_stats(self.return_habit_stats(), self.periodicity)
 
     @property
     def completion_rate(self):
         """the percentage of time periods in the last four weeks (full weeks for weekly habits) in which the habit
         was completed at least once (only available for daily and weekly habits) ('int', read-only)"""
-        return round((ana.calculate_completion_rate(self))*100)
+        return round(self.take_snapshot().completion_rate*100)
+
+    def return_habit_stats(self):
+        """return the habit's streak summary, which is read from the database in constant time. If the habit does not
+        have a summary (e.g., because it has not been completed yet), it is calculated from the habit's snapshot.
+
+        :return: the habit's streak summary ('db.HabitStats')
+        """
+        habit_stats = db.find_habit_stats(self)
+        if habit_stats is None:
+            habit_stats = db.calculate_habit_stats(self.periodicity, self.take_snapshot().completion_days)
+        return habit_stats
+
+    def take_snapshot(self):
+        """load the habit's completions once to calculate its last completion and completion rate (the snapshot is
+        cached until the habit's data changes)
+
+        :return: a snapshot of the habit's completion data ('snapshot.HabitSnapshot')
+        """
+        return snapshot.take_snapshot(self)
 
     def store_habit(self, creation_time: str = None):
         """store the habit in the database specified in the 'database' attribute
@@ -107,7 +128,11 @@ class HabitDB(Habit):
 
         :return: a list of the habit's statistics ('list')
         """
-        data = [self.periodicity, self.last_completion, f"{self.best_streak} period(s)",
-                f"{self.current_streak} period(s)", self.breaks_total]
-        data.append(f"{self.completion_rate} %") if self.periodicity in ["daily", "weekly"] else data.append("---")
+        habit_snapshot = self.take_snapshot()
+        habit_stats = self.return_habit_stats()  # the streaks are read from the streak summary in constant time
+        data = [self.periodicity, habit_snapshot.last_completion, f"{habit_stats.best_run} period(s)",
+                f"{ana.calculate_curr_streak_of_stats(habit_stats, self.periodicity)} period(s)",
+                ana.calculate_break_no_of_stats(habit_stats, self.periodicity)]
+        data.append(f"{round(habit_snapshot.completion_rate*100)} %") if self.periodicity in ["daily", "weekly"] \
+            else data.append("---")
         return data
@@ -10,6 +10,9 @@ The most important functionalities include functions to
     - analyze habits
 """
 
+import sqlite3
+
+import cache
 import db
 from habit import HabitDB
 from user import UserDB
@@ -17,7 +20,8 @@ import analyze as ana
 import questionary as qu
 from validators import HabitNameValidator, UserNameValidator
 from exceptions import UserNameNotExisting
-import test_data
+from session import CLISession, return_possible_actions
+from tracing import trace_operation
 import datetime
 
 
@@ -35,6 +39,8 @@ def input_username(database, action: str):
     :return: the new/already existing username ('str')
     """
     text = "Please choose a username: " if action == "create" else "Please enter your username: "
+    if action == "create":  # pick up users created by other processes once, the input is validated in memory
+        cache.refresh_indexes(database)
     username = qu.text(text, validate=UserNameValidator(database, action)).ask()
     return username
 
@@ -122,14 +128,23 @@ def input_check_day():
 
 # Functions to perform the main functionalities of the habit tracker's cli
 def create_new_user(database):
-    """create a new user based on user input and store the user in the specified sqlite3 database connection
+    """create a new user based on user input and store the user in the specified sqlite3 database connection. If
+    another process has stored a user with the same username in the meantime, the user is asked for another username.
 
     :param database: the database in which the user is to be stored ('sqlite3.connection')
     :return: the newly created and stored user ('user.UserDB')
     """
-    username = input_username(database, "create")
-    new_user = UserDB(username, database)
-    new_user.store_user()
+    while True:
+        username = input_username(database, "create")
+        new_user = UserDB(username, database)
+        try:
+            new_user.store_user()
+        except sqlite3.IntegrityError:  # the username is unique in the database, but was not in the username index
+            database.rollback()
+            cache.clear_indexes(database)
+            print("Username already existing. Please choose another one.")
+        else:
+            break
     print(f"A user with the username {username} has successfully been created. Logged in as {username}.")
     return new_user
 
@@ -200,7 +215,7 @@ def identify_habit(habit_action: str, user):
     :return: the habit which the user chose ('habit.HabitDB')
     """
     habit_name = input_chosen_habit(habit_action, user.habit_names)
-    return [habit for habit in user.defined_habits if habit.name == habit_name][0]
+    return ana.return_habit_registry(user)[habit_name]
 
 
 def delete_habit(user):
@@ -257,22 +272,25 @@ def check_off_habit(user):
     print(f"Habit successfully completed ({check_day}).")
 
 
-def analyze_habits(user):
+def analyze_habits(user, session: CLISession = None):
     """ask the user which habit s/he wants to analyse or if s/he wants to analyze all habits and then display
     the requested analysis
 
     :param user: the user who wants to analyze habit(s) ('user.UserDB')
+    :param session: the user's CLI session ('session.CLISession', optional). If provided, the completed habits and
+    the analysis of all habits are taken from the session.
     """
-    habit_names = [habit.name for habit in user.completed_habits]  # only completed habits can be analyzed
+    completed_habits = session.completed_habits if session else user.completed_habits
+    habit_names = [habit.name for habit in completed_habits]  # only completed habits can be analyzed
     habit_to_analyze = qu.select("Which habit(s) do you want to analyze?", choices=["All habits"] + habit_names).ask()
     if habit_to_analyze == "All habits":
-        habit_comparison, analysis = user.analyze_habits()
+        habit_comparison, analysis = session.analyze_habits() if session else user.analyze_habits()
         print(f"""Summary statistics:
-        {analysis.to_string(index=False)}
+        {analysis.render(show_index=False)}
         A detailed comparison of all habits:
         {habit_comparison}""")
     else:
-        habit = [habit for habit in user.completed_habits if habit.name == habit_to_analyze][0]
+        habit = [habit for habit in completed_habits if habit.name == habit_to_analyze][0]
         data = habit.analyze_habit()
         print(ana.present_habit_analysis(data, habit.name))
 
@@ -302,7 +320,7 @@ def inspect_habits(user):
                             choices=["all habits"] + [(x + " habits only") for x in user_periodicities]).ask()
     periodicity = None if view_habits == "all habits" else view_habits.replace(" habits only", "")
     habit_information = user.return_habit_information(periodicity)
-    print(habit_information.to_string(index=False))
+    print(habit_information.render(show_index=False))
 
 
 def determine_possible_actions(user):
@@ -312,47 +330,39 @@ def determine_possible_actions(user):
     :param user: the user for which the possible actions are to be determined ('user.UserDB')
     :return: the possible actions of the user ('list')
     """
-    actions = {
-        "no habits": ["Create habit", "Exit"],
-        "no completed habits": ["Manage habits", "Look at habits", "Check off habit", "Exit"],
-        "completed habits": ["Manage habits", "Look at habits", "Check off habit", "Analyze habits", "Exit"]
-    }  # to avoid exceptions at runtime, only the actions that users can perform are available to them
-    if len(user.defined_habits) == 0:
-        category = "no habits"
-    elif not user.completed_habits:
-        category = "no completed habits"
-    else:
-        category = "completed habits"
-    return actions[category]
+    return return_possible_actions(user.defined_habits, user.completed_habits)
 
 
 def cli():
     """expose the user to the CLI"""
     main_database = db.get_db("main.db")
     if not db.check_for_user_data(main_database):  # create test data only if no other data is existing
+        import test_data  # only imported when the test data is needed, which speeds up the app's start
         test_data.DataForTestingCLI("main.db")
 
     current_user = start(main_database)
+    session = CLISession(current_user)  # holds the user's data until it is modified
     counter = 0
     while True:
         counter += 1
-        possible_actions = determine_possible_actions(current_user)
         if counter > 1:
             qu.text("Press \"enter\" to proceed to the main menu.").ask()
-        next_action = qu.select("What do you want to do next?", choices=possible_actions).ask()
-        if next_action == "Create habit":
-            create_habit(current_user)
-        elif next_action == "Manage habits":
-            manage_habits(current_user)
-        elif next_action == "Look at habits":
-            inspect_habits(current_user)
-        elif next_action == "Check off habit":
-            check_off_habit(current_user)
-        elif next_action == "Analyze habits":
-            analyze_habits(current_user)
-        else:  # next_action == "Exit"
-            print("See you later, Bye!")
-            break
+        next_action = qu.select("What do you want to do next?", choices=session.possible_actions).ask()
+        with trace_operation(main_database, next_action):  # assigns the statements to the action if traced
+            if next_action == "Create habit":
+                create_habit(current_user)
+            elif next_action == "Manage habits":
+                manage_habits(current_user)
+            elif next_action == "Look at habits":
+                inspect_habits(current_user)
+            elif next_action == "Check off habit":
+                check_off_habit(current_user)
+            elif next_action == "Analyze habits":
+                analyze_habits(current_user, session)
+            else:  # next_action == "Exit"
+                print("See you later, Bye!")
+                break
+            session.note_action(next_action)
 
 
 if __name__ == "__main__":
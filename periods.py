@@ -0,0 +1,202 @@
+"""This module contains the habit tracker's functionalities necessary to determine the periods in which habits
+were completed.
+
+The most important functionalities include functions to
+    - convert completion dates (including their conversion to and from day numbers)
+    - calculate the period start of a completion date (i.e., the date of the beginning of the period, in which
+      the habit was completed)
+    - number periods consecutively (period indices), so that streaks can be calculated with integer arithmetic
+    - calculate the start of the period following or preceding a period
+"""
+
+import sys
+from datetime import date, timedelta
+
+import profiling
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # completion days are counted from the first of January 1970
+
+
+def str_to_date(str_dates: list):
+    """convert a list of string dates into a list of datetime dates
+
+    :param str_dates: list ('list') of strings dates ('str')
+    :return: a list ('list') of datetime dates ('date')
+    """
+    return list(map(lambda x: date.fromisoformat(x), str_dates))
+
+
+def date_to_day(check_date):
+    """convert a date into the number of days since the first of January 1970
+
+    :param check_date: the date to convert ('date')
+    :return: the number of days since the first of January 1970 ('int')
+    """
+    return check_date.toordinal() - EPOCH_ORDINAL
+
+
+def day_to_date(day: int):
+    """convert the number of days since the first of January 1970 into a date
+
+    :param day: the number of days since the first of January 1970 ('int')
+    :return: the corresponding date ('date')
+    """
+    return date.fromordinal(day + EPOCH_ORDINAL)
+
+
+def weekly_start(check_date):
+    """for the given date, determine the date of the preceding Monday (to determine the period start for weekly
+    habits). The period start is defined as the date of the beginning of the period (i.e., every day
+    for daily habits and every Monday for weekly habits etc.).
+
+    :param check_date: the completion date for which the period start is to be determined ('date')
+    :return: the date of the Monday before the passed in date ('date')
+    """
+    diff_to_monday = timedelta(days=check_date.weekday())
+    return check_date - diff_to_monday
+
+
+def monthly_start(check_date):
+    """determine the first day of the month of the specified date
+
+    :param check_date: the completion date for which the period start is to be determined ('date')
+    :return: the first day of the passed in month ('date')
+    """
+    diff_to_first = timedelta(days=check_date.day - 1)
+    return check_date - diff_to_first
+
+
+def yearly_start(check_date):
+    """determine the first day of the year of the specified date
+
+    :param check_date: the completion date for which the period start is to be determined ('date')
+    :return: the first day of the passed in year ('date')
+    """
+    return date.fromisoformat(f"{check_date.year}-01-01")
+
+
+def calculate_period_starts(periodicity: str, check_dates):
+    """for each completion date of a habit, calculate the period start. The period start is defined as the
+    date of the beginning of the period (i.e., every day for daily habits and every Monday for weekly habits etc.)
+
+    :param periodicity: the habit's periodicity ('str')
+    :param check_dates: a list ('list') of the habit's completion dates (dates: 'date', 'str' or 'int' for the
+    number of days since the first of January 1970)
+    :return: a list ('list') of period starts ('date') - can contain duplicates
+    """
+    if isinstance(check_dates[0], str):  # are dates already in date format?
+        check_dates = str_to_date(check_dates)
+    elif isinstance(check_dates[0], int):  # dates stored as day numbers
+        check_dates = list(map(day_to_date, check_dates))
+    period_start_funcs = {
+        "daily": (lambda x: x),
+        "weekly": weekly_start,
+        "monthly": monthly_start,
+        "yearly": yearly_start
+    }
+    period_start_func = period_start_funcs[periodicity]  # determine the correct function to calculate period starts
+    return list(map(period_start_func, check_dates))  # calculate for each completion date the period start
+
+
+def calculate_one_period_start(periodicity: str, check_date):
+    """calculate the beginning of the period in which a habit with the specified periodicity was completed
+
+    :param periodicity: the habit's periodicty ('str')
+    :param check_date: the date the habit was checked off ('date')
+    :return: the start of the period ('date')
+    """
+    period_start = calculate_period_starts(periodicity, [check_date])
+    return period_start[0]
+
+
+def return_allowed_time(periodicity: str):
+    """check what time difference is allowed between two habit completions according to the habit's periodicity
+    so that the streak is not broken
+
+    :param periodicity: the habit's periodicity ('str')
+    :return: the allowed time difference ('timedelta')
+    """
+    timeliness = {"daily": timedelta(days=1),
+                  "weekly": timedelta(days=7),
+                  "monthly": timedelta(days=32),  # if a habit has not been completed in a month, the timedelta is at
+                  # least 58 days
+                  "yearly": timedelta(days=366)
+                  }
+    return timeliness[periodicity]
+
+
+# period indices: every period is numbered consecutively (the number of days, weeks, months or years since 1970),
+# so that two periods directly follow each other exactly if their indices differ by one
+def calculate_period_index(periodicity: str, check_day):
+    """calculate the index of the period in which the specified day lies
+
+    :param periodicity: the habit's periodicity ('str')
+    :param check_day: the day ('int', number of days since the first of January 1970, or 'date')
+    :return: the period index ('int')
+    """
+    if isinstance(check_day, date):
+        check_day = date_to_day(check_day)
+    if periodicity == "daily":
+        return check_day
+    elif periodicity == "weekly":
+        return (check_day + 3) // 7  # the first of January 1970 was a Thursday, so week 0 starts on the Monday before
+    check_date = day_to_date(check_day)
+    if periodicity == "monthly":
+        return (check_date.year - 1970) * 12 + check_date.month - 1
+    else:  # periodicity == "yearly"
+        return check_date.year - 1970
+
+
+def calculate_period_indices(periodicity: str, check_days: list):
+    """calculate the period index of each of the specified days
+
+    :param periodicity: the habit's periodicity ('str')
+    :param check_days: a list ('list') of days ('int', number of days since the first of January 1970)
+    :return: a list ('list') of period indices ('int') - can contain duplicates
+    """
+    if periodicity == "daily":
+        return list(check_days)
+    elif periodicity == "weekly":
+        return [(check_day + 3) // 7 for check_day in check_days]
+    return [calculate_period_index(periodicity, check_day) for check_day in check_days]
+
+
+def calculate_period_start_of_index(periodicity: str, period_index: int):
+    """calculate the start of the period with the specified index
+
+    :param periodicity: the habit's periodicity ('str')
+    :param period_index: the period index ('int')
+    :return: the start of the period ('date')
+    """
+    if periodicity == "daily":
+        return day_to_date(period_index)
+    elif periodicity == "weekly":
+        return day_to_date(period_index * 7 - 3)
+    elif periodicity == "monthly":
+        return date(1970 + period_index // 12, period_index % 12 + 1, 1)
+    else:  # periodicity == "yearly"
+        return date(1970 + period_index, 1, 1)
+
+
+def calculate_next_period_start(periodicity: str, period_start):
+    """calculate the start of the period that directly follows the specified period
+
+    :param periodicity: the habit's periodicity ('str')
+    :param period_start: the start of a period ('date')
+    :return: the start of the following period ('date')
+    """
+    return calculate_period_start_of_index(periodicity, calculate_period_index(periodicity, period_start) + 1)
+
+
+def calculate_previous_period_start(periodicity: str, period_start):
+    """calculate the start of the period that directly precedes the specified period
+
+    :param periodicity: the habit's periodicity ('str')
+    :param period_start: the start of a period ('date')
+    :return: the start of the preceding period ('date')
+    """
+    return calculate_period_start_of_index(periodicity, calculate_period_index(periodicity, period_start) - 1)
+
+
+# the module's public functions are only wrapped if profiling is enabled (see the profiling module)
+profiling.instrument_module(sys.modules[__name__])
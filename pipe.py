@@ -0,0 +1,207 @@
+"""This module contains the habit tracker's command pipe, a long-running mode of the non-interactive command line
+interface. It reads newline-delimited json commands from stdin and writes one json result per command to stdout,
+using a single database connection. Check-offs are buffered and committed in groups.
+
+The most important functionalities include functions to
+    - parse and run json commands (check off habits, create habits, query statistics, flush)
+    - buffer check-offs and store them with one commit per group
+    - stream the results in the order of the commands
+
+If a check-off of a group cannot be stored because it violates a constraint (e.g., its habit has been deleted by
+another process in the meantime), the check-offs of the group are stored one by one, so that only the invalid
+check-off fails. If the group cannot be stored for other reasons (e.g., the database is locked for longer than the
+busy timeout), all check-offs of the group fail and are reported as such.
+
+Commands (one json object per line, the optional "id" is returned with the result):
+    {"op": "checkoff", "user": "HarryP", "habit": "Feed Hedwig", "at": "2022-02-01 08:00:00"}
+    {"op": "create", "user": "HarryP", "habit": "Fly", "periodicity": "weekly"}
+    {"op": "stats", "user": "HarryP", "habit": "Feed Hedwig"}  (without "habit": statistics of all habits)
+    {"op": "flush"}  (commit buffered check-offs and return their results immediately)
+
+Usage example:
+    producer | python pipe.py --database main.db --batch-size 1000 > results.jsonl
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+
+import analyze as ana
+import batch
+import cache
+import db
+
+
+class CommandPipe:
+    """Every CommandPipe instance runs json commands against one database connection. Check-offs are buffered and
+    committed together when the buffer is full, when the oldest buffered check-off is older than the maximum delay,
+    before any other command is run and at the end of the input. Their results are written after the commit, so
+    that the results are always written in the order of the commands.
+
+    Attributes:
+        database ('sqlite3.connection'): the database connection which stores the user data
+        output ('file'): the file to which the results are written
+        batch_size ('int'): the maximum number of buffered check-offs
+        max_delay ('float'): the maximum number of seconds a check-off is buffered (checked when a command arrives)
+        pending_rows ('list'): the completion rows ('tuple') of the buffered check-offs
+        pending_habits ('dict'): the habits ('habit.HabitDB') of the buffered check-offs by habit id ('int')
+        pending_results ('list'): the results ('dict') of the buffered check-offs
+        pending_since ('float'): the time when the oldest buffered check-off arrived (None if nothing is buffered)
+    """
+
+    def __init__(self, database, output, batch_size: int = 1000, max_delay: float = 0.1):
+        self.database = database
+        self.output = output
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.pending_rows = []
+        self.pending_habits = {}
+        self.pending_results = []
+        self.pending_since = None
+
+    def write(self, result: dict):
+        """write a result as one line of json
+
+        :param result: the result of a command ('dict')
+        """
+        self.output.write(json.dumps(result) + "\n")
+
+    def flush(self):
+        """commit the buffered check-offs and write their results"""
+        if self.pending_rows:
+            try:
+                db.add_completion_rows(self.database, self.pending_rows, list(self.pending_habits.values()))
+            except sqlite3.IntegrityError:  # at least one of the check-offs is invalid
+                self.database.rollback()
+                self.store_rows_one_by_one()
+            except Exception as e:  # none of the buffered check-offs has been stored
+                self.database.rollback()
+                self.pending_results = [{"id": result.get("id"), "ok": False, "error": str(e)}
+                                        for result in self.pending_results]
+        for result in self.pending_results:
+            self.write(result)
+        self.pending_rows, self.pending_habits, self.pending_results = [], {}, []
+        self.pending_since = None
+        self.output.flush()
+
+    def store_rows_one_by_one(self):
+        """store the buffered check-offs one by one (after the group commit failed), so that only the invalid
+        check-offs fail"""
+        for row_number, completion_row in enumerate(self.pending_rows):
+            try:
+                db.add_completion_rows(self.database, [completion_row], [self.pending_habits[completion_row[0]]])
+            except Exception as e:
+                self.database.rollback()
+                self.pending_results[row_number] = {"id": self.pending_results[row_number].get("id"), "ok": False,
+                                                    "error": str(e)}
+
+    def return_habit(self, command: dict):
+        """return the habit specified by a command
+
+        :param command: the command ('dict') containing the "user" and the "habit"
+        :return: the habit ('habit.HabitDB')
+        """
+        user = batch.return_user(self.database, command["user"])
+        habit = ana.return_habit_registry(user).get(command["habit"])
+        if habit is None:  # the habit may have been created by another process since the registry was loaded
+            cache.refresh_indexes(self.database)
+            habit = ana.return_habit_registry(user).get(command["habit"])
+        if habit is None:
+            raise ValueError(f"The user {user.username} does not have a habit named {command['habit']}.")
+        return habit
+
+    def buffer_check_off(self, command: dict):
+        """buffer a check-off, which is stored with the next group commit
+
+        :param command: the check-off command ('dict') containing the "user", the "habit" and optionally the
+        datetime of the check-off ("at")
+        """
+        habit = self.return_habit(command)
+        self.pending_rows.append(db.create_completion_row(habit.habit_id, command.get("at")))
+        self.pending_habits[habit.habit_id] = habit
+        self.pending_results.append({"id": command.get("id"), "ok": True})
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+
+    def return_statistics(self, command: dict):
+        """return the statistics of a habit or of all of a user's habits
+
+        :param command: the command ('dict') containing the "user" and optionally the "habit"
+        :return: the statistics ('dict')
+        """
+        if "habit" not in command:
+            return batch.create_report(self.database, command["user"])
+        habit_snapshot = self.return_habit(command).take_snapshot()
+        return {"last_completion": habit_snapshot.last_completion, "longest_streak": habit_snapshot.best_streak,
+                "current_streak": habit_snapshot.current_streak, "breaks": habit_snapshot.breaks_total,
+                "completion_rate": habit_snapshot.completion_rate}
+
+    def run_command(self, line: str):
+        """run one json command. Check-offs are buffered, all other commands are run after the buffered check-offs
+        have been committed.
+
+        :param line: the json command ('str')
+        """
+        command = {}
+        if not self.pending_rows:  # the habits may have been changed by other processes since the last group
+            cache.refresh_indexes(self.database)
+        try:
+            command = json.loads(line)
+            operation = command.get("op")
+            if operation == "checkoff":
+                self.buffer_check_off(command)
+            else:
+                self.flush()
+                if operation == "create":
+                    batch.create_habits(self.database, command["user"], command["periodicity"], [command["habit"]])
+                    self.write({"id": command.get("id"), "ok": True})
+                elif operation == "stats":
+                    self.write({"id": command.get("id"), "ok": True, "result": self.return_statistics(command)})
+                elif operation == "flush":
+                    self.write({"id": command.get("id"), "ok": True})
+                else:
+                    raise ValueError(f"Unknown operation: {operation}")
+        except (ValueError, KeyError, TypeError, AttributeError, sqlite3.Error) as e:
+            self.flush()  # keep the results in the order of the commands
+            error = f"Missing field: {e}" if isinstance(e, KeyError) else str(e)
+            self.write({"id": command.get("id") if isinstance(command, dict) else None, "ok": False, "error": error})
+        if len(self.pending_rows) >= self.batch_size or \
+                (self.pending_since is not None and time.monotonic() - self.pending_since >= self.max_delay):
+            self.flush()
+
+    def run(self, lines):
+        """run the json commands of all lines and commit the remaining buffered check-offs at the end (also if
+        reading the commands fails or the pipe is interrupted)
+
+        :param lines: an iterable (e.g., a file) of json commands ('str')
+        """
+        try:
+            for line in lines:
+                if line.strip():
+                    self.run_command(line)
+        finally:
+            self.flush()
+
+
+def main(argv: list = None):
+    """parse the command line arguments and run the commands read from stdin
+
+    :param argv: the command line arguments ('list', optional). If not provided, sys.argv is used.
+    """
+    parser = argparse.ArgumentParser(description="Run newline-delimited json commands read from stdin.")
+    parser.add_argument("--database", default="main.db", help="the database file (default: main.db)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="the maximum number of check-offs per commit")
+    parser.add_argument("--max-delay", type=float, default=0.1,
+                        help="the maximum number of seconds a check-off is buffered")
+    args = parser.parse_args(argv)
+    database = db.get_db(args.database)
+    try:
+        CommandPipe(database, sys.stdout, args.batch_size, args.max_delay).run(sys.stdin)
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""This module contains the habit tracker's connection pool, which shares a bounded number of database connections
+between threads (e.g., the threads of a server). Each thread uses one connection at a time, and a thread that
+already uses a connection gets the same connection again, so that nested operations see the same transaction.
+The connections are created with db.get_db, so that the database file is used in WAL mode: many connections can
+read concurrently while one connection writes.
+
+The most important functionalities include functions to
+    - lend a connection to the current thread and take it back afterwards
+    - bound the number of connections and wait for a connection if all of them are in use
+    - discard uncommitted changes and outdated indexes when a connection is lent again
+    - close all connections
+"""
+
+import threading
+from contextlib import contextmanager
+
+import cache
+import db
+from exceptions import PoolExhausted
+
+
+class ConnectionPool:
+    """Every ConnectionPool instance lends the connections to one database file to threads.
+
+    Attributes:
+        name ('str'): the name of the database file
+        max_connections ('int'): the maximum number of connections
+        timeout ('float'): the maximum number of seconds a thread waits for a connection (None: no limit)
+        connections ('list'): all connections created by the pool ('db.HabitConnection')
+        idle ('list'): the connections which are currently not lent to a thread ('db.HabitConnection')
+    """
+
+    def __init__(self, name: str, max_connections: int = 8, timeout: float = None):
+        if name in ("", ":memory:"):
+            raise ValueError("In-memory databases cannot be shared by several connections.")
+        self.name = name
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connections = []
+        self.idle = []
+        self.available = threading.BoundedSemaphore(max_connections)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def acquire(self):
+        """take an idle connection or create a new one if the maximum number of connections has not been reached
+
+        raise:
+            a PoolExhausted error if no connection becomes available within the pool's timeout
+        :return: the connection ('db.HabitConnection')
+        """
+        if self.closed:
+            raise ValueError("The connection pool has been closed.")
+        if not self.available.acquire(timeout=self.timeout):
+            raise PoolExhausted(self.max_connections)
+        with self.lock:
+            database = self.idle.pop() if self.idle else None
+        if database is None:
+            database = db.get_db(self.name, check_same_thread=False)
+            with self.lock:
+                self.connections.append(database)
+        cache.refresh_indexes(database)  # other connections may have changed users or habits in the meantime
+        return database
+
+    def release(self, database):
+        """take back a connection; changes which have not been committed are discarded
+
+        :param database: the connection ('db.HabitConnection')
+        """
+        if database.in_transaction:
+            database.rollback()
+        with self.lock:
+            if self.closed:
+                database.close()
+            else:
+                self.idle.append(database)
+        self.available.release()
+
+    @contextmanager
+    def connection(self):
+        """lend a connection to the current thread for the duration of the context. If the thread already uses a
+        connection of the pool, the same connection is used.
+
+        :return: the connection ('db.HabitConnection')
+        """
+        database = getattr(self.local, "database", None)
+        if database is not None:
+            yield database
+            return
+        database = self.local.database = self.acquire()
+        try:
+            yield database
+        finally:
+            self.local.database = None
+            self.release(database)
+
+    def close(self):
+        """close all idle connections; connections which are currently lent are closed when they are taken back"""
+        with self.lock:
+            self.closed = True
+            for database in self.idle:
+                database.close()
+            self.idle.clear()
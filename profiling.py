@@ -0,0 +1,172 @@
+"""This module contains the habit tracker's profiling hooks, which measure how often the public functions of the
+analysis, database and period modules are called, how long they take and how many rows they return. Profiling is
+enabled by setting the environment variable HABIT_TRACKER_PROFILE to the path of a json file (e.g.,
+HABIT_TRACKER_PROFILE=profile.json python main.py). The statistics are written to this file when the application
+exits and, where available, when the process receives the signal SIGUSR1. If profiling is disabled, no function is
+wrapped, so that the hooks do not cost anything.
+
+The most important functionalities include functions to
+    - wrap the public functions of a module with a timing wrapper (only if profiling is enabled)
+    - record the call counts, the cumulative, median (p50) and 99th percentile (p99) wall time and the returned rows
+    - write the statistics as json
+"""
+
+import atexit
+import functools
+import json
+import os
+import signal
+import threading
+import time
+
+ENVIRONMENT_VARIABLE = "HABIT_TRACKER_PROFILE"
+MAX_SAMPLES = 10000  # the maximum number of durations kept per function to calculate the percentiles
+
+
+class FunctionProfile:
+    """Every FunctionProfile instance holds the statistics of one profiled function.
+
+    Attributes:
+        calls ('int'): the number of calls
+        total_time ('float'): the cumulative wall time in seconds (including the time of nested profiled calls)
+        rows ('int'): the number of rows returned (for functions returning lists or data frames)
+        durations ('list'): the wall times ('float') of the most recent calls (at most MAX_SAMPLES)
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.durations = []
+
+    def record(self, duration: float, result):
+        """record one call of the function
+
+        :param duration: the wall time of the call in seconds ('float')
+        :param result: the function's return value
+        """
+        self.calls += 1
+        self.total_time += duration
+        if isinstance(result, list) or hasattr(result, "shape"):  # lists of rows or data frames
+            self.rows += len(result)
+        if len(self.durations) >= MAX_SAMPLES:
+            self.durations[self.calls % MAX_SAMPLES] = duration
+        else:
+            self.durations.append(duration)
+
+    def percentile(self, share: float):
+        """return a percentile of the recorded durations
+
+        :param share: the share of durations below the percentile, e.g., 0.99 for p99 ('float')
+        :return: the percentile in seconds ('float')
+        """
+        durations = sorted(self.durations)
+        return durations[min(int(share * len(durations)), len(durations) - 1)] if durations else 0.0
+
+    def summarize(self):
+        """return the function's statistics
+
+        :return: a dictionary ('dict') containing the calls, the cumulative, p50 and p99 time in milliseconds and
+        the returned rows
+        """
+        return {"calls": self.calls, "total_ms": self.total_time * 1000, "p50_ms": self.percentile(0.5) * 1000,
+                "p99_ms": self.percentile(0.99) * 1000, "rows": self.rows}
+
+
+class Profiler:
+    """Every Profiler instance holds the statistics of all profiled functions.
+
+    Attributes:
+        profiles ('dict'): the statistics ('profiling.FunctionProfile') by qualified function name ('str')
+        lock ('threading.RLock'): the lock which protects the statistics when functions are called from several
+                                  threads. It is reentrant, so that code interrupting a thread while it records a
+                                  call (e.g., a signal handler) can still summarize the statistics.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        self.lock = threading.RLock()
+
+    def wrap(self, function, name: str):
+        """wrap a function, so that its calls are recorded
+
+        :param function: the function to wrap ('function')
+        :param name: the qualified name of the function, e.g., "analyze.habit_creator" ('str')
+        :return: the wrapper ('function')
+        """
+        profile = self.profiles.setdefault(name, FunctionProfile())
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            duration = time.perf_counter() - start
+            with self.lock:
+                profile.record(duration, result)
+            return result
+
+        wrapper.profiled = True
+        return wrapper
+
+    def summarize(self):
+        """return the statistics of all functions which have been called
+
+        :return: a dictionary ('dict') with the function names ('str') as keys and their statistics ('dict') as
+        values, ordered by the cumulative time
+        """
+        with self.lock:
+            summaries = {name: profile.summarize() for name, profile in self.profiles.items() if profile.calls}
+        return dict(sorted(summaries.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def dump(self, path: str):
+        """write the statistics of all functions as json
+
+        :param path: the path of the json file ('str')
+        """
+        with open(path, "w") as profile_file:
+            json.dump(self.summarize(), profile_file, indent=2)
+
+
+PROFILER = Profiler() if os.environ.get(ENVIRONMENT_VARIABLE) else None
+
+
+def instrument_module(module, profiler: Profiler = None):
+    """wrap the public functions defined in a module, if profiling is enabled. Calls within the module are recorded,
+    too, as they are resolved through the module's namespace.
+
+    :param module: the module whose functions are to be profiled ('module')
+    :param profiler: the profiler which records the calls ('profiling.Profiler'), by default the profiler enabled by
+    the environment variable
+    """
+    profiler = profiler if profiler else PROFILER
+    if profiler is None:
+        return
+    for name, value in list(vars(module).items()):
+        if name.startswith("_") or not callable(value) or isinstance(value, type) or getattr(value, "profiled", False):
+            continue
+        if getattr(value, "__module__", None) != module.__name__:
+            continue  # functions imported from other modules are profiled in their own module
+        setattr(module, name, profiler.wrap(value, f"{module.__name__}.{name}"))
+
+
+DUMP_LOCK = threading.Lock()  # serializes the writing of the statistics file
+
+
+def dump_profile():
+    """write the statistics to the file specified by the environment variable (used at exit and by
+    request_dump)"""
+    if PROFILER is not None:
+        with DUMP_LOCK:
+            PROFILER.dump(os.environ[ENVIRONMENT_VARIABLE])
+
+
+def request_dump(*_):
+    """write the statistics in a separate thread (used as signal handler). The handler interrupts the main thread,
+    possibly while it records a call, so the statistics are not written in the handler itself."""
+    threading.Thread(target=dump_profile, name="profile-dump", daemon=True).start()
+
+
+if PROFILER is not None:
+    atexit.register(dump_profile)
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGUSR1, request_dump)
@@ -0,0 +1,79 @@
+"""This module contains the habit tracker's result types, which hold the tables presented to the user (e.g., the
+analysis of all habits) without creating pandas data frames.
+
+The most important functionalities include functions to
+    - hold a table's columns, rows and row labels
+    - render a table as plain text for the command line interface
+    - convert a table into a pandas data frame (optional, pandas is only imported when a data frame is created)
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Table:
+    """Every Table instance holds a small table of results, e.g., the analysis of a habit.
+
+    Attributes:
+        columns ('list'): the column names ('str')
+        rows ('list'): the rows ('tuple') of the table, each containing one value per column
+        index ('list'): the row labels ('str'), empty if the rows are not labeled
+    """
+    columns: list
+    rows: list
+    index: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __str__(self):
+        return self.render()
+
+    def column(self, name: str):
+        """return the values of a column
+
+        :param name: the name of the column ('str')
+        :return: the column's values ('list')
+        """
+        position = self.columns.index(name)
+        return [row[position] for row in self.rows]
+
+    def sort_by(self, name: str):
+        """return a copy of the table whose rows are sorted by the values of a column
+
+        :param name: the name of the column by which the rows are sorted ('str')
+        :return: the sorted table ('results.Table')
+        """
+        position = self.columns.index(name)
+        order = sorted(range(len(self.rows)), key=lambda row_number: self.rows[row_number][position])
+        index = [self.index[row_number] for row_number in order] if self.index else []
+        return Table(list(self.columns), [self.rows[row_number] for row_number in order], index)
+
+    def render(self, show_index: bool = True):
+        """render the table as plain text with one line per row. Numbers are aligned to the right, all other values
+        to the left.
+
+        :param show_index: whether the row labels are shown in the first column ('bool')
+        :return: the rendered table ('str')
+        """
+        show_index = show_index and bool(self.index)
+        header = ([""] if show_index else []) + [str(name) for name in self.columns]
+        lines = [[str(self.index[row_number])] if show_index else [] for row_number in range(len(self.rows))]
+        right_aligned = [False] * len(header)
+        for line, row in zip(lines, self.rows):
+            line.extend("" if value is None else str(value) for value in row)
+        for position, value in enumerate(self.rows[0] if self.rows else []):
+            right_aligned[position + show_index] = isinstance(value, (int, float))
+        widths = [max(len(line[position]) for line in [header] + lines) for position in range(len(header))]
+        return "\n".join(
+            "  ".join(cell.rjust(width) if right else cell.ljust(width)
+                      for cell, width, right in zip(line, widths, right_aligned)).rstrip()
+            for line in [header] + lines)
+
+    def to_data_frame(self):
+        """convert the table into a pandas data frame
+
+        :return: the data frame ('pandas.core.frame.DataFrame')
+        """
+        import pandas as pd  # pandas is only imported when a data frame is requested
+        return pd.DataFrame(self.rows, columns=self.columns, index=self.index if self.index else None)
@@ -0,0 +1,247 @@
+"""This module contains the habit tracker's optional HTTP server, which provides the habit data and analyses as json
+(e.g., for dashboards). It only uses python's standard library. Requests are handled by a bounded pool of worker
+threads, which borrow their database connections from a connection pool, and connections are kept alive between
+requests (HTTP/1.1).
+
+The most important functionalities include functions to
+    - list a user's habits
+    - check off a habit
+    - analyze a habit
+    - summarize the analysis of all of a user's habits
+
+Endpoints (usernames and habit names are url-encoded):
+    GET  /users/<username>/habits                     the user's habits
+    POST /users/<username>/habits/<habit>/checkoff    check off the habit, optional body: {"at": "2022-02-01 08:00:00"}
+    GET  /users/<username>/habits/<habit>/analysis    the analysis of the habit
+    GET  /users/<username>/summary                    the user's summary statistics and the analysis of all habits
+
+Usage example:
+    python server.py --database main.db --port 8000
+"""
+
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import unquote, urlsplit
+
+import analyze as ana
+import batch
+from pool import ConnectionPool
+
+
+def label_analysis(data: list):
+    """label the statistics of a habit's analysis (see HabitDB.analyze_habit)
+
+    :param data: the habit's statistics ('list')
+    :return: a dictionary ('dict') with the names of the statistics ('str') as keys and their values as values
+    """
+    return {label.strip(" :"): value for label, value in zip(ana.analysis_index(), data)}
+
+
+def list_habits(user):
+    """return the name, periodicity and creation time of a user's habits
+
+    :param user: the user ('user.UserDB')
+    :return: a dictionary ('dict') containing the user's habits ('list' of 'dict')
+    """
+    habit_info = user.return_habit_information()
+    return {"user": user.username, "habits": [dict(zip(["name", "periodicity", "created"], row))
+                                              for row in habit_info.rows]}
+
+
+def analyze_habit(habit):
+    """return the analysis of a habit
+
+    :param habit: the habit ('habit.HabitDB')
+    :return: a dictionary ('dict') containing the habit's statistics
+    """
+    return {"user": habit.user.username, "habit": habit.name, "analysis": label_analysis(habit.analyze_habit())}
+
+
+def summarize_user(user):
+    """return the user's summary statistics and the analysis of each habit that has been completed. The summary
+    statistics are null if none of the user's (daily or weekly) habits has been completed.
+
+    :param user: the user ('user.UserDB')
+    :return: a dictionary ('dict') containing the summary statistics and the habits' statistics
+    """
+    habit_comparison, _ = user.analyze_habits()
+    longest_streak, best_habits, lowest_completion_rate, worst_habits = ana.calculate_user_summary(user)  # cached
+    habits = {habit_name: label_analysis(habit_comparison.column(habit_name))
+              for habit_name in habit_comparison.columns}
+    summary = {"longest_streak": longest_streak, "best_habits": best_habits,
+               "lowest_completion_rate": round(lowest_completion_rate * 100) if lowest_completion_rate is not None
+               else None, "worst_habits": worst_habits}
+    return {"user": user.username, "summary": summary, "habits": habits}
+
+
+def check_off_habit(habit, body: dict):
+    """check off a habit
+
+    :param habit: the habit ('habit.HabitDB')
+    :param body: the request's content ('dict'), which may contain the datetime of the check-off ("at")
+    :return: a dictionary ('dict') confirming the check-off
+    """
+    habit.check_off_habit(body.get("at"))
+    return {"user": habit.user.username, "habit": habit.name, "checked_off": True}
+
+
+# the functions of the endpoints by request method, last path segment and whether the path contains a habit name
+ROUTES = {("GET", "habits", False): list_habits, ("GET", "summary", False): summarize_user,
+          ("GET", "analysis", True): analyze_habit, ("POST", "checkoff", True): check_off_habit}
+
+
+class HabitRequestHandler(BaseHTTPRequestHandler):
+    """This class handles the requests of one client connection. Connections are kept alive until the client closes
+    them or no request arrives within the timeout."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 5  # seconds an idle connection is kept alive
+    disable_nagle_algorithm = True  # the headers and the content are written separately
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def handle_request(self, method: str):
+        """handle a request and send an error response if handling it fails unexpectedly
+
+        :param method: the request method ('str')
+        """
+        try:
+            self.route_request(method)
+        except Exception as e:
+            super().log_message("Error handling %s %s: %r", method, self.path, e)  # logged even if not verbose
+            self.send_json(500, {"error": "An internal error occurred."})
+
+    def route_request(self, method: str):
+        """route a request to the function of its endpoint and send the result as json
+
+        :param method: the request method ('str')
+        """
+        body = self.read_body()  # read in any case, so that the next request of the connection can be read
+        segments = [unquote(segment) for segment in urlsplit(self.path).path.strip("/").split("/")]
+        habit_path = len(segments) == 5 and segments[2] == "habits"
+        function = ROUTES.get((method, segments[-1], habit_path)) if segments[0] == "users" and \
+            (len(segments) == 3 or habit_path) else None
+        if function is None:
+            return self.send_json(404, {"error": "Unknown endpoint."})
+        if body is None:
+            return self.send_json(400, {"error": "The request body is not a json object."})
+        with self.server.pool.connection() as database:
+            try:
+                user = batch.return_user(database, segments[1])
+            except ValueError as e:
+                return self.send_json(404, {"error": str(e)})
+            subject = user
+            if habit_path:
+                subject = ana.return_habit_registry(user).get(segments[3])
+                if subject is None:
+                    return self.send_json(404, {"error": f"The user {user.username} does not have a habit named "
+                                                         f"{segments[3]}."})
+            try:
+                result = function(subject, body) if method == "POST" else function(subject)
+            except ValueError as e:
+                return self.send_json(400, {"error": str(e)})
+        self.send_json(201 if method == "POST" else 200, result)
+
+    def read_body(self):
+        """read the request's json content
+
+        :return: the content ('dict'), an empty dictionary if the request has no content or None if the content is
+        not a json object
+        """
+        length = int(self.headers.get("Content-Length", 0))
+        if length == 0:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    def send_json(self, status: int, content: dict):
+        """send a response with json content
+
+        :param status: the HTTP status code ('int')
+        :param content: the content ('dict')
+        """
+        data = json.dumps(content, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class HabitServer(HTTPServer):
+    """Every HabitServer instance serves the habit data of one database file. Each client connection is handled by
+    one of a bounded number of worker threads; the worker borrows a database connection for each request.
+
+    Attributes:
+        pool ('pool.ConnectionPool'): the connection pool which lends the database connections to the workers
+        executor ('concurrent.futures.ThreadPoolExecutor'): the worker threads
+        verbose ('bool'): whether every request is logged to stderr
+
+    The server closes the connection pool when it is closed.
+    """
+
+    def __init__(self, address: tuple, pool, max_workers: int = 16, verbose: bool = False):
+        super().__init__(address, HabitRequestHandler)
+        self.pool = pool
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="habit-server")
+        self.verbose = verbose
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        """handle all requests of a client connection (run in a worker thread)"""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown()
+        self.pool.close()
+
+
+def main(argv: list = None):
+    """parse the command line arguments and serve the database until the server is interrupted
+
+    :param argv: the command line arguments ('list', optional). If not provided, sys.argv is used.
+    """
+    parser = argparse.ArgumentParser(description="Serve the habit data and analyses as json.")
+    parser.add_argument("--database", default="main.db", help="the database file (default: main.db)")
+    parser.add_argument("--host", default="127.0.0.1", help="the address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="the port to listen on (default: 8000)")
+    parser.add_argument("--workers", type=int, default=16, help="the number of worker threads (default: 16)")
+    parser.add_argument("--connections", type=int, default=8,
+                        help="the maximum number of database connections (default: 8)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = HabitServer((args.host, args.port), ConnectionPool(args.database, args.connections), args.workers,
+                         args.verbose)
+    print(f"Serving {args.database} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
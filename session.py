@@ -0,0 +1,83 @@
+"""This module contains the habit tracker's functionalities necessary to hold the state of a user's CLI session, so
+that returning to the main menu does not require reloading the user's data.
+
+The most important functionalities include functions to
+    - determine the actions which a user can perform
+    - hold the logged-in user's habits, completed habits, possible actions and analysis results
+    - renew the session state after an action that modified the user's data
+"""
+
+from datetime import date
+
+ACTIONS = {
+    "no habits": ["Create habit", "Exit"],
+    "no completed habits": ["Manage habits", "Look at habits", "Check off habit", "Exit"],
+    "completed habits": ["Manage habits", "Look at habits", "Check off habit", "Analyze habits", "Exit"]
+}  # to avoid exceptions at runtime, only the actions that users can perform are available to them
+
+MODIFYING_ACTIONS = ["Create habit", "Manage habits", "Check off habit"]
+
+
+def return_possible_actions(defined_habits: list, completed_habits: list):
+    """return the actions which a user can perform, depending on whether s/he has already created habits or not
+    and whether the habits have already been completed
+
+    :param defined_habits: the habits ('habit.HabitDB') the user has created ('list')
+    :param completed_habits: the habits ('habit.HabitDB') the user has completed at least once ('list')
+    :return: the possible actions of the user ('list')
+    """
+    if len(defined_habits) == 0:
+        category = "no habits"
+    elif not completed_habits:
+        category = "no completed habits"
+    else:
+        category = "completed habits"
+    return ACTIONS[category]
+
+
+class CLISession:
+    """Every CLISession instance holds the state of the CLI session of the logged-in user. The state is only
+    renewed after actions that modify the user's data (creating, deleting, modifying or checking off habits). The
+    analysis is also renewed when the day changes.
+
+    Attributes:
+        user ('user.UserDB'): the logged-in user
+        defined_habits ('list'): the habits ('habit.HabitDB') the user has created
+        completed_habits ('list'): the habits ('habit.HabitDB') the user has completed at least once
+        possible_actions ('list'): the actions ('str') the user can perform
+        habit_analysis ('tuple'): the analysis of all of the user's habits (see user.UserDB.analyze_habits), None
+                                  until it is requested
+        analysis_date ('date'): the date on which the analysis was calculated, None until it is requested
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.refresh()
+
+    def refresh(self):
+        """load the user's habits and determine the actions the user can perform"""
+        self.defined_habits = self.user.defined_habits
+        self.completed_habits = self.user.completed_habits
+        self.possible_actions = return_possible_actions(self.defined_habits, self.completed_habits)
+        self.habit_analysis = None
+        self.analysis_date = None
+
+    def note_action(self, action: str):
+        """renew the session state if the performed action might have modified the user's data
+
+        :param action: the action the user performed ('str')
+        """
+        if action in MODIFYING_ACTIONS:
+            self.refresh()
+
+    def analyze_habits(self):
+        """return the analysis of all of the user's habits. The analysis is only calculated once per session state
+        and day, since current streaks, breaks and completion rates depend on the current date.
+
+        :return: a tuple ('tuple') containing the detailed analysis of each habit and the summary statistics
+        (see user.UserDB.analyze_habits)
+        """
+        if self.habit_analysis is None or self.analysis_date != date.today():
+            self.habit_analysis = self.user.analyze_habits()
+            self.analysis_date = date.today()
+        return self.habit_analysis
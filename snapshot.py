@@ -0,0 +1,70 @@
+import analyze as ana
+import cache
+import db
+import periods
+
+
+class HabitSnapshot:
+    """Every snapshot instance holds the completion data of one habit at the time the snapshot was taken. The
+    completions are loaded from the database only once and all of the habit's statistics are calculated from the
+    same sorted list of period indices, so that a full analysis of a habit requires only one database query.
+
+    Attributes:
+        habit ('habit.HabitDB'): the habit whose data is held by the snapshot
+        periodicity ('str'): the habit's periodicity at the time the snapshot was taken
+        completion_days ('list'): the habit's completion dates as number of days since the first of January 1970
+                                  ('int')
+        final_indices ('list'): clean list of the indices ('int') of the periods, in which the habit was checked off
+                                at least once, including one future period (empty if the habit has not been
+                                completed yet)
+        streak_lengths ('list'): the lengths ('int') of the habit's streaks
+    """
+
+    def __init__(self, habit):
+        self.habit = habit
+        self.periodicity = habit.periodicity
+        self.completion_days = ana.return_completion_days(habit)
+        self.final_indices = [] if not self.completion_days else \
+            ana.calculate_final_period_indices(self.completion_days, self.periodicity)
+        self.streak_lengths = [] if not self.final_indices else \
+            ana.calculate_streak_lengths_of_indices(self.final_indices)
+
+    @property
+    def last_completion(self):
+        """the date when the habit was last completed ('str', read-only)"""
+        return None if not self.completion_days else str(periods.day_to_date(max(self.completion_days)))
+
+    @property
+    def best_streak(self):
+        """the habit's longest streak ('int', read-only)"""
+        return max(self.streak_lengths, default=0)
+
+    @property
+    def current_streak(self):
+        """the habit's current streak ('int', read-only)"""
+        if not self.final_indices:
+            return 0
+        return ana.calculate_curr_streak_of_indices(self.final_indices, self.periodicity)
+
+    @property
+    def breaks_total(self):
+        """the number of breaks since the first habit completion ('int', read-only)"""
+        if not self.final_indices:
+            return 0
+        return ana.calculate_break_no_of_indices(self.final_indices, self.periodicity)
+
+    @property
+    def completion_rate(self):
+        """the share of periods in the last four weeks in which the habit was completed ('float', read-only)"""
+        return ana.calculate_completion_rate_of_indices(self.final_indices, self.periodicity)
+
+
+def take_snapshot(habit):
+    """return a snapshot of the habit's completion data. Snapshots are cached until data is written to the
+    database or the day changes.
+
+    :param habit: the habit whose snapshot is to be returned ('habit.HabitDB')
+    :return: the habit's snapshot ('snapshot.HabitSnapshot')
+    """
+    key = ("snapshot", db.find_habit_id(habit), habit.periodicity)
+    return cache.return_cached(habit.database, key, lambda: HabitSnapshot(habit))
@@ -0,0 +1,232 @@
+"""This module contains the habit tracker's synthetic data generator, which creates large, deterministic populations
+of users, habits and completions (e.g., 10,000 users with 100,000 habits and tens of millions of completions) and
+bulk-loads them into a database to benchmark the application at scale.
+
+The most important functionalities include functions to
+    - create users and habits with configurable periodicity shares
+    - create completion histories that alternate between streaks and gaps, whose lengths depend on the habit's
+      periodicity and consistency, including abandoned habits and several completions per period
+    - bulk-load the generated data (including the habits' streak summaries) in one transaction
+
+Usage example (from the repository's root directory):
+    python synthetic_data.py synthetic.db --users 10000 --habits-per-user 10 --years 3 --seed 1
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+import bulk_analysis as ba
+import db
+import periods
+from habit import HabitDB
+from test_data import DataForTesting
+from user import UserDB
+
+PERIODICITY_SHARES = {"daily": 0.4, "weekly": 0.35, "monthly": 0.15, "yearly": 0.1}
+
+# parameters of the beta distribution of the habits' consistency (the probability that a streak continues in the
+# next period) per periodicity: habits with a longer periodicity are completed more consistently
+CONSISTENCY = {"daily": (4, 2), "weekly": (5, 2), "monthly": (6, 2), "yearly": (6, 2)}
+
+# the probability that a gap in a habit's completions continues in the next period
+GAP_CONTINUATION = {"daily": 0.6, "weekly": 0.5, "monthly": 0.4, "yearly": 0.3}
+
+ABANDONMENT_RATE = 0.25  # the share of habits that are no longer completed after some time
+EXTRA_COMPLETIONS = 0.1  # the mean number of additional completions in a completed period
+
+
+class SyntheticData(DataForTesting):
+    """Every SyntheticData instance creates a deterministic synthetic population of users, habits and completions.
+    The same seed, population size and end date always result in the same data. Like the DataForTesting class, it
+    provides the create_test_data method to store the data in a database, which must not contain any user data yet.
+
+    Attributes:
+        no_users ('int'): the number of users
+        habits_per_user ('float'): the mean number of habits per user (Poisson distributed)
+        no_years ('int'): the maximum number of years covered by a habit's completions
+        end_date ('date'): the last day of the completion histories
+        seed ('int'): the seed of the random number generator
+        database ('sqlite3.connection'): the database connection which stores the synthetic data
+        users ('list'): the generated users ('user.UserDB')
+        habits ('list'): the generated habits ('habit.HabitDB')
+        no_completions ('int'): the number of generated completions
+    """
+
+    def __init__(self, no_users: int = 100, habits_per_user: float = 10, no_years: int = 3, end_date: date = None,
+                 seed: int = 1):
+        self.no_users = no_users
+        self.habits_per_user = habits_per_user
+        self.no_years = no_years
+        self.end_date = end_date if end_date else date.today()
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.database = None
+        self.users, self.habits = [], []
+        self.creation_days = []
+        self.no_completions = 0
+
+    def create_users(self, database):
+        """create the synthetic users
+
+        :param database: the database connection where the users are to be stored ('sqlite3.connection')
+        """
+        if db.check_for_user_data(database):
+            raise ValueError("Synthetic data can only be loaded into a database without user data.")
+        self.database = database
+        self.users = [UserDB(f"user{user_id}", database, user_id) for user_id in range(1, self.no_users + 1)]
+
+    def store_users(self):
+        """store the synthetic users in the database (the change is committed with the completions)"""
+        db.insert_users(self.database, ((user.user_id, user.username) for user in self.users))
+
+    def create_habits(self):
+        """create the habits of the synthetic users with randomly chosen periodicities and creation days"""
+        habit_counts = self.rng.poisson(self.habits_per_user, len(self.users))
+        periodicities = self.rng.choice(list(PERIODICITY_SHARES), p=list(PERIODICITY_SHARES.values()),
+                                         size=int(habit_counts.sum()))
+        end_day = periods.date_to_day(self.end_date)
+        self.creation_days = (end_day - self.rng.integers(0, self.no_years * 365, len(periodicities))).tolist()
+        habit_id = 0
+        for user, habit_count in zip(self.users, habit_counts.tolist()):
+            for habit_number in range(1, habit_count + 1):
+                self.habits.append(HabitDB(f"habit{habit_number}", str(periodicities[habit_id]), user,
+                                           habit_id + 1))
+                habit_id += 1
+
+    def store_habits(self):
+        """store the synthetic habits in the database (the change is committed with the completions)"""
+        db.insert_habits(self.database, (
+            (habit.habit_id, habit.user.user_id, habit.name, habit.periodicity,
+             f"{periods.day_to_date(creation_day)} 08:00:00.000000")
+            for habit, creation_day in zip(self.habits, self.creation_days)))
+
+    def create_period_indices(self, periodicity: str, first_index: int, last_index: int):
+        """create the indices of the periods in which a habit was completed. The history alternates between streaks
+        and gaps with geometrically distributed lengths. Abandoned habits are not completed after a random period.
+
+        :param periodicity: the habit's periodicity ('str')
+        :param first_index: the index of the period in which the habit was created ('int')
+        :param last_index: the index of the last period of the history ('int')
+        :return: a sorted array of the period indices ('numpy.ndarray')
+        """
+        if self.rng.random() < ABANDONMENT_RATE:
+            last_index = int(self.rng.integers(first_index, last_index + 1))
+        no_periods = last_index - first_index + 1
+        consistency = self.rng.beta(*CONSISTENCY[periodicity])
+        mean_cycle = 1 / (1 - consistency) + 1 / (1 - GAP_CONTINUATION[periodicity])
+        no_cycles = int(no_periods / mean_cycle * 2) + 10  # enough cycles to cover the history
+        streaks = self.rng.geometric(1 - consistency, no_cycles)
+        gaps = self.rng.geometric(1 - GAP_CONTINUATION[periodicity], no_cycles)
+        if self.rng.random() < 0.5:  # half of the histories start in the period in which the habit was created
+            gaps[0] = 0
+        streak_starts = first_index + np.cumsum(gaps) + np.r_[0, np.cumsum(streaks)[:-1]]
+        offsets = np.arange(streaks.sum()) - np.repeat(np.cumsum(streaks) - streaks, streaks)
+        period_indices = np.repeat(streak_starts, streaks) + offsets
+        return period_indices[period_indices <= last_index]
+
+    def calculate_completion_days(self, periodicity: str, period_indices):
+        """choose the days of the completions within the completed periods. Some periods are completed several times.
+
+        :param periodicity: the habit's periodicity ('str')
+        :param period_indices: the indices of the completed periods ('numpy.ndarray')
+        :return: a sorted array of the completion days (number of days since the first of January 1970)
+        ('numpy.ndarray')
+        """
+        period_indices = np.repeat(period_indices, 1 + self.rng.poisson(EXTRA_COMPLETIONS, len(period_indices)))
+        if periodicity == "daily":
+            return period_indices
+        if periodicity == "weekly":
+            starts, lengths = period_indices * 7 - 3, np.full(len(period_indices), 7)
+        else:
+            unit = "M" if periodicity == "monthly" else "Y"
+            start_dates = period_indices.astype(f"datetime64[{unit}]")
+            starts = start_dates.astype("datetime64[D]").astype(np.int64)
+            lengths = (start_dates + 1).astype("datetime64[D]").astype(np.int64) - starts
+        return np.sort(starts + (self.rng.random(len(starts)) * lengths).astype(np.int64))
+
+    def create_habit_completions(self, habit, creation_day: int, end_day: int):
+        """create the completions of a habit and its streak summary
+
+        :param habit: the habit ('habit.HabitDB')
+        :param creation_day: the day the habit was created ('int')
+        :param end_day: the last day of the history ('int')
+        :return: a tuple ('tuple') containing the completion days ('numpy.ndarray') and the habit's streak summary
+        ('db.HabitStats')
+        """
+        first_index, last_index = periods.calculate_period_indices(habit.periodicity, [creation_day, end_day])
+        period_indices = self.create_period_indices(habit.periodicity, first_index, last_index)
+        completion_days = self.calculate_completion_days(habit.periodicity, period_indices)
+        completion_days = completion_days[(completion_days >= creation_day) & (completion_days <= end_day)]
+        return completion_days, self.calculate_habit_stats(habit.periodicity, completion_days)
+
+    @staticmethod
+    def calculate_habit_stats(periodicity: str, completion_days):
+        """calculate the streak summary of a habit from its completion days (like db.calculate_habit_stats, but
+        with vectorized operations)
+
+        :param periodicity: the habit's periodicity ('str')
+        :param completion_days: the habit's completion days ('numpy.ndarray')
+        :return: the habit's streak summary ('db.HabitStats')
+        """
+        if len(completion_days) == 0:
+            return db.HabitStats(None, 0, 0, 0, 0)
+        codes = np.full(len(completion_days), ba.PERIODICITY_CODES[periodicity])
+        period_indices = np.unique(ba.calculate_period_indices(codes, completion_days))
+        streak_starts = np.flatnonzero(np.r_[True, np.diff(period_indices) != 1])
+        streak_lengths = np.diff(np.r_[streak_starts, len(period_indices)])
+        last_period = periods.calculate_period_start_of_index(periodicity, int(period_indices[-1]))
+        return db.HabitStats(last_period, int(streak_lengths[-1]), int(streak_lengths.max()),
+                             len(streak_lengths) - 1, len(completion_days))
+
+    def store_habit_completions(self, chunk_size: int = 1000):
+        """create and store the completions and streak summaries of all synthetic habits, chunk by chunk, and
+        commit all data in one transaction
+
+        :param chunk_size: the number of habits whose completions are created and stored together ('int')
+        """
+        end_day = periods.date_to_day(self.end_date)
+        first_day = min(self.creation_days, default=end_day)
+        date_strings = np.datetime_as_string(np.arange(first_day, end_day + 1).astype("datetime64[D]")).tolist()
+        time_strings = [str(timedelta(seconds=second)).zfill(8) + ".000000" for second in range(86400)]
+        for chunk_start in range(0, len(self.habits), chunk_size):
+            completion_rows, stats_rows = [], []
+            for habit, creation_day in zip(self.habits[chunk_start:chunk_start + chunk_size],
+                                           self.creation_days[chunk_start:chunk_start + chunk_size]):
+                completion_days, habit_stats = self.create_habit_completions(habit, creation_day, end_day)
+                seconds = self.rng.integers(6 * 3600, 23 * 3600, len(completion_days)).tolist()
+                completion_rows.extend((habit.habit_id, date_strings[day - first_day], time_strings[second], day)
+                                       for day, second in zip(completion_days.tolist(), seconds))
+                last_period = str(habit_stats.last_period) if habit_stats.last_period else None
+                stats_rows.append((habit.habit_id, last_period) + tuple(habit_stats[1:]))
+            db.insert_completions(self.database, completion_rows)
+            db.insert_habit_stats(self.database, stats_rows)
+            self.no_completions += len(completion_rows)
+        self.database.commit()
+
+
+def main():
+    """parse the command line arguments, generate the synthetic dataset and bulk-load it into the database file"""
+    parser = argparse.ArgumentParser(description="Generate synthetic habit data and bulk-load it into a database.")
+    parser.add_argument("database", help="the database file, which must not contain any user data yet")
+    parser.add_argument("--users", type=int, default=10000, help="the number of users (default: 10000)")
+    parser.add_argument("--habits-per-user", type=float, default=10, help="the mean number of habits per user")
+    parser.add_argument("--years", type=int, default=3, help="the maximum number of years of completions")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="the last day of the histories (default: today)")
+    parser.add_argument("--seed", type=int, default=1, help="the seed of the random number generator")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    synthetic_data = SyntheticData(args.users, args.habits_per_user, args.years, args.end_date, args.seed)
+    database = db.get_db(args.database)
+    database.execute("PRAGMA synchronous = OFF")  # the data can be generated again if loading fails
+    synthetic_data.create_test_data(database)
+    database.close()
+    print(f"Stored {len(synthetic_data.users)} users, {len(synthetic_data.habits)} habits "
+          f"and {synthetic_data.no_completions} completions in {time.perf_counter() - start:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,33 @@ The test classes include classes to test the application's main functionalities
     - the command line interface (test_cli.py)
     - the database module (test_db.py)
     - the HabitDB (habit.py) and UserDB (user.py) classes (user.py, habit.py)
+    - the snapshot module (test_snapshot.py)
+    - the bulk analysis module (test_bulk_analysis.py)
+    - the cache module (test_cache.py)
+    - the non-interactive command line interface (test_batch.py)
+    - the command pipe (test_pipe.py)
+    - the result types (test_results.py)
+    - the synthetic data generator (test_synthetic_data.py)
+    - the query tracing (test_tracing.py)
+    - the profiling hooks (test_profiling.py)
+    - the connection pool (test_pool.py)
+    - the asynchronous service interface (test_async_api.py)
+    - the HTTP server (test_server.py)
 """
 
 from .test_analyze import *
 from .test_db import *
 from .test_habit_user_classes import *
 from .test_cli import *
+from .test_snapshot import *
+from .test_bulk_analysis import *
+from .test_cache import *
+from .test_batch import *
+from .test_pipe import *
+from .test_results import *
+from .test_synthetic_data import *
+from .test_tracing import *
+from .test_profiling import *
+from .test_pool import *
+from .test_async_api import *
+from .test_server import *
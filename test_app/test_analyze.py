@@ -1,6 +1,7 @@
 from datetime import date, timedelta, datetime
 
 import analyze as ana
+import periods
 import test_data
 from user import UserDB
 
@@ -20,6 +21,8 @@ class TestHabitAnalysis(test_data.DataForTestingPytest):
         assert len(user_df) == 4
         completions_df = ana.create_data_frame(self.database, "Completions")
         assert len(completions_df) == 79
+        filtered_df = ana.create_data_frame(self.database, "Completions", {"FKHabitID": 2})
+        assert filtered_df["CompletionDate"].to_list() == ["2021-12-02", "2021-12-31"]
 
     def test_check_for_username(self):
         """test whether the database can be checked for the existance of usernames"""
@@ -41,6 +44,8 @@ class TestHabitAnalysis(test_data.DataForTestingPytest):
         assert len(habit_completions_ginny_hp) == 20
         habit_completions_books_hg = ana.return_completions(self.books_hg)
         assert habit_completions_books_hg == ["2021-12-02", "2021-12-31"]
+        completion_days_books_hg = ana.return_completion_days(self.books_hg)
+        assert completion_days_books_hg == [18963, 18992]
 
     def test_return_ordered_periodicities(self):
         """test whether the periodicities of a user's habits are correctly returned and in the correct order"""
@@ -63,67 +68,79 @@ class TestHabitAnalysis(test_data.DataForTestingPytest):
         """tests if the period starts corresponding to the completion dates and the periodicity
         of a habit are calculated correctly"""
         # test weekly_start, monthly_start and yearly_start functions
-        assert ana.weekly_start(date(2022, 1, 26)) == date(2022, 1, 24)
-        assert ana.monthly_start(date(2022, 2, 26)) == date(2022, 2, 1)
-        assert ana.yearly_start(date(2022, 3, 24)) == date(2022, 1, 1)
+        assert periods.weekly_start(date(2022, 1, 26)) == date(2022, 1, 24)
+        assert periods.monthly_start(date(2022, 2, 26)) == date(2022, 2, 1)
+        assert periods.yearly_start(date(2022, 3, 24)) == date(2022, 1, 1)
+
+        # test the conversion of completion days
+        assert periods.date_to_day(date(1970, 1, 2)) == 1
+        assert periods.day_to_date(19024) == date(2022, 2, 1)
+        assert periods.calculate_period_starts("weekly", [19024, 19025]) == [date(2022, 1, 31), date(2022, 1, 31)]
 
         # test calculate_one_period_start function
-        assert ana.calculate_one_period_start("weekly", date(2022, 1, 26)) == date(2022, 1, 24)
-        assert ana.calculate_one_period_start("daily", date(2022, 2, 23)) == date(2022, 2, 23)
-        assert ana.calculate_one_period_start("monthly", date(2021, 12, 24)) == date(2021, 12, 1)
-        assert ana.calculate_one_period_start("yearly", date(2021, 8, 2)) == date(2021, 1, 1)
+        assert periods.calculate_one_period_start("weekly", date(2022, 1, 26)) == date(2022, 1, 24)
+        assert periods.calculate_one_period_start("daily", date(2022, 2, 23)) == date(2022, 2, 23)
+        assert periods.calculate_one_period_start("monthly", date(2021, 12, 24)) == date(2021, 12, 1)
+        assert periods.calculate_one_period_start("yearly", date(2021, 8, 2)) == date(2021, 1, 1)
 
         # test calculate_period_starts function
         check_dates_daily = ["2022-01-25", "2022-01-27"]
-        periods_daily = ana.calculate_period_starts("daily", check_dates_daily)
+        periods_daily = periods.calculate_period_starts("daily", check_dates_daily)
         assert periods_daily == [date(2022, 1, 25), date(2022, 1, 27)]
 
         check_dates_weekly = [date(2022, 1, 25), date(2022, 1, 20), date(2022, 1, 26)]
-        periods_weekly = ana.calculate_period_starts("weekly", check_dates_weekly)
+        periods_weekly = periods.calculate_period_starts("weekly", check_dates_weekly)
         assert periods_weekly == [date(2022, 1, 24), date(2022, 1, 17), date(2022, 1, 24)]
 
         check_dates_monthly = ["2022-01-15", "2021-12-14"]
-        periods_monthly = ana.calculate_period_starts("monthly", check_dates_monthly)
+        periods_monthly = periods.calculate_period_starts("monthly", check_dates_monthly)
         assert periods_monthly == [date(2022, 1, 1), date(2021, 12, 1)]
 
         check_dates_yearly = [date(2021, 6, 1), date(2020, 5, 30)]
-        periods_yearly = ana.calculate_period_starts("yearly", check_dates_yearly)
+        periods_yearly = periods.calculate_period_starts("yearly", check_dates_yearly)
         assert periods_yearly == [date(2021, 1, 1), date(2020, 1, 1)]
 
+    def test_calculate_period_indices(self):
+        """test if consecutive periods are numbered consecutively and if the final period indices of a habit are
+        calculated correctly"""
+        assert periods.calculate_period_index("daily", date(1970, 1, 3)) == 2
+        assert periods.calculate_period_index("weekly", date(2022, 1, 30)) + 1 == \
+               periods.calculate_period_index("weekly", date(2022, 1, 31))
+        assert periods.calculate_period_index("monthly", date(2021, 12, 31)) + 1 == \
+               periods.calculate_period_index("monthly", date(2022, 1, 1))
+        assert periods.calculate_period_index("yearly", date(2022, 6, 1)) == 52
+        assert periods.calculate_period_start_of_index("weekly", periods.calculate_period_index(
+            "weekly", date(2022, 1, 26))) == date(2022, 1, 24)
+        assert periods.calculate_next_period_start("monthly", date(2022, 1, 1)) == date(2022, 2, 1)
+        assert periods.calculate_previous_period_start("yearly", date(2022, 1, 1)) == date(2021, 1, 1)
+
         # test tidy_starts function
-        tidy_starts_weekly = ana.tidy_starts(periods_weekly)
-        assert tidy_starts_weekly == [date(2022, 1, 17), date(2022, 1, 24)]
-
-        # test add_future_period function
-        future_period = ana.calculate_one_period_start("weekly", date.today() + timedelta(weeks=2))
-        assert ana.add_future_period(tidy_starts_weekly, "weekly") == [date(2022, 1, 17), date(2022, 1, 24),
-                                                                       future_period]
-
-        # test return_final_period_starts function
-        final_periods_hedwig = ana.return_final_period_starts(self.hedwig_hp)
-        final_periods_ginny = ana.return_final_period_starts(self.ginny_hp)
-        final_periods_malfoy = ana.return_final_period_starts(self.malfoy_hp)
-        final_periods_voldemort = ana.return_final_period_starts(self.kill_voldemort_hp)
-        assert len(final_periods_hedwig) == 36
-        assert len(final_periods_ginny) == 12
-        assert len(final_periods_malfoy) == 9
-        assert len(final_periods_voldemort) == 3
+        assert ana.tidy_starts([2732, 2731, 2732]) == [2731, 2732]
+
+        # test add_future_period_index function
+        future_period = periods.calculate_period_index("weekly", date.today()) + 2
+        assert ana.add_future_period_index([2731, 2732], "weekly") == [2731, 2732, future_period]
+
+        # test return_final_period_indices function
+        assert len(ana.return_final_period_indices(self.hedwig_hp)) == 36
+        assert len(ana.return_final_period_indices(self.ginny_hp)) == 12
+        assert len(ana.return_final_period_indices(self.malfoy_hp)) == 9
+        assert len(ana.return_final_period_indices(self.kill_voldemort_hp)) == 3
 
     def test_calculate_break_indices(self):
-        """test if it is possible to calculate a habit's break indices correctly"""
+        """test if it is possible to calculate a habit's break positions correctly"""
         # test calculate_element_diffs function
-        dates = [date(2021, 7, 3), date(2021, 7, 9), date(2021, 7, 10), date(2021, 8, 10)]
-        assert ana.calculate_element_diffs(dates) == [timedelta(days=6), timedelta(days=1), timedelta(days=31)]
-
-        # test calculate break_indices function
-        final_periods_hedwig = ana.return_final_period_starts(self.hedwig_hp)
-        final_periods_ginny = ana.return_final_period_starts(self.ginny_hp)
-        final_periods_malfoy = ana.return_final_period_starts(self.malfoy_hp)
-        final_periods_voldemort = ana.return_final_period_starts(self.kill_voldemort_hp)
-        assert ana.calculate_break_indices(final_periods_hedwig, "daily") == [4, 25, 28, 29, 32, 34]
-        assert ana.calculate_break_indices(final_periods_ginny, "weekly") == [4, 7, 10]
-        assert ana.calculate_break_indices(final_periods_malfoy, "monthly") == [1, 7]
-        assert ana.calculate_break_indices(final_periods_voldemort, "yearly") == [1]
+        assert ana.calculate_element_diffs([3, 9, 10, 41]) == [6, 1, 31]
+
+        # test calculate_break_positions function
+        final_indices_hedwig = ana.return_final_period_indices(self.hedwig_hp)
+        final_indices_ginny = ana.return_final_period_indices(self.ginny_hp)
+        final_indices_malfoy = ana.return_final_period_indices(self.malfoy_hp)
+        final_indices_voldemort = ana.return_final_period_indices(self.kill_voldemort_hp)
+        assert ana.calculate_break_positions(final_indices_hedwig) == [4, 25, 28, 29, 32, 34]
+        assert ana.calculate_break_positions(final_indices_ginny) == [4, 7, 10]
+        assert ana.calculate_break_positions(final_indices_malfoy) == [1, 7]
+        assert ana.calculate_break_positions(final_indices_voldemort) == [1]
 
     def test_calculate_longest_streak(self):
         """test if the a habit's longest streak is calculated correctly"""
@@ -173,15 +190,15 @@ class TestHabitAnalysis(test_data.DataForTestingPytest):
 
     def test_completed_in_period(self):
         """test if it is possible to check if a habit was completed in the current or the previous period"""
-        final_periods_hedwig_hp = ana.return_final_period_starts(self.hedwig_hp)
-        final_periods_ginny_hp = ana.return_final_period_starts(self.ginny_hp)
-        final_periods_study_hg = ana.return_final_period_starts(self.study_hg)
-        assert ana.completed_in_period(final_periods_hedwig_hp, self.hedwig_hp.periodicity, "previous") is False
-        assert ana.completed_in_period(final_periods_ginny_hp, self.ginny_hp.periodicity, "previous") is True
-        assert ana.completed_in_period(final_periods_study_hg, self.study_hg.periodicity, "previous") is False
-        assert ana.completed_in_period(final_periods_hedwig_hp, self.hedwig_hp.periodicity, "current") is False
-        assert ana.completed_in_period(final_periods_ginny_hp, self.ginny_hp.periodicity, "current") is True
-        assert ana.completed_in_period(final_periods_study_hg, self.study_hg.periodicity, "current") is True
+        final_indices_hedwig_hp = ana.return_final_period_indices(self.hedwig_hp)
+        final_indices_ginny_hp = ana.return_final_period_indices(self.ginny_hp)
+        final_indices_study_hg = ana.return_final_period_indices(self.study_hg)
+        assert ana.completed_in_period_index(final_indices_hedwig_hp, self.hedwig_hp.periodicity, "previous") is False
+        assert ana.completed_in_period_index(final_indices_ginny_hp, self.ginny_hp.periodicity, "previous") is True
+        assert ana.completed_in_period_index(final_indices_study_hg, self.study_hg.periodicity, "previous") is False
+        assert ana.completed_in_period_index(final_indices_hedwig_hp, self.hedwig_hp.periodicity, "current") is False
+        assert ana.completed_in_period_index(final_indices_ginny_hp, self.ginny_hp.periodicity, "current") is True
+        assert ana.completed_in_period_index(final_indices_study_hg, self.study_hg.periodicity, "current") is True
 
     def test_calculate_curr_streak(self):
         """test if a habit's current streak is calculated correctly"""
@@ -247,4 +264,6 @@ class TestHabitAnalysis(test_data.DataForTestingPytest):
         habit_list_hg = ana.habit_creator(self.hermione_g)
         habits_with_data_hg = ana.find_completed_habits(habit_list_hg)
         comparison_data_hg = ana.analyze_all_habits(habits_with_data_hg)
-        assert list(comparison_data_hg) == ["Study", "Read books"]
+        assert comparison_data_hg.columns == ["Study", "Read books"]
+        assert comparison_data_hg.index == ana.analysis_index()
+        assert comparison_data_hg.column("Study")[0] == "daily"
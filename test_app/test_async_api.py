@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import analyze as ana
+import pytest
+from async_api import HabitService
+from pool import ConnectionPool
+
+
+class TestAsyncAPI:
+    """This class tests the asynchronous service interface provided by the application's async_api module
+    (async_api.py)."""
+
+    def test_operations(self, tmp_path):
+        """test that habits can be created, checked off and analyzed concurrently"""
+        async def use_service():
+            async with HabitService(ConnectionPool(str(tmp_path / "habits.db"), max_connections=3)) as service:
+                usernames = [f"user{number}" for number in range(6)]
+                await asyncio.gather(*(service.create_habit(username, "Read", "daily") for username in usernames))
+                await asyncio.gather(*(service.check_off(username, "Read", f"2022-02-0{day} 08:00:00.000000")
+                                       for username in usernames for day in range(1, 4)))
+                reports = await asyncio.gather(*(service.analyze_user(username) for username in usernames))
+                with pytest.raises(ValueError):
+                    await service.check_off("Voldemort", "Read")
+                service.pool.close()
+            return reports
+
+        reports = asyncio.run(use_service())
+        assert [report["user"] for report in reports] == [f"user{number}" for number in range(6)]
+        assert all(report["longest_streak"] == 3 and report["best_habits"] == ["Read"] for report in reports)
+
+    def test_concurrent_user_creation(self, tmp_path):
+        """test that habits of a new user can be created concurrently without creating the user twice"""
+        barrier, check_for_username = threading.Barrier(4), ana.check_for_username
+
+        def check_simultaneously(user):  # all workers look up the new user before any of them creates it
+            user_exists = check_for_username(user)
+            try:
+                barrier.wait(timeout=0.2)
+            except threading.BrokenBarrierError:
+                pass
+            return user_exists
+
+        async def use_service():
+            async with HabitService(ConnectionPool(str(tmp_path / "habits.db"), max_connections=4)) as service:
+                await asyncio.gather(*(service.create_habit("NevilleL", f"Habit {number}", "daily")
+                                       for number in range(8)))
+                report = await service.analyze_user("NevilleL")
+                service.pool.close()
+            return report
+
+        with patch("analyze.check_for_username", side_effect=check_simultaneously):
+            report = asyncio.run(use_service())
+        assert sorted(habit["name"] for habit in report["habits"]) == [f"Habit {number}" for number in range(8)]
+
+    def test_event_loop_not_blocked(self, tmp_path):
+        """test that the event loop keeps running while an operation runs in a worker thread and that the number of
+        concurrent operations is bounded by the number of connections"""
+        running, max_running, lock = [0], [0], threading.Lock()
+
+        def slow_operation(database):
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return database is not None
+
+        async def use_service():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            async with HabitService(ConnectionPool(str(tmp_path / "habits.db"), max_connections=2)) as service:
+                ticker = asyncio.create_task(tick())
+                results = await asyncio.gather(*(service.run(slow_operation) for _ in range(6)))
+                ticker.cancel()
+                service.pool.close()
+            return results, ticks
+
+        results, ticks = asyncio.run(use_service())
+        assert all(results)
+        assert max_running[0] == 2
+        assert ticks > 5
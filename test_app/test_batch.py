@@ -0,0 +1,82 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+import analyze as ana
+import batch
+import db
+import pytest
+import test_data
+
+
+class TestBatch(test_data.DataForTestingPytest):
+    """This class tests the main functionalities provided by the application's non-interactive command line
+    interface (batch.py) using the test data it inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def run(self, *argv):
+        """run a command of the non-interactive command line interface on the test database
+
+        :param argv: the command line arguments ('str')
+        :return: the output of the command ('str')
+        """
+        args = batch.create_parser().parse_args(list(argv))
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            batch.run_command(self.database, args)
+        return mock_stdout.getvalue()
+
+    def test_create(self):
+        """test that habits (and their user) can be created"""
+        assert self.run("create", "Dobby", "daily", "Free elves", "Iron hands") == "Created 2 habit(s).\n"
+        assert ana.return_habit_registry(batch.return_user(self.database, "Dobby"))["Iron hands"].periodicity == \
+               "daily"
+        with pytest.raises(ValueError):
+            self.run("create", "HarryP", "weekly", "Feed Hedwig")
+
+    def test_create_invalid(self):
+        """test that users with invalid usernames are not created and that a new user is not stored if their habits
+        cannot be created"""
+        for username in ["Bad Name", "Dobby!", ""]:
+            with pytest.raises(ValueError):
+                self.run("create", username, "daily", "Free elves")
+        with pytest.raises(ValueError):
+            self.run("create", "Dobby", "daily", "Free elves", "Free elves")
+        assert "Dobby" not in db.return_username_index(self.database)
+        assert not db.select_rows(self.database, "HabitAppUser", {"UserName": "Dobby"})
+
+    def test_checkoff_and_import(self, tmp_path):
+        """test that habits can be checked off and that completions can be imported in one transaction"""
+        self.run("checkoff", "Voldemort", "Kill Harry", "--at", "2022-02-01 08:00:00")
+        assert self.kill_harry_v.last_completion == "2022-02-01"
+        csv_file = tmp_path / "completions.csv"
+        csv_file.write_text("habit,datetime\nKill Harry,2022-02-02 08:00:00\nKill Harry,2022-02-03 08:00:00\n")
+        assert self.run("import", "Voldemort", str(csv_file)) == "Imported 2 completion(s).\n"
+        assert ana.return_completions(self.kill_harry_v) == ["2022-02-01", "2022-02-02", "2022-02-03"]
+        csv_file.write_text("Kill Harry,2022-02-04 08:00:00\nKill Dumbledore,2022-02-05 08:00:00\n")
+        with pytest.raises(ValueError):  # no completion is stored if one of the habits does not exist
+            self.run("import", "Voldemort", str(csv_file))
+        assert len(ana.return_completions(self.kill_harry_v)) == 3
+        with pytest.raises(ValueError, match="expected a date and a time"):
+            self.run("checkoff", "Voldemort", "Kill Harry", "--at", "2022-02-06")
+        csv_file.write_text("Kill Harry,2022-02-07 08:00:00\nKill Harry,2022-02-08\n")
+        with pytest.raises(ValueError, match="expected a date and a time"):
+            self.run("import", "Voldemort", str(csv_file))
+        assert len(ana.return_completions(self.kill_harry_v)) == 3
+
+    def test_report_and_export(self):
+        """test that the statistics of a user's habits can be reported and that the user's data can be exported"""
+        report = json.loads(self.run("report", "HermioneG"))
+        assert [habit["name"] for habit in report["habits"]] == ["Study", "Read books"]
+        assert report["longest_streak"] == self.hermione_g.longest_streak
+        assert report["habits"][0]["longest_streak"] == self.study_hg.best_streak
+        export = json.loads(self.run("export", "HermioneG"))
+        assert export["habits"][1]["completions"] == \
+               [" ".join(row) for row in db.select_rows(self.database, "Completions", {"FKHabitID": 2},
+                                                        ["CompletionDate", "CompletionTime"])]
+
+    def test_main(self):
+        """test that the exit code indicates whether the command succeeded"""
+        with patch("batch.db.get_db", return_value=self.database), patch("sys.stderr", new_callable=StringIO):
+            assert batch.main(["report", "UnknownUser"]) == 1
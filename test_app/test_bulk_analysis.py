@@ -0,0 +1,64 @@
+from datetime import date
+
+import numpy as np
+
+import analyze as ana
+import bulk_analysis as ba
+import periods
+import test_data
+
+
+class TestBulkAnalysis(test_data.DataForTestingPytest):
+    """This class tests the vectorized analysis of many habits provided by the application's bulk analysis module
+    (bulk_analysis.py) using the test data it inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def test_calculate_period_indices(self):
+        """test whether consecutive periods are mapped to consecutive indices"""
+        days = [periods.date_to_day(check_date) for check_date in
+                [date(2022, 1, 30), date(2022, 1, 31), date(2022, 2, 6), date(2022, 2, 7)]]
+        weekly = ba.calculate_period_indices(np.full(4, ba.PERIODICITY_CODES["weekly"]), days)
+        assert list(np.diff(weekly)) == [1, 0, 1]
+        monthly = ba.calculate_period_indices(np.full(4, ba.PERIODICITY_CODES["monthly"]), days)
+        assert list(monthly) == [(2022 - 1970) * 12, (2022 - 1970) * 12, (2022 - 1970) * 12 + 1,
+                                 (2022 - 1970) * 12 + 1]
+        yearly = ba.calculate_period_indices(np.full(4, ba.PERIODICITY_CODES["yearly"]), days)
+        assert list(yearly) == [52, 52, 52, 52]
+
+        # the vectorized period indices match the period indices of the periods module
+        days = list(range(-400, 20000, 37))
+        for periodicity, code in ba.PERIODICITY_CODES.items():
+            assert list(ba.calculate_period_indices(np.full(len(days), code), days)) == \
+                   periods.calculate_period_indices(periodicity, days)
+
+    def test_analyze_all_habits_at_once(self):
+        """test whether the vectorized analysis matches the analysis of each habit on its own"""
+        analysis = ba.analyze_all_habits_at_once(self.database)
+        completed_habits = self.harry_p.completed_habits + self.hermione_g.completed_habits
+        assert sorted(habit.habit_id for habit in completed_habits) == list(analysis["habit_id"])
+        for habit in completed_habits:
+            index = list(analysis["habit_id"]).index(habit.habit_id)
+            assert analysis["longest_streak"][index] == ana.calculate_longest_streak(habit)
+            assert analysis["current_streak"][index] == ana.calculate_curr_streak(habit)
+            assert analysis["breaks"][index] == ana.calculate_break_no(habit)
+            assert str(periods.day_to_date(int(analysis["last_day"][index]))) == habit.last_completion
+            if habit.periodicity in ("daily", "weekly"):
+                assert analysis["completion_rate"][index] == ana.calculate_completion_rate(habit)
+
+    def test_analyze_completions(self):
+        """test the vectorized analysis with a fixed current date and for a single user"""
+        days = [periods.date_to_day(date(2022, 2, day)) for day in [1, 2, 3, 5, 6, 6]]
+        analysis = ba.analyze_completions(np.full(6, 1), np.full(6, ba.PERIODICITY_CODES["daily"]), days,
+                                          today=date(2022, 2, 7))
+        assert analysis["longest_streak"][0] == 3
+        assert analysis["current_streak"][0] == 2
+        assert analysis["breaks"][0] == 1
+        assert analysis["completion_count"][0] == 6
+        assert analysis["completion_rate"][0] == 5 / 28
+
+        user_analysis = ba.analyze_all_habits_at_once(self.database, self.hermione_g.user_id)
+        assert list(user_analysis["habit_id"]) == [1, 2]
+        no_analysis = ba.analyze_all_habits_at_once(self.database, self.voldemort.user_id)
+        assert len(no_analysis["habit_id"]) == 0
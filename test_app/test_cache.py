@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import analyze as ana
+import test_data
+from cache import LRUCache
+
+
+class TestCache(test_data.DataForTestingPytest):
+    """This class tests the caches provided by the application's cache module (cache.py) using the test data it
+    inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def test_snapshot_is_cached(self):
+        """test that a habit's completions are only loaded once if its data does not change"""
+        with patch("analyze.return_completion_days", wraps=ana.return_completion_days) as mock_completions:
+            self.hedwig_hp.analyze_habit()
+            self.hedwig_hp.analyze_habit()
+            assert self.hedwig_hp.take_snapshot() is self.hedwig_hp.take_snapshot()
+            assert mock_completions.call_count == 1
+
+    def test_user_summary_is_cached(self):
+        """test that the summary statistics of a user are only calculated once if the user's data does not change"""
+        longest_streak, best_habit = self.harry_p.longest_streak, self.harry_p.best_habit
+        with patch("analyze.return_completion_days", wraps=ana.return_completion_days) as mock_completions:
+            assert self.harry_p.longest_streak == longest_streak
+            assert self.harry_p.best_habit == best_habit
+            self.harry_p.lowest_completion_rate
+            self.harry_p.worst_habit
+            assert mock_completions.call_count == 0
+
+    def test_cache_invalidation(self):
+        """test that cached results are recalculated after data has been written to the database"""
+        snapshot = self.hedwig_hp.take_snapshot()
+        self.hedwig_hp.check_off_habit()
+        assert self.hedwig_hp.take_snapshot() is not snapshot
+        assert self.hedwig_hp.take_snapshot().last_completion == str(date.today())
+        self.hedwig_hp.modify_habit(periodicity="monthly")
+        assert self.hedwig_hp.take_snapshot().periodicity == "monthly"
+        self.harry_p.best_habit
+        self.ginny_hp.delete_habit()
+        with patch("analyze.return_completion_days", wraps=ana.return_completion_days) as mock_completions:
+            self.harry_p.best_habit
+            assert mock_completions.call_count > 0
+
+    def test_cache_day_change(self):
+        """test that cached results are recalculated on the next day"""
+        snapshot = self.hedwig_hp.take_snapshot()
+        tomorrow = date.today() + timedelta(days=1)
+        with patch("cache.date") as mock_date:
+            mock_date.today.return_value = tomorrow
+            assert self.hedwig_hp.take_snapshot() is not snapshot
+
+    def test_lru_cache(self):
+        """test that the least recently used entries are removed if the cache is full"""
+        lru_cache = LRUCache(max_size=2)
+        lru_cache.put("a", 1)
+        lru_cache.put("b", 2)
+        assert lru_cache.get("a") == 1  # "b" is now the least recently used entry
+        lru_cache.put("c", 3)
+        assert len(lru_cache) == 2
+        assert "b" not in lru_cache
+        assert lru_cache.get("a") == 1 and lru_cache.get("c") == 3
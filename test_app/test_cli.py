@@ -1,10 +1,19 @@
 import datetime
+import os
+import subprocess
+import sys
 from io import StringIO
 from unittest.mock import patch
 
 import main
+import pytest
 import test_data
+import tracing
 import analyze as ana
+from prompt_toolkit.document import Document
+from questionary import ValidationError
+from session import CLISession
+from validators import UserNameValidator
 
 
 class TestCli(test_data.DataForTestingPytest):
@@ -22,6 +31,26 @@ class TestCli(test_data.DataForTestingPytest):
         assert new_user.username == "Dumbledore"
         assert "Dumbledore" in user_df["UserName"].to_list()
 
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_create_existing_user(self, mock_stdout):
+        """test that the user is asked for another username if the username has been stored by another process since
+        it was validated"""
+        with patch('main.input_username', side_effect=["HarryP", "Dumbledore"]):
+            new_user = main.create_new_user(self.database)
+        assert new_user.username == "Dumbledore"
+        assert mock_stdout.getvalue() == "Username already existing. Please choose another one.\n" \
+                                         "A user with the username Dumbledore has successfully been created. " \
+                                         "Logged in as Dumbledore.\n"
+
+    def test_validate_username_in_memory(self):
+        """test that a new username is validated without querying the database on each key"""
+        validator = UserNameValidator(self.database, "create")
+        validator.validate(Document("Dumbled"))  # loads the username index
+        with tracing.query_budget(self.database, 0, include_transactions=True):
+            validator.validate(Document("Dumbledore"))
+            with pytest.raises(ValidationError):
+                validator.validate(Document("HarryP"))
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_login_fail(self, mock_stdout):
         """test that entering an unknown username results in a failed login"""
@@ -119,3 +148,28 @@ class TestCli(test_data.DataForTestingPytest):
         assert main.determine_possible_actions(self.harry_p) == actions["habit with data"]
         assert main.determine_possible_actions(self.ron_w) == actions["no habits"]
         assert main.determine_possible_actions(self.voldemort) == actions["habit without data"]
+
+    @patch('main.input_new_habit', return_value=("Play chess", "daily"))
+    def test_cli_session(self, mock_habit):
+        """test that the CLI session state is only renewed after actions that modify the user's data"""
+        session = CLISession(self.ron_w)
+        assert session.possible_actions == ["Create habit", "Exit"]
+        main.create_habit(self.ron_w)
+        session.note_action("Look at habits")  # does not modify the user's data
+        assert session.possible_actions == ["Create habit", "Exit"]
+        session.note_action("Create habit")
+        assert session.possible_actions == ["Manage habits", "Look at habits", "Check off habit", "Exit"]
+        session = CLISession(self.harry_p)
+        assert session.analyze_habits() is session.analyze_habits()
+        habit_analysis = session.analyze_habits()
+        session.analysis_date -= datetime.timedelta(days=1)  # the analysis is recalculated on the next day
+        assert session.analyze_habits() is not habit_analysis
+        assert [habit.name for habit in session.completed_habits] == \
+               [habit.name for habit in self.harry_p.completed_habits]
+
+    def test_lazy_imports(self):
+        """test that pandas and the test data are not imported when the application starts"""
+        code = "import sys; import main; print('pandas' in sys.modules, 'test_data' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        assert result.stdout.split() == ["False", "False"]
@@ -1,6 +1,13 @@
+import sqlite3
+from unittest.mock import patch
+
+import analyze as ana
 import db
+import pytest
 import test_data
 import os
+from habit import HabitDB
+from user import UserDB
 
 
 class TestDB(test_data.DataForTestingPytest):
@@ -57,3 +64,145 @@ class TestDB(test_data.DataForTestingPytest):
         second_database = db.get_db(":memory:")
         assert db.check_for_user_data(second_database) is False
         assert db.check_for_user_data(self.database) is True
+
+    def test_select_rows(self):
+        """test whether only the rows matching the filters are selected from a table"""
+        sql_query, parameters = db.build_select_query("Habit", {"FKUserID": 1, "Periodicity": "weekly"}, ["Name"])
+        assert sql_query == "SELECT Name FROM Habit WHERE FKUserID = ? AND Periodicity = ? ORDER BY PKHabitID"
+        assert parameters == [1, "weekly"]
+        assert db.select_rows(self.database, "Habit", {"FKUserID": 1, "Periodicity": "weekly"}, ["Name"]) == \
+               [("Meet Ginny",), ("Train Quidditch",)]
+        assert len(db.select_rows(self.database, "Completions", {"FKHabitID": 2})) == 2
+        assert len(db.select_rows(self.database, "HabitAppUser")) == 4
+        with pytest.raises(ValueError):
+            db.select_rows(self.database, "Habit", {"Name; DROP TABLE Habit": 1})
+
+    def test_migrate(self):
+        """test whether existing databases are upgraded to the current schema version"""
+        assert db.return_schema_version(self.database) == len(db.MIGRATIONS)
+        indexes = [row[1] for row in self.database.execute("PRAGMA index_list(Completions)")]
+        assert "CompletionsHabitDay" in indexes
+
+        # simulate a database which was created before the first migration was introduced
+        old_database = sqlite3.connect(":memory:")
+        old_database.execute("CREATE TABLE HabitAppUser (PKUserID INTEGER PRIMARY KEY, UserName TEXT)")
+        old_database.execute("""CREATE TABLE Habit (PKHabitID INTEGER PRIMARY KEY, FKUserID INTEGER, Name TEXT,
+        Periodicity TEXT, CreationTime TIMESTAMP)""")
+        old_database.execute("""CREATE TABLE Completions (PKCompletionsID INTEGER PRIMARY KEY, FKHabitID INTEGER,
+        CompletionDate DATE, CompletionTime TIME)""")
+        old_database.execute("INSERT INTO Habit VALUES (1, 1, 'Read', 'daily', '2022-01-01 08:00:00')")
+        old_database.execute("INSERT INTO Completions(FKHabitID, CompletionDate, CompletionTime) "
+                             "VALUES (1, '2022-02-01', '12:00:00')")
+        db.create_tables(old_database)
+        assert db.return_schema_version(old_database) == len(db.MIGRATIONS)
+        indexes = [row[1] for row in old_database.execute("PRAGMA index_list(Habit)")]
+        assert "HabitUserName" in indexes
+        assert old_database.execute("SELECT CompletionDay FROM Completions").fetchall() == [(19024,)]
+        assert old_database.execute("SELECT * FROM HabitStats").fetchall() == [(1, "2022-02-01", 1, 1, 0, 1)]
+
+        # the summaries created by migration 4 match the summaries calculated from the completions
+        self.database.execute("DELETE FROM HabitStats")
+        for statement in db.MIGRATIONS[3]:
+            self.database.execute(statement)
+        completed_habits = self.harry_p.completed_habits + self.hermione_g.completed_habits
+        assert {habit.periodicity for habit in completed_habits} == {"daily", "weekly", "monthly", "yearly"}
+        for habit in completed_habits:
+            assert db.find_habit_stats(habit) == \
+                   db.calculate_habit_stats(habit.periodicity, ana.return_completion_days(habit))
+        assert db.find_habit_stats(self.conjure_hp) is None  # the habit has not been completed
+
+        # the username index guarantees unique usernames
+        with pytest.raises(sqlite3.IntegrityError):
+            db.add_user(self.harry_p)
+
+    def test_add_completions(self):
+        """test whether several completions can be stored at once, also from an iterator"""
+        check_datetimes = (f"2022-02-{day:02d} 12:00:00" for day in range(1, 11))
+        db.add_completions(self.kill_harry_v, check_datetimes)
+        assert len(db.select_rows(self.database, "Completions", {"FKHabitID": 9})) == 10
+
+        db.add_user_completions(self.hermione_g, iter([("Study", "2022-02-01 12:00:00"),
+                                                       ("Read books", "2022-02-01 12:00:00")]))
+        assert len(self.retrieve_data("Completions")) == 79 + 10 + 2
+
+        # if one of the completions cannot be stored, none of them is stored
+        with pytest.raises(ValueError):
+            db.add_user_completions(self.hermione_g, [("Study", "2022-02-02 12:00:00"),
+                                                      ("Unknown habit", "2022-02-02 12:00:00")])
+        assert len(self.retrieve_data("Completions")) == 79 + 10 + 2
+
+    def test_habit_stats(self):
+        """test whether the habits' streak summaries are maintained correctly when completions are added"""
+        completed_habits = self.harry_p.completed_habits + self.hermione_g.completed_habits
+        for habit in completed_habits:
+            habit_stats = db.find_habit_stats(habit)
+            assert habit_stats == db.calculate_habit_stats(habit.periodicity, ana.return_completion_days(habit))
+            assert habit_stats.best_run == ana.calculate_longest_streak(habit)
+            assert ana.calculate_curr_streak_of_stats(habit_stats, habit.periodicity) == \
+                   ana.calculate_curr_streak(habit)
+            assert ana.calculate_break_no_of_stats(habit_stats, habit.periodicity) == ana.calculate_break_no(habit)
+
+        # completions in the same period, in the next period, after a break and before the last period
+        habit = HabitDB("Brew potions", "daily", self.ron_w)
+        habit.store_habit()
+        for check_datetime in ["2022-02-01 12:00:00", "2022-02-02 12:00:00", "2022-02-02 18:00:00",
+                               "2022-02-05 12:00:00", "2022-01-31 12:00:00"]:
+            habit.check_off_habit(check_datetime)
+            assert db.find_habit_stats(habit) == \
+                   db.calculate_habit_stats(habit.periodicity, ana.return_completion_days(habit))
+        assert db.find_habit_stats(habit)[1:] == (1, 3, 1, 5)
+
+        # changing the periodicity changes the streaks
+        habit.modify_habit(periodicity="monthly")
+        assert db.find_habit_stats(habit)[1:] == (2, 2, 0, 5)
+
+        # reading a summary never writes to the database, even if the habit does not have a summary
+        self.database.execute("DELETE FROM HabitStats WHERE FKHabitID = ?", [habit.habit_id])
+        self.database.commit()
+        total_changes = self.database.total_changes
+        assert db.find_habit_stats(habit) is None
+        assert self.database.total_changes == total_changes
+        assert not self.database.in_transaction
+
+    def test_add_completion_rollback(self):
+        """test that a completion is not stored if the update of the habit's streak summary fails"""
+        no_completions = len(self.retrieve_data("Completions"))
+        with patch("db.update_habit_stats", side_effect=sqlite3.OperationalError("disk I/O error")):
+            with pytest.raises(sqlite3.OperationalError):
+                self.hedwig_hp.check_off_habit("2022-02-01 12:00:00")
+        assert not self.database.in_transaction
+        self.database.commit()
+        assert len(self.retrieve_data("Completions")) == no_completions
+
+    def test_find_completed_habit_ids(self):
+        """test whether the completed habits of a user are identified with a single query"""
+        assert db.find_completed_habit_ids(self.database, self.harry_p.user_id) == \
+               {self.hedwig_hp.habit_id, self.ginny_hp.habit_id, self.malfoy_hp.habit_id,
+                self.quidditch_hp.habit_id, self.kill_voldemort_hp.habit_id}
+        assert db.find_completed_habit_ids(self.database, self.voldemort.user_id) == set()
+        statements = []
+        self.database.set_trace_callback(statements.append)
+        completed_habits = ana.find_completed_habits(self.harry_p.defined_habits)
+        self.database.set_trace_callback(None)
+        assert [habit.name for habit in completed_habits] == ["Feed Hedwig", "Meet Ginny", "Tease Malfoy",
+                                                              "Train Quidditch", "Kill Voldemort"]
+        assert len([statement for statement in statements if "Completions" in statement]) == 1
+
+    def test_username_index(self):
+        """test whether the username index is loaded only once and kept up to date when users are added"""
+        assert db.return_username_index(self.database) == {"HarryP": 1, "HermioneG": 2, "RonW": 3, "Voldemort": 4}
+        statements = []
+        self.database.set_trace_callback(statements.append)
+        db.return_username_index(self.database)
+        assert ana.check_for_username(UserDB("RonW", self.database))
+        self.database.set_trace_callback(None)
+        assert not statements
+        db.add_user(UserDB("DracoM", self.database))
+        assert db.return_username_index(self.database)["DracoM"] == 5
+
+        # users stored by other connections are found in the database
+        self.database.execute("INSERT INTO HabitAppUser(UserName) VALUES ('LunaL')")
+        luna_l = UserDB("LunaL", self.database)
+        assert ana.check_for_username(luna_l)
+        assert luna_l.user_id == 6
+        assert "LunaL" in db.return_username_index(self.database)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import analyze as ana
 import db
 import test_data
@@ -73,6 +75,20 @@ class TestHabitUser(test_data.DataForTestingPytest):
         assert self.conjure_hp.best_streak == 3
         assert self.conjure_hp.completion_rate == round(((3 / 28) * 100))
 
+    def test_streaks_from_habit_stats(self):
+        """test that a habit's streaks are read from its streak summary without loading its completions and that
+        they are calculated from its completions if it does not have a summary"""
+        with patch("analyze.return_completion_days", wraps=ana.return_completion_days) as mock_completions:
+            streaks = [self.hedwig_hp.best_streak, self.hedwig_hp.current_streak, self.hedwig_hp.breaks_total]
+            assert mock_completions.call_count == 0
+        snapshot = self.hedwig_hp.take_snapshot()
+        assert streaks == [snapshot.best_streak, snapshot.current_streak, snapshot.breaks_total]
+        assert self.hedwig_hp.analyze_habit()[2:5] == ["21 period(s)", "0 period(s)", 6]
+
+        self.database.execute("DELETE FROM HabitStats WHERE FKHabitID = ?", [self.hedwig_hp.habit_id])
+        assert [self.hedwig_hp.best_streak, self.hedwig_hp.current_streak, self.hedwig_hp.breaks_total] == streaks
+        assert self.kill_harry_v.best_streak == 0  # the habit has not been completed yet
+
     def test_userDB(self):
         """test whether users can be stored in the database"""
         user = UserDB("Dobby", self.database)
@@ -88,19 +104,38 @@ class TestHabitUser(test_data.DataForTestingPytest):
         assert "Conjuring" not in completed_names
         assert "Feed Hedwig" in completed_names
 
+    def test_habit_registry(self):
+        """test whether a user's habits are looked up by name without querying the database and whether the
+        registry is renewed after habits have been created, modified or deleted"""
+        habit_registry = ana.return_habit_registry(self.hermione_g)
+        statements = []
+        self.database.set_trace_callback(statements.append)
+        assert ana.return_habit_registry(self.hermione_g) is habit_registry
+        assert self.hermione_g.habit_names == ["Study", "Read books"]
+        assert [habit.habit_id for habit in self.hermione_g.defined_habits] == [1, 2]
+        self.database.set_trace_callback(None)
+        assert not statements
+        HabitDB("Brew potions", "weekly", self.hermione_g).store_habit()
+        assert self.hermione_g.habit_names == ["Study", "Read books", "Brew potions"]
+        habit_registry["Read books"].modify_habit(name="Correct Ron")
+        assert self.hermione_g.habit_names == ["Study", "Correct Ron", "Brew potions"]
+        ana.return_habit_registry(self.hermione_g)["Study"].delete_habit()
+        assert self.hermione_g.habit_names == ["Correct Ron", "Brew potions"]
+
     def test_return_habit_information(self):
         """test wehther habit information can be returned correctly for all habits and for habits with
         a certain periodicity"""
         habit_info = self.harry_p.return_habit_information()
-        assert "weekly" in habit_info["Periodicity"].to_list()
+        assert habit_info.column("Periodicity") == sorted(habit_info.column("Periodicity"))
+        assert "weekly" in habit_info.column("Periodicity")
         habit_daily_info = self.harry_p.return_habit_information(periodicity="daily")
-        assert "weekly" not in habit_daily_info["Periodicity"].to_list()
+        assert "weekly" not in habit_daily_info.column("Periodicity")
 
     def test_analyze_habits(self):
         """test if a user's statistics are calculated correctly"""
         habit_comparison, statistics = self.harry_p.analyze_habits()
         assert len(habit_comparison.columns) == 5
-        assert "Train Quidditch" in statistics["Data"].to_list()
+        assert "Train Quidditch" in statistics.column("Data")
         assert self.harry_p.best_habit == "Feed Hedwig"
         assert self.harry_p.worst_habit == "Train Quidditch"
         assert self.harry_p.lowest_completion_rate == 0
@@ -120,3 +155,22 @@ class TestHabitUser(test_data.DataForTestingPytest):
         strong.store_habit()
         assert hulk.lowest_completion_rate == "---"
         assert hulk.worst_habit == "---"
+
+    def test_primary_keys(self):
+        """test that users and habits hold their primary keys, so that no further id lookups are necessary"""
+        assert self.harry_p.user_id == 1
+        assert self.ginny_hp.habit_id == 4
+        assert [habit.habit_id for habit in self.hermione_g.defined_habits] == [1, 2]
+        self.books_hg.modify_habit(name="Correct Ron")
+        assert self.books_hg.habit_id == 2
+
+        statements = []
+        self.database.set_trace_callback(statements.append)
+        self.books_hg.check_off_habit()
+        self.database.set_trace_callback(None)
+        assert not [statement for statement in statements if statement.startswith("SELECT")]
+
+        login_user = UserDB("HermioneG", self.database)
+        assert login_user.user_id is None
+        ana.check_for_username(login_user)
+        assert login_user.user_id == 2
@@ -0,0 +1,99 @@
+import json
+import sqlite3
+from io import StringIO
+from unittest.mock import patch
+
+import analyze as ana
+import batch
+import db
+import pytest
+import test_data
+from pipe import CommandPipe
+
+
+class TestPipe(test_data.DataForTestingPytest):
+    """This class tests the command pipe provided by the application's pipe module (pipe.py) using the test data it
+    inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def run_pipe(self, commands: list, batch_size: int = 1000):
+        """run json commands through a command pipe connected to the test database
+
+        :param commands: the commands ('dict') to run ('list')
+        :param batch_size: the maximum number of check-offs per commit ('int')
+        :return: the results ('dict') of the commands ('list')
+        """
+        output = StringIO()
+        CommandPipe(self.database, output, batch_size).run(json.dumps(command) + "\n" for command in commands)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_group_commit(self):
+        """test that check-offs are committed in groups and that the results keep the order of the commands"""
+        commands = [{"op": "checkoff", "user": "Voldemort", "habit": "Kill Harry", "at": f"2022-02-0{day} 08:00:00",
+                     "id": day} for day in range(1, 6)]
+        with patch.object(self.database, "commit", wraps=self.database.commit) as mock_commit:
+            results = self.run_pipe(commands, batch_size=2)
+            assert mock_commit.call_count == 3
+        assert [result["id"] for result in results] == [1, 2, 3, 4, 5]
+        assert all(result["ok"] for result in results)
+        assert len(ana.return_completions(self.kill_harry_v)) == 5
+
+    def test_commands(self):
+        """test that habits can be created and their statistics queried and that invalid commands are reported"""
+        results = self.run_pipe([
+            {"op": "create", "user": "RonW", "habit": "Eat", "periodicity": "daily"},
+            {"op": "checkoff", "user": "RonW", "habit": "Eat", "at": "2022-02-01 08:00:00"},
+            {"op": "checkoff", "user": "RonW", "habit": "Sleep", "id": "unknown habit"},
+            {"op": "checkoff", "user": "RonW", "habit": "Eat", "at": "yesterday", "id": "invalid date"},
+            {"op": "stats", "user": "RonW", "habit": "Eat"},
+            {"op": "fly", "id": "unknown operation"}
+        ])
+        assert [result["ok"] for result in results] == [True, True, False, False, True, False]
+        assert results[2]["id"] == "unknown habit"
+        assert results[4]["result"]["last_completion"] == "2022-02-01"
+        assert results[5]["error"] == "Unknown operation: fly"
+
+    def test_database_errors(self):
+        """test that database errors are reported per command and that only invalid check-offs of a group fail"""
+        with patch("batch.create_habits", side_effect=sqlite3.OperationalError("database is locked")):
+            results = self.run_pipe([{"op": "create", "user": "RonW", "habit": "Eat", "periodicity": "daily"},
+                                     {"op": "flush"}])
+        assert results == [{"id": None, "ok": False, "error": "database is locked"}, {"id": None, "ok": True}]
+        output = StringIO()
+        command_pipe = CommandPipe(self.database, output)
+        for habit_name in ["Study", "Read books"]:
+            command_pipe.run_command(json.dumps({"op": "checkoff", "user": "HermioneG", "habit": habit_name,
+                                                 "at": "2022-02-01 08:00:00", "id": habit_name}))
+        db.delete_habit(self.books_hg)  # e.g., deleted by another process
+        command_pipe.flush()
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [(result["id"], result["ok"]) for result in results] == [("Study", True), ("Read books", False)]
+        assert ana.return_completions(self.study_hg)[-1] == "2022-02-01"
+
+    def test_flush_on_error(self):
+        """test that buffered check-offs are committed if reading the commands fails"""
+        def read_commands():
+            yield json.dumps({"op": "checkoff", "user": "Voldemort", "habit": "Kill Harry",
+                              "at": "2022-02-01 08:00:00"})
+            raise OSError("stdin closed")
+
+        output = StringIO()
+        with pytest.raises(OSError):
+            CommandPipe(self.database, output).run(read_commands())
+        assert json.loads(output.getvalue()) == {"id": None, "ok": True}
+        assert ana.return_completions(self.kill_harry_v) == ["2022-02-01"]
+
+    def test_habits_of_other_processes(self, tmp_path):
+        """test that habits created through another connection can be checked off"""
+        database, other_database = db.get_db(str(tmp_path / "habits.db")), db.get_db(str(tmp_path / "habits.db"))
+        batch.create_habits(database, "LunaL", "daily", ["Read"])
+        output = StringIO()
+        command_pipe = CommandPipe(database, output)
+        command_pipe.run_command(json.dumps({"op": "checkoff", "user": "LunaL", "habit": "Read"}))
+        batch.create_habits(other_database, "LunaL", "daily", ["Search Nargles"])
+        command_pipe.run([json.dumps({"op": "checkoff", "user": "LunaL", "habit": "Search Nargles"})])
+        assert [json.loads(line)["ok"] for line in output.getvalue().splitlines()] == [True, True]
+        database.close()
+        other_database.close()
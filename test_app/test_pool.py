@@ -0,0 +1,96 @@
+import threading
+
+import db
+import pytest
+from exceptions import PoolExhausted
+from pool import ConnectionPool
+from user import UserDB
+
+
+class TestPool:
+    """This class tests the connection pool provided by the application's pool module (pool.py) and the settings of
+    the connections to database files."""
+
+    def test_connection_settings(self, tmp_path):
+        """test that database files are used in WAL mode and that in-memory databases keep their journal mode"""
+        database = db.get_db(str(tmp_path / "habits.db"))
+        assert database.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert database.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert database.execute("PRAGMA busy_timeout").fetchone()[0] == db.BUSY_TIMEOUT * 1000
+        assert db.get_db(":memory:").execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        with pytest.raises(ValueError):
+            ConnectionPool(":memory:")
+
+    def test_connection_per_thread(self, tmp_path):
+        """test that a thread uses the same connection in nested contexts and that threads use different
+        connections"""
+        connections = {}
+
+        def lend_connection(thread_name: str):
+            with pool.connection() as database, pool.connection() as nested_database:
+                assert database is nested_database
+                connections[thread_name] = database
+                barrier.wait()
+
+        with ConnectionPool(str(tmp_path / "habits.db"), max_connections=2) as pool:
+            barrier = threading.Barrier(2)
+            threads = [threading.Thread(target=lend_connection, args=(str(number),)) for number in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert connections["0"] is not connections["1"]
+            assert len(pool.connections) == len(pool.idle) == 2
+
+    def test_bounded(self, tmp_path):
+        """test that no more than the maximum number of connections is lent"""
+        with ConnectionPool(str(tmp_path / "habits.db"), max_connections=1, timeout=0.05) as pool:
+            errors = []
+
+            def lend_connection():
+                try:
+                    with pool.connection():
+                        pass
+                except PoolExhausted as e:
+                    errors.append(e)
+
+            with pool.connection():
+                thread = threading.Thread(target=lend_connection)
+                thread.start()
+                thread.join()
+            assert len(errors) == 1
+            lend_connection()  # the connection has been taken back
+            assert len(errors) == 1
+
+    def test_concurrent_writes(self, tmp_path):
+        """test that several threads can store users concurrently and that uncommitted changes are discarded"""
+        with ConnectionPool(str(tmp_path / "habits.db"), max_connections=4) as pool:
+            def add_users(thread_number: int):
+                for user_number in range(20):
+                    with pool.connection() as database:
+                        db.add_user(UserDB(f"user{thread_number}_{user_number}", database))
+
+            threads = [threading.Thread(target=add_users, args=(number,)) for number in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with pool.connection() as database:
+                assert len(db.select_rows(database, "HabitAppUser")) == 160
+                database.execute("DELETE FROM HabitAppUser")  # not committed
+            with pool.connection() as database:
+                assert len(db.select_rows(database, "HabitAppUser")) == 160
+
+    def test_index_refresh(self, tmp_path):
+        """test that the username index of a connection is renewed when the connection is lent again after another
+        connection stored a user"""
+        with ConnectionPool(str(tmp_path / "habits.db"), max_connections=2) as pool:
+            first_database, second_database = pool.acquire(), pool.acquire()
+            assert db.return_username_index(first_database) == {}
+            db.add_user(UserDB("Luna", second_database))
+            assert db.return_username_index(first_database) == {}  # not renewed while the connection is lent
+            pool.release(first_database)
+            pool.release(second_database)
+            database = pool.acquire()
+            assert db.return_username_index(database) == {"Luna": 1}
+            pool.release(database)
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import types
+
+import analyze as ana
+import profiling
+import pytest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestProfiling:
+    """This class tests the profiling hooks provided by the application's profiling module (profiling.py)."""
+
+    @pytest.mark.skipif(profiling.PROFILER is not None, reason="profiling is enabled")
+    def test_disabled(self):
+        """test that no function is wrapped if profiling is disabled"""
+        assert not hasattr(ana.calculate_longest_streak, "profiled")
+
+    def test_instrument_module(self):
+        """test that the calls of a module's public functions are recorded, including calls within the module"""
+        module = types.ModuleType("fake_module")
+        exec("def select_rows(number):\n    return list(range(number))\n\n"
+             "def count_rows(number):\n    return len(select_rows(number))\n\n"
+             "def _helper():\n    return None\n", vars(module))
+        module.sqrt = __import__("math").sqrt  # imported functions are not wrapped
+        profiler = profiling.Profiler()
+        profiling.instrument_module(module, profiler)
+        assert module.select_rows.profiled and module.count_rows.profiled
+        assert not hasattr(module._helper, "profiled") and not hasattr(module.sqrt, "profiled")
+        for number in range(1, 5):
+            assert module.count_rows(number) == number
+        summary = profiler.summarize()
+        assert list(summary) == ["fake_module.count_rows", "fake_module.select_rows"]
+        assert summary["fake_module.select_rows"]["calls"] == 4
+        assert summary["fake_module.select_rows"]["rows"] == 10
+        assert summary["fake_module.count_rows"]["rows"] == 0
+        assert 0 < summary["fake_module.select_rows"]["p50_ms"] <= summary["fake_module.select_rows"]["p99_ms"]
+
+    def test_summarize_while_recording(self):
+        """test that the statistics can be summarized while a call is recorded on the same thread, e.g., by the
+        signal handler which interrupts the main thread"""
+        profiler = profiling.Profiler()
+        summaries = []
+
+        class Rows(list):
+            def __len__(self):  # called while the call is recorded
+                summaries.append(profiler.summarize())
+                return super().__len__()
+
+        select_rows = profiler.wrap(lambda: Rows([1, 2]), "fake_module.select_rows")
+        thread = threading.Thread(target=select_rows, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert len(summaries) == 1
+
+    def test_profile_from_environment(self, tmp_path):
+        """test that profiling is enabled by the environment variable and that the statistics are written at exit"""
+        profile_path = tmp_path / "profile.json"
+        script = ("import db, analyze\n"
+                  "database = db.get_db(':memory:')\n"
+                  "db.check_for_user_data(database)\n"
+                  "analyze.calculate_period_indices('daily', [19024])\n")
+        subprocess.run([sys.executable, "-c", script], cwd=REPOSITORY, check=True,
+                       env=dict(os.environ, **{profiling.ENVIRONMENT_VARIABLE: str(profile_path)}))
+        with open(profile_path) as profile_file:
+            profile = json.load(profile_file)
+        assert profile["db.check_for_user_data"]["calls"] == 1
+        assert profile["db.get_db"]["calls"] == 1
+        assert profile["periods.calculate_period_indices"]["rows"] == 1
+        assert "analyze.calculate_period_indices" not in profile
@@ -0,0 +1,37 @@
+import analyze as ana
+import test_data
+from results import Table
+
+
+class TestResults(test_data.DataForTestingPytest):
+    """This class tests the result types provided by the application's results module (results.py) using the test
+    data it inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def test_render(self):
+        """test that tables are rendered as plain text with aligned columns"""
+        table = Table(["Name", "Streak"], [("Study", 3), ("Read books", 12)], ["first", "second"])
+        assert table.render() == "        Name        Streak\n" \
+                                 "first   Study            3\n" \
+                                 "second  Read books      12"
+        assert table.render(show_index=False) == "Name        Streak\n" \
+                                                 "Study            3\n" \
+                                                 "Read books      12"
+        assert Table(["Name"], []).render() == "Name"
+
+    def test_sort_by(self):
+        """test that the rows of a table can be sorted by a column"""
+        table = Table(["Name", "Periodicity"], [("Study", "weekly"), ("Run", "daily")], ["a", "b"])
+        table = table.sort_by("Periodicity")
+        assert table.column("Name") == ["Run", "Study"]
+        assert table.index == ["b", "a"]
+
+    def test_to_data_frame(self):
+        """test that the analysis of all habits can be converted into a pandas data frame"""
+        comparison_data = ana.analyze_all_habits(self.hermione_g.defined_habits).to_data_frame()
+        assert list(comparison_data.columns) == ["Study", "Read books"]
+        assert list(comparison_data.index) == ana.analysis_index()
+        assert comparison_data.loc["periodicity: ", "Read books"] == "weekly"
+        assert ana.list_to_df(["a"], [1])["Data"].to_list() == [1]
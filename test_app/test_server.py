@@ -0,0 +1,98 @@
+import http.client
+import json
+import threading
+from unittest.mock import patch
+from urllib.parse import quote
+
+import pytest
+import test_data
+from pool import ConnectionPool
+import server
+from server import HabitServer
+
+
+class TestServer:
+    """This class tests the HTTP server provided by the application's server module (server.py) using the test data
+    of the DataForTestingCLI class, which is stored in a database file."""
+
+    @pytest.fixture(autouse=True)
+    def start_server(self, tmp_path):
+        """store the test data in a database file, start the server on a free port and stop it after the test"""
+        database_path = str(tmp_path / "habits.db")
+        test_data.DataForTestingCLI(database_path).database.close()
+        self.server = HabitServer(("127.0.0.1", 0), ConnectionPool(database_path, max_connections=2), max_workers=4)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+        thread.join()
+
+    def request(self, connection, method: str, path: str, body: dict = None):
+        """send a request and return the status and the json content of the response
+
+        :param connection: the client connection ('http.client.HTTPConnection')
+        :param method: the request method ('str')
+        :param path: the path of the request ('str')
+        :param body: the request's content ('dict', optional)
+        :return: a tuple ('tuple') containing the status ('int') and the content ('dict')
+        """
+        connection.request(method, quote(path), body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_endpoints(self):
+        """test that the habits can be listed, checked off and analyzed over one kept-alive connection"""
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+        status, content = self.request(connection, "GET", "/users/HermioneG/habits")
+        assert status == 200
+        assert [habit["name"] for habit in content["habits"]] == ["Study", "Read books"]
+        socket = connection.sock
+        status, content = self.request(connection, "POST", "/users/HermioneG/habits/Study/checkoff",
+                                       {"at": "2022-02-01 08:00:00.000000"})
+        assert (status, content["checked_off"]) == (201, True)
+        status, content = self.request(connection, "GET", "/users/HarryP/habits/Feed Hedwig/analysis")
+        assert status == 200
+        assert content["analysis"]["periodicity"] == "daily"
+        status, content = self.request(connection, "GET", "/users/HarryP/summary")
+        assert status == 200
+        assert "Feed Hedwig" in content["habits"]
+        assert content["summary"]["best_habits"] == ["Feed Hedwig"]
+        assert connection.sock is socket  # the connection was kept alive
+        connection.close()
+
+    def test_errors(self):
+        """test that unknown users, habits and endpoints as well as invalid requests are rejected"""
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+        assert self.request(connection, "GET", "/users/DracoM/habits")[0] == 404
+        assert self.request(connection, "GET", "/users/HarryP/habits/Fly/analysis")[0] == 404
+        assert self.request(connection, "GET", "/habits", {"ignored": True})[0] == 404
+        assert self.request(connection, "POST", "/users/HarryP/habits/Conjuring/checkoff", {"at": "never"})[0] == 400
+        connection.request("POST", "/users/HarryP/habits/Conjuring/checkoff", body="[1, 2]")
+        assert connection.getresponse().status == 400
+        connection.close()
+
+    def test_users_without_completions(self):
+        """test that the summary of users without completed habits contains null values"""
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+        for username in ["RonW", "Voldemort"]:
+            status, content = self.request(connection, "GET", f"/users/{username}/summary")
+            assert status == 200
+            assert content["habits"] == {}
+            assert content["summary"] == {"longest_streak": None, "best_habits": None,
+                                          "lowest_completion_rate": None, "worst_habits": None}
+        status, content = self.request(connection, "GET", "/users/Voldemort/habits/Kill Harry/analysis")
+        assert status == 200
+        assert content["analysis"]["last completion"] is None
+        connection.close()
+
+    def test_internal_error(self):
+        """test that unexpected errors are answered with a json error response and that the connection can still
+        be used"""
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_port)
+        with patch.dict(server.ROUTES, {("GET", "summary", False): lambda user: 1 / 0}), \
+                patch("http.server.BaseHTTPRequestHandler.log_message"):
+            status, content = self.request(connection, "GET", "/users/HarryP/summary")
+        assert (status, content) == (500, {"error": "An internal error occurred."})
+        assert self.request(connection, "GET", "/users/HarryP/summary")[0] == 200
+        connection.close()
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+import analyze as ana
+import test_data
+from snapshot import HabitSnapshot
+
+
+class TestHabitSnapshot(test_data.DataForTestingPytest):
+    """This class tests the habit snapshots provided by the application's snapshot module (snapshot.py)
+    using the test data it inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def test_snapshot_statistics(self):
+        """test whether the snapshot's statistics match the statistics calculated by the analysis module"""
+        for habit in [self.hedwig_hp, self.ginny_hp, self.malfoy_hp, self.kill_voldemort_hp, self.study_hg]:
+            snapshot = HabitSnapshot(habit)
+            assert snapshot.last_completion == max(ana.return_completions(habit))
+            assert snapshot.best_streak == ana.calculate_longest_streak(habit)
+            assert snapshot.current_streak == ana.calculate_curr_streak(habit)
+            assert snapshot.breaks_total == ana.calculate_break_no(habit)
+            if habit.periodicity in ("daily", "weekly"):
+                assert snapshot.completion_rate == ana.calculate_completion_rate(habit)
+
+    def test_snapshot_without_completions(self):
+        """test whether a snapshot can be taken of a habit that has not been completed yet"""
+        snapshot = HabitSnapshot(self.kill_harry_v)
+        assert snapshot.last_completion is None
+        assert snapshot.best_streak == 0
+        assert snapshot.current_streak == 0
+        assert snapshot.breaks_total == 0
+        assert snapshot.completion_rate == 0
+
+    def test_analyze_habit_loads_completions_once(self):
+        """test that a habit's completions are only loaded once when analyzing a habit"""
+        with patch("analyze.return_completion_days", wraps=ana.return_completion_days) as mock_completions:
+            self.hedwig_hp.analyze_habit()
+            assert mock_completions.call_count == 1
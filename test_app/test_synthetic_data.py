@@ -0,0 +1,44 @@
+from datetime import date
+
+import analyze as ana
+import db
+from synthetic_data import SyntheticData
+
+
+class TestSyntheticData:
+    """This class tests the synthetic data generator provided by the application's synthetic data module
+    (synthetic_data.py).
+    """
+
+    def create_database(self, seed: int = 1):
+        """create a database containing a small synthetic population
+
+        :param seed: the seed of the random number generator ('int')
+        :return: a tuple ('tuple') containing the database connection ('sqlite3.connection') and the synthetic data
+        ('synthetic_data.SyntheticData')
+        """
+        database = db.get_db(":memory:")
+        synthetic_data = SyntheticData(no_users=20, habits_per_user=5, no_years=2, end_date=date(2022, 12, 31),
+                                       seed=seed)
+        synthetic_data.create_test_data(database)
+        return database, synthetic_data
+
+    def test_deterministic(self):
+        """test that the same seed always results in the same data and that other seeds result in other data"""
+        database, synthetic_data = self.create_database()
+        completions = db.select_rows(database, "Completions")
+        assert len(completions) == synthetic_data.no_completions > 0
+        assert db.select_rows(self.create_database()[0], "Completions") == completions
+        assert db.select_rows(self.create_database(seed=2)[0], "Completions") != completions
+
+    def test_synthetic_data(self):
+        """test that the generated data can be analyzed and that the streak summaries are stored correctly"""
+        database, synthetic_data = self.create_database()
+        assert len(db.select_rows(database, "HabitAppUser")) == 20
+        assert len(db.select_rows(database, "Habit")) == len(synthetic_data.habits)
+        for habit in synthetic_data.habits:
+            assert db.find_habit_stats(habit) == \
+                   db.calculate_habit_stats(habit.periodicity, ana.return_completion_days(habit))
+        user = synthetic_data.users[0]
+        assert ana.check_for_username(user)
+        assert user.habit_names == [habit.name for habit in synthetic_data.habits if habit.user is user]
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import analyze as ana
+import db
+import pytest
+import test_data
+import tracing
+from exceptions import QueryBudgetExceeded
+
+
+class TestTracing(test_data.DataForTestingPytest):
+    """This class tests the query tracing provided by the application's tracing module (tracing.py) using the test
+    data it inherits from the DataForTestingPytest class.
+
+    Attributes: see the documentation of the DataForTestingPytest class
+    """
+
+    def test_query_budget(self):
+        """test that the number of statements of an operation can be limited"""
+        with tracing.query_budget(self.database, 2):
+            self.hedwig_hp.check_off_habit()
+        with pytest.raises(QueryBudgetExceeded):
+            with tracing.query_budget(self.database, 1):
+                self.hedwig_hp.check_off_habit()
+        assert self.database.tracer is None  # the temporary tracer is removed again
+
+    def test_summary(self):
+        """test that statements are assigned to operations and that repeated queries are flagged"""
+        tracer = tracing.enable_tracing(self.database)
+        with tracing.trace_operation(self.database, "Look at completions"):
+            for _ in range(2):
+                for habit in self.harry_p.defined_habits:
+                    ana.return_completions(habit)
+        with tracing.trace_operation(self.database, "Check off habit"):
+            self.hedwig_hp.check_off_habit()
+        summary = tracer.summarize()
+        assert list(summary) == ["Look at completions", "Check off habit"]
+        assert len(summary["Look at completions"]["repeated_statements"]) == 6
+        assert list(summary["Look at completions"]["repeated_shapes"].values()) == [12]
+        assert summary["Check off habit"]["statements"] == 4  # including BEGIN and COMMIT
+        assert summary["Check off habit"]["latency_ms"] > 0
+        assert "possible N+1" in tracer.report()
+        tracing.disable_tracing(self.database)
+
+    def test_bounded_records(self):
+        """test that only the most recent statements are kept, while the summary covers all statements"""
+        with patch("tracing.MAX_RECORDS", 5):
+            tracer = tracing.enable_tracing(self.database)
+        with tracing.trace_operation(self.database, "Look at completions"):
+            for _ in range(3):
+                ana.return_completions(self.hedwig_hp)
+        assert len(tracer.records) == tracer.no_records == 3
+        for _ in range(4):
+            ana.return_completions(self.hedwig_hp)
+        assert (len(tracer.records), tracer.no_records) == (5, 7)
+        assert tracer.recent_statements(2) == [record[1] for record in tracer.records][3:]
+        summary = tracer.summarize()
+        assert summary["Look at completions"]["statements"] == 3
+        assert summary[tracing.NO_OPERATION]["statements"] == 4
+        tracing.disable_tracing(self.database)
+
+    def test_tracing_from_environment(self):
+        """test that tracing is enabled by the environment variable and that all traced connections are summarized
+        in one report at exit"""
+        assert db.get_db(":memory:").tracer is None
+        with patch.dict("os.environ", {tracing.ENVIRONMENT_VARIABLE: "1"}), \
+                patch("tracing.ENVIRONMENT_TRACERS", []), patch("atexit.register") as mock_register:
+            databases = [db.get_db(":memory:"), db.get_db(":memory:")]
+            assert mock_register.call_count == 1  # one report for all connections
+            assert all(database.tracer is not None for database in databases)
+            for database in databases:
+                db.check_for_user_data(database)
+            assert [record[1] for record in databases[0].tracer.records] == ["SELECT 1 FROM HabitAppUser LIMIT 1"]
+            assert tracing.summarize_tracers(tracing.ENVIRONMENT_TRACERS)[tracing.NO_OPERATION]["repeated_statements"] \
+                == {"SELECT 1 FROM HabitAppUser LIMIT 1": 2}
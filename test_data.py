@@ -74,94 +74,102 @@ class DataForTesting:
         db.add_habit(self.kill_harry_v)
 
     def store_habit_completions(self):
-        """store completion data for the test habits"""
-        db.add_completion(self.study_hg)
-        db.add_completion(self.study_hg, "2021-12-02 07:56:24.999098")
-
-        db.add_completion(self.books_hg, "2021-12-02 07:56:24.999098")
-        db.add_completion(self.books_hg, "2021-12-31 07:56:24.999098")
-
-        db.add_completion(self.hedwig_hp, "2021-12-01 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-01 09:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-02 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-02 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-02 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-04 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-05 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-07 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-08 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-09 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-10 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-11 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-12 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-13 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-14 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-15 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-16 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-17 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-18 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-19 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-20 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-21 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-22 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-23 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-24 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-25 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-26 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-27 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-29 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-30 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, "2021-12-31 07:56:24.999098")
-        db.add_completion(self.hedwig_hp, str(datetime.now() - timedelta(weeks=2, days=2)))
-        db.add_completion(self.hedwig_hp, str(datetime.now() - timedelta(weeks=1, days=1)))
-        db.add_completion(self.hedwig_hp, str(datetime.now() - timedelta(weeks=1)))
-        db.add_completion(self.hedwig_hp, str(datetime.now() - timedelta(weeks=1, days=3)))
-        db.add_completion(self.hedwig_hp, str(datetime.now() - timedelta(weeks=1, days=4)))
-        db.add_completion(self.hedwig_hp, str(datetime.now() - timedelta(weeks=1, days=5)))
-
-        db.add_completion(self.ginny_hp, "2021-11-06 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-07 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-11 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-13 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-14 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-21 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-25 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-27 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-11-28 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-02 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-04 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-05 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-16 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-18 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-19 07:56:24.999098")
-        db.add_completion(self.ginny_hp, "2021-12-30 07:56:24.999098")
-        db.add_completion(self.ginny_hp, str(datetime.now() - timedelta(weeks=1)))
-        db.add_completion(self.ginny_hp, str(datetime.now() - timedelta(weeks=2)))
-
-        db.add_completion(self.quidditch_hp, "2021-11-06 07:56:24.999098")
-        db.add_completion(self.quidditch_hp, "2021-11-13 07:56:24.999098")
-        db.add_completion(self.quidditch_hp, "2021-11-20 07:56:24.999098")
-        db.add_completion(self.quidditch_hp, "2021-12-04 07:56:24.999098")
-        db.add_completion(self.quidditch_hp, "2021-12-11 07:56:24.999098")
-        db.add_completion(self.quidditch_hp, "2021-12-18 07:56:24.999098")
-        db.add_completion(self.quidditch_hp, "2022-01-01 07:56:24.999098")
-
-        db.add_completion(self.malfoy_hp, "2021-06-23 07:56:24.999098")
-        db.add_completion(self.malfoy_hp, "2021-07-06 07:56:24.999098")
-        db.add_completion(self.malfoy_hp, "2021-09-15 07:56:24.999098")
-        db.add_completion(self.malfoy_hp, "2021-10-02 07:56:24.999098")
-        db.add_completion(self.malfoy_hp, "2021-11-17 07:56:24.999098")
-        db.add_completion(self.malfoy_hp, "2021-12-30 07:56:24.999098")
-        db.add_completion(self.malfoy_hp, "2022-01-30 07:56:24.999098")
-        db.add_completion(self.malfoy_hp)
-
-        db.add_completion(self.kill_voldemort_hp, "2022-01-05 07:56:24.999098")
-        db.add_completion(self.kill_voldemort_hp, "2021-12-05 07:56:24.999098")
-
-        db.add_completion(self.hedwig_hp, "2021-12-03 07:56:24.999098")
-
-        db.add_completion(self.ginny_hp, "2021-12-21 07:56:24.999098")
-        db.add_completion(self.ginny_hp)
+        """store completion data for the test habits (all completions of a habit are stored at once)"""
+        db.add_completions(self.study_hg, [
+            None,
+            "2021-12-02 07:56:24.999098"])
+
+        db.add_completions(self.books_hg, [
+            "2021-12-02 07:56:24.999098",
+            "2021-12-31 07:56:24.999098"])
+
+        db.add_completions(self.hedwig_hp, [
+            "2021-12-01 07:56:24.999098",
+            "2021-12-01 09:56:24.999098",
+            "2021-12-02 07:56:24.999098",
+            "2021-12-02 07:56:24.999098",
+            "2021-12-02 07:56:24.999098",
+            "2021-12-04 07:56:24.999098",
+            "2021-12-05 07:56:24.999098",
+            "2021-12-07 07:56:24.999098",
+            "2021-12-08 07:56:24.999098",
+            "2021-12-09 07:56:24.999098",
+            "2021-12-10 07:56:24.999098",
+            "2021-12-11 07:56:24.999098",
+            "2021-12-12 07:56:24.999098",
+            "2021-12-13 07:56:24.999098",
+            "2021-12-14 07:56:24.999098",
+            "2021-12-15 07:56:24.999098",
+            "2021-12-16 07:56:24.999098",
+            "2021-12-17 07:56:24.999098",
+            "2021-12-18 07:56:24.999098",
+            "2021-12-19 07:56:24.999098",
+            "2021-12-20 07:56:24.999098",
+            "2021-12-21 07:56:24.999098",
+            "2021-12-22 07:56:24.999098",
+            "2021-12-23 07:56:24.999098",
+            "2021-12-24 07:56:24.999098",
+            "2021-12-25 07:56:24.999098",
+            "2021-12-26 07:56:24.999098",
+            "2021-12-27 07:56:24.999098",
+            "2021-12-29 07:56:24.999098",
+            "2021-12-30 07:56:24.999098",
+            "2021-12-31 07:56:24.999098",
+            str(datetime.now() - timedelta(weeks=2, days=2)),
+            str(datetime.now() - timedelta(weeks=1, days=1)),
+            str(datetime.now() - timedelta(weeks=1)),
+            str(datetime.now() - timedelta(weeks=1, days=3)),
+            str(datetime.now() - timedelta(weeks=1, days=4)),
+            str(datetime.now() - timedelta(weeks=1, days=5))])
+
+        db.add_completions(self.ginny_hp, [
+            "2021-11-06 07:56:24.999098",
+            "2021-11-07 07:56:24.999098",
+            "2021-11-11 07:56:24.999098",
+            "2021-11-13 07:56:24.999098",
+            "2021-11-14 07:56:24.999098",
+            "2021-11-21 07:56:24.999098",
+            "2021-11-25 07:56:24.999098",
+            "2021-11-27 07:56:24.999098",
+            "2021-11-28 07:56:24.999098",
+            "2021-12-02 07:56:24.999098",
+            "2021-12-04 07:56:24.999098",
+            "2021-12-05 07:56:24.999098",
+            "2021-12-16 07:56:24.999098",
+            "2021-12-18 07:56:24.999098",
+            "2021-12-19 07:56:24.999098",
+            "2021-12-30 07:56:24.999098",
+            str(datetime.now() - timedelta(weeks=1)),
+            str(datetime.now() - timedelta(weeks=2))])
+
+        db.add_completions(self.quidditch_hp, [
+            "2021-11-06 07:56:24.999098",
+            "2021-11-13 07:56:24.999098",
+            "2021-11-20 07:56:24.999098",
+            "2021-12-04 07:56:24.999098",
+            "2021-12-11 07:56:24.999098",
+            "2021-12-18 07:56:24.999098",
+            "2022-01-01 07:56:24.999098"])
+
+        db.add_completions(self.malfoy_hp, [
+            "2021-06-23 07:56:24.999098",
+            "2021-07-06 07:56:24.999098",
+            "2021-09-15 07:56:24.999098",
+            "2021-10-02 07:56:24.999098",
+            "2021-11-17 07:56:24.999098",
+            "2021-12-30 07:56:24.999098",
+            "2022-01-30 07:56:24.999098",
+            None])
+
+        db.add_completions(self.kill_voldemort_hp, [
+            "2022-01-05 07:56:24.999098",
+            "2021-12-05 07:56:24.999098"])
+
+        # completions of several habits can also be stored at once
+        db.add_user_completions(self.harry_p, [
+            ("Feed Hedwig", "2021-12-03 07:56:24.999098"),
+            ("Meet Ginny", "2021-12-21 07:56:24.999098"),
+            ("Meet Ginny", None)])
 
     def create_test_data(self, database):
         """create all test data (i.e., users, habits, and habit completions) for the application
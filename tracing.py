@@ -0,0 +1,328 @@
+"""This module contains the habit tracker's query tracing, an opt-in instrumentation of database connections which
+records every SQL statement, its latency and the high-level operation (e.g., a CLI action) it belongs to. Tracing
+is enabled for all connections created with db.get_db if the environment variable HABIT_TRACKER_TRACE is set
+(e.g., HABIT_TRACKER_TRACE=1 python main.py); one summary of all traced connections is then printed to stderr when
+the application exits. The statements are aggregated per operation, so that long-running processes (e.g., the
+server) do not keep every statement in memory.
+
+The most important functionalities include functions to
+    - record the statements of a connection and their latency
+    - assign the statements to high-level operations
+    - summarize the statements per operation and flag repeated identical queries and repeated query shapes
+      (N+1 patterns)
+    - assert a query budget in tests, e.g., that checking off a habit needs at most two statements
+"""
+
+import atexit
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from exceptions import QueryBudgetExceeded
+
+ENVIRONMENT_VARIABLE = "HABIT_TRACKER_TRACE"
+TRANSACTION_STATEMENTS = ("BEGIN", "COMMIT", "ROLLBACK")
+REPEATED_SHAPE_THRESHOLD = 5  # the number of executions of the same query shape that is flagged as N+1 pattern
+NO_OPERATION = "(no operation)"
+MAX_RECORDS = 10000  # the maximum number of recent statements kept per connection (e.g., for query budgets)
+MAX_STATEMENTS = 1000  # the maximum number of distinct statements counted per operation to flag repeated statements
+
+
+def normalize_statement(statement: str):
+    """return the shape of a statement, i.e., the statement without literal values, so that queries which only
+    differ in their parameters (e.g., N+1 queries) can be identified
+
+    :param statement: the SQL statement ('str')
+    :return: the shape of the statement ('str')
+    """
+    shape = re.sub(r"'(?:[^']|'')*'", "?", statement)
+    shape = re.sub(r"\b\d+(?:\.\d+)?\b", "?", shape)
+    return " ".join(shape.split())
+
+
+class OperationStatistics:
+    """Every OperationStatistics instance aggregates the statements executed within one operation.
+
+    Attributes:
+        statements ('int'): the number of statements (including BEGIN, COMMIT and ROLLBACK)
+        latency ('float'): the total latency of the statements in seconds
+        statement_counts ('collections.Counter'): the number of executions of each query ('str'), counted for at
+                                                  most MAX_STATEMENTS distinct queries
+        shape_counts ('collections.Counter'): the number of executions of each query shape ('str')
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.latency = 0.0
+        self.statement_counts = Counter()
+        self.shape_counts = Counter()
+
+    def record(self, statement: str):
+        """record the execution of a statement
+
+        :param statement: the executed statement ('str')
+        """
+        self.statements += 1
+        if statement.startswith(TRANSACTION_STATEMENTS):
+            return
+        if statement in self.statement_counts or len(self.statement_counts) < MAX_STATEMENTS:
+            self.statement_counts[statement] += 1
+        self.shape_counts[normalize_statement(statement)] += 1
+
+    def merge(self, other):
+        """add the statistics of the same operation recorded by another tracer
+
+        :param other: the other statistics ('tracing.OperationStatistics')
+        """
+        self.statements += other.statements
+        self.latency += other.latency
+        self.statement_counts.update(other.statement_counts)
+        self.shape_counts.update(other.shape_counts)
+
+    def summarize(self):
+        """summarize the statistics
+
+        :return: a dictionary ('dict') containing the number of statements ('int'), the total latency in
+        milliseconds ('float'), the statements executed more than once ('dict' of statement and count) and the query
+        shapes executed at least REPEATED_SHAPE_THRESHOLD times ('dict' of shape and count)
+        """
+        return {
+            "statements": self.statements,
+            "latency_ms": self.latency * 1000,
+            "repeated_statements": {statement: count for statement, count in self.statement_counts.items()
+                                    if count > 1},
+            "repeated_shapes": {shape: count for shape, count in self.shape_counts.items()
+                                if count >= REPEATED_SHAPE_THRESHOLD}
+        }
+
+
+class QueryTracer:
+    """Every QueryTracer instance records the statements executed through one database connection.
+
+    Attributes:
+        records ('collections.deque'): the most recent statements (at most MAX_RECORDS), each a list containing the
+                                       operation ('str'), the statement ('str') and its latency in seconds ('float')
+        no_records ('int'): the number of statements recorded since tracing was enabled
+        statistics ('dict'): the operation names ('str') as keys and the statistics of their statements
+                             ('tracing.OperationStatistics') as values
+        operations ('list'): the stack of the currently running operations ('str')
+    """
+
+    def __init__(self):
+        self.records = deque(maxlen=MAX_RECORDS)
+        self.no_records = 0
+        self.statistics = {}
+        self.operations = [NO_OPERATION]
+
+    def trace(self, statement: str):
+        """record a statement (used as the connection's trace callback)
+
+        :param statement: the executed statement ('str')
+        """
+        self.records.append([self.operations[-1], statement, 0.0])
+        self.no_records += 1
+        self.statistics.setdefault(self.operations[-1], OperationStatistics()).record(statement)
+
+    def add_latency(self, latency: float):
+        """add the time spent executing a statement (or fetching its rows) to the last recorded statement
+
+        :param latency: the time spent in seconds ('float')
+        """
+        if self.records:
+            self.records[-1][2] += latency
+            self.statistics[self.records[-1][0]].latency += latency
+
+    def recent_statements(self, number: int):
+        """return the most recently recorded statements
+
+        :param number: the number of statements ('int'); fewer are returned if they are no longer kept
+        :return: a list ('list') of the statements ('str') in the order of their execution
+        """
+        number = min(number, len(self.records))
+        return [record[1] for record in list(self.records)[len(self.records) - number:]]
+
+    @contextmanager
+    def operation(self, name: str):
+        """assign all statements executed within the context to an operation
+
+        :param name: the name of the operation ('str')
+        """
+        self.operations.append(name)
+        try:
+            yield self
+        finally:
+            self.operations.pop()
+
+    def summarize(self):
+        """summarize the recorded statements per operation
+
+        :return: a dictionary ('dict') with the operation names ('str') as keys and summaries ('dict') as values
+        (see OperationStatistics.summarize)
+        """
+        return summarize_tracers([self])
+
+    def report(self):
+        """return a readable summary of the recorded statements
+
+        :return: the summary ('str')
+        """
+        return create_report([self])
+
+
+def summarize_tracers(tracers: list):
+    """summarize the statements recorded by several tracers per operation
+
+    :param tracers: the tracers ('tracing.QueryTracer') whose statements are to be summarized ('list')
+    :return: a dictionary ('dict') with the operation names ('str') as keys and summaries ('dict') as values
+    (see OperationStatistics.summarize)
+    """
+    statistics = {}
+    for tracer in tracers:
+        for operation, operation_statistics in list(tracer.statistics.items()):
+            statistics.setdefault(operation, OperationStatistics()).merge(operation_statistics)
+    return {operation: operation_statistics.summarize() for operation, operation_statistics in statistics.items()}
+
+
+def create_report(tracers: list):
+    """return a readable summary of the statements recorded by several tracers
+
+    :param tracers: the tracers ('tracing.QueryTracer') whose statements are to be summarized ('list')
+    :return: the summary ('str')
+    """
+    lines = ["SQL trace summary:"]
+    for operation, summary in summarize_tracers(tracers).items():
+        lines.append(f"{operation}: {summary['statements']} statement(s), {summary['latency_ms']:.2f} ms")
+        for statement, count in summary["repeated_statements"].items():
+            lines.append(f"    repeated {count}x: {statement}")
+        for shape, count in summary["repeated_shapes"].items():
+            lines.append(f"    possible N+1, shape executed {count}x: {shape}")
+    return "\n".join(lines)
+
+
+class TracingCursor(sqlite3.Cursor):
+    """This class is used for the cursors of traced connections. It measures the time spent executing statements
+    and fetching their rows and adds it to the statements recorded by the connection's tracer."""
+
+    def execute(self, *args, **kwargs):
+        return self.measure(super().execute, *args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self.measure(super().executemany, *args, **kwargs)
+
+    def fetchone(self):
+        return self.measure(super().fetchone)
+
+    def fetchmany(self, *args, **kwargs):
+        return self.measure(super().fetchmany, *args, **kwargs)
+
+    def fetchall(self):
+        return self.measure(super().fetchall)
+
+    def measure(self, method, *args, **kwargs):
+        """call a method of the cursor and add the time it took to the latency of the executed statement
+
+        :param method: the method ('function') to call
+        :return: the method's return value
+        """
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if self.connection.tracer is not None:
+                self.connection.tracer.add_latency(time.perf_counter() - start)
+
+
+def enable_tracing(database):
+    """enable the tracing of a database connection created with db.get_db
+
+    :param database: the database connection ('db.HabitConnection')
+    :return: the connection's tracer ('tracing.QueryTracer')
+    """
+    if database.tracer is None:
+        database.tracer = QueryTracer()
+        database.set_trace_callback(database.tracer.trace)
+    return database.tracer
+
+
+def disable_tracing(database):
+    """disable the tracing of a database connection
+
+    :param database: the database connection ('db.HabitConnection')
+    """
+    database.set_trace_callback(None)
+    database.tracer = None
+
+
+def tracing_requested():
+    """check whether tracing is requested by the environment variable
+
+    :return: True if tracing is requested, False if not ('bool')
+    """
+    return os.environ.get(ENVIRONMENT_VARIABLE, "") not in ("", "0")
+
+
+# the tracers enabled by the environment variable, which are summarized together when the application exits
+ENVIRONMENT_TRACERS = []
+
+
+def print_environment_report():
+    """print the summary of all connections traced because of the environment variable to stderr (used at exit)"""
+    print(create_report(ENVIRONMENT_TRACERS), file=sys.stderr)
+
+
+def trace_from_environment(database):
+    """enable the tracing of a database connection if it is requested by the environment variable. The statements
+    of all traced connections are summarized in one report, which is printed to stderr when the application exits.
+
+    :param database: the database connection ('db.HabitConnection')
+    """
+    if tracing_requested():
+        if not ENVIRONMENT_TRACERS:
+            atexit.register(print_environment_report)
+        ENVIRONMENT_TRACERS.append(enable_tracing(database))
+
+
+@contextmanager
+def trace_operation(database, name: str):
+    """assign all statements executed within the context to an operation, if the connection is traced
+
+    :param database: the database connection ('sqlite3.connection')
+    :param name: the name of the operation ('str')
+    """
+    tracer = getattr(database, "tracer", None)
+    if tracer is None:
+        yield None
+    else:
+        with tracer.operation(name):
+            yield tracer
+
+
+@contextmanager
+def query_budget(database, max_statements: int, include_transactions: bool = False):
+    """assert that at most the specified number of statements is executed within the context (e.g., in tests)
+
+    :param database: the database connection ('db.HabitConnection')
+    :param max_statements: the maximum number of statements ('int')
+    :param include_transactions: whether BEGIN, COMMIT and ROLLBACK statements are counted ('bool')
+
+    raise:
+        a QueryBudgetExceeded error listing the executed statements if the budget is exceeded (or if more than
+        MAX_RECORDS statements are executed, since they are not all kept)
+    """
+    traced_before = database.tracer is not None
+    tracer = enable_tracing(database)
+    first_record = tracer.no_records
+    try:
+        yield tracer
+    finally:
+        no_records = tracer.no_records - first_record
+        statements = [statement for statement in tracer.recent_statements(no_records)
+                      if include_transactions or not statement.startswith(TRANSACTION_STATEMENTS)]
+        if not traced_before:
+            disable_tracing(database)
+    if len(statements) > max_statements or no_records > MAX_RECORDS:  # not all statements are kept in the latter case
+        raise QueryBudgetExceeded(max_statements, statements)
@@ -1,7 +1,24 @@
+import re
+
 import db
 import analyze as ana
 
 
+def check_username(username: str):
+    """check if a username meets the requirements for usernames:
+        - usernames must contain at least one character
+        - usernames must not contain spaces or '&', '@', or '!'
+
+    :param username: the username to check ('str')
+    :return: the error message ('str') if the username does not meet the requirements, None otherwise
+    """
+    if len(username) == 0:  # at least one character has to be entered
+        return "Please enter at least one character."
+    if re.search("[ &@!]", username) is not None:  # must not contain spaces or '&', '@', or '!'
+        return "Username must not contain spaces or '&', '@', or '!'"
+    return None
+
+
 class User:
     """Every user instance represents one user of the application.
 
@@ -23,21 +40,23 @@ class UserDB(User):
     Attributes:
         username ('str'): the name of the user
         database ('sqlite3.connection'): the database connection which stores user data
+        user_id ('int'): the user's primary key in the database (None until the user is stored or looked up)
     """
 
-    def __init__(self, username: str, database):
+    def __init__(self, username: str, database, user_id: int = None):
         User.__init__(self, username)
         self.database = database
+        self.user_id = user_id
 
     @property
     def defined_habits(self):
         """a list of all the habits ('habit.HabitDB') that the user has created ('list', read-only)"""
-        return ana.habit_creator(self)
+        return list(ana.return_habit_registry(self).values())
 
     @property
     def habit_names(self):
         """a list containing the names ('str') of the user's defined habits ('list', read-only)"""
-        return [habit.name for habit in self.defined_habits]
+        return list(ana.return_habit_registry(self))
 
     @property
     def completed_habits(self):
@@ -48,14 +67,16 @@ class UserDB(User):
     def longest_streak(self):
         """the value of the longest streak of all habits, i.e., the maximum number of consecutive periods in a row
         that a user has completed a habits ('int', read-only)"""
-        longest_streak, _ = ana.calculate_longest_streak_of_all(self.completed_habits)
+        longest_streak, _, _, _ = ana.calculate_user_summary(self)
         return longest_streak
 
     @property
     def best_habit(self):
         """the best habit is defined as the habit(s) with the longest streak, i.e., the habit(s) that have been
         completed the most periods in a row ('str', read-only)"""
-        _, best_habit = ana.calculate_longest_streak_of_all(self.completed_habits)
+        _, best_habit, _, _ = ana.calculate_user_summary(self)
+        if best_habit is None:  # none of the user's habits has been completed
+            return "---"
         best_habit = ", ".join(best_habit)  # separate several habit names with a comma
         return best_habit
 
@@ -64,24 +85,21 @@ class UserDB(User):
         """the value of the lowest completion rate of all habits. The completion rate is defined as
         the percentage of time periods in the last four weeks (full weeks for weekly habits) in which the
         habit was completed at least once."""
-        user_periodicities = ana.return_ordered_periodicities(self)
-        if "daily" in user_periodicities or "weekly" in user_periodicities:  # the completion rate is only calculated
-            # for daily and weekly habits
-            lowest_completion_rate, _ = ana.calculate_worst_completion_rate_of_all(self.completed_habits)
-            return round((lowest_completion_rate*100))
-        else:
+        _, _, lowest_completion_rate, _ = ana.calculate_user_summary(self)
+        if lowest_completion_rate is None:  # the completion rate is only calculated for completed daily and weekly
+            # habits
             return "---"
+        return round((lowest_completion_rate*100))
 
     @property
     def worst_habit(self):
         """the worst habit is the daily or weekly habit with which the user struggled the most last month, i.e.,
         the habit with the lowest completion rate ('str', read-only)"""
-        if self.lowest_completion_rate == "---":  # the completion rate is only calculated for daily and weekly habits
+        _, _, _, worst_habit = ana.calculate_user_summary(self)
+        if worst_habit is None:  # the completion rate is only calculated for completed daily and weekly habits
             return "---"
-        else:
-            _, worst_habit = ana.calculate_worst_completion_rate_of_all(self.completed_habits)
-            worst_habit = ", ".join(worst_habit)
-            return worst_habit
+        worst_habit = ", ".join(worst_habit)
+        return worst_habit
 
     def store_user(self):
         """store the user in the database specified in the 'database' attribute"""
@@ -92,12 +110,11 @@ class UserDB(User):
         only the habits with a certain periodicity (e.g., periodicity = 'daily').
 
         :param periodicity: the periodicity for which information is to be returned ('str', optional)
-        :return: a data frame containing the name, periodicity and creation time of the desired habits
-        ('pandas.core.frame.DataFrame')
+        :return: a table containing the name, periodicity and creation time of the desired habits ('results.Table')
         """
         habit_info = ana.return_habit_info(self, periodicity)
         if not periodicity:
-            habit_info = habit_info.sort_values("Periodicity")
+            habit_info = habit_info.sort_by("Periodicity")
         return habit_info
 
     def analyze_habits(self):
@@ -106,14 +123,15 @@ class UserDB(User):
         of each habit (periodicity, last completion, longest streak, current streak, total breaks, completion
         rate).
 
-        :return: a tuple ('tuple') containing the summary statistics ('pandas.core.frame.DataFrame') as well
-        as the detailed analysis of each habit ('pandas.core.frame.DataFrame')
+        :return: a tuple ('tuple') containing the detailed analysis of each habit ('results.Table') as well
+        as the summary statistics ('results.Table')
         """
         analysis = ["Habit(s) with the longest streak: ", "longest streak of all: ",
                     "Habit(s) with the lowest completion rate (last 4 weeks): ",
                     "lowest completion rate of all: "]
-        data = [self.best_habit, f"{self.longest_streak} period(s)", self.worst_habit,
-                f"{self.lowest_completion_rate} %"]
-        analysis_df = ana.list_to_df(analysis, data)
+        longest_streak, lowest_completion_rate = self.longest_streak, self.lowest_completion_rate
+        data = [self.best_habit, f"{longest_streak} period(s)" if longest_streak is not None else "---",
+                self.worst_habit, f"{lowest_completion_rate} %" if lowest_completion_rate != "---" else "---"]
+        analysis_table = ana.list_to_table(analysis, data)
         habit_comparison = ana.analyze_all_habits(self.defined_habits)
-        return habit_comparison, analysis_df
+        return habit_comparison, analysis_table
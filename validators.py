@@ -1,7 +1,7 @@
 from questionary import Validator, ValidationError
-from user import UserDB
-import re
 import analyze as an
+import db
+from user import check_username
 
 
 # Questionary validators
@@ -30,20 +30,14 @@ class UserNameValidator(Validator):
             a validation error in case the currently entered username does not meet all requirements.
             The user can then make a new entry/modify his/her entry.
         """
-        user = UserDB(document.text, self.database)
-        user_existing = an.check_for_username(user)
-        if len(document.text) == 0:  # at least one character has to be entered
+        error_message = check_username(document.text)
+        if error_message is not None:  # at least one character, no spaces or '&', '@', or '!'
             raise ValidationError(
-                message="Please enter at least one character.",
+                message=error_message,
                 cursor_position=len(document.text),
             )
-        elif re.search("[ &@!]", document.text) is not None:  # must not contain spaces or '&', '@', or '!'
-            raise ValidationError(
-                message="Username must not contain spaces or '&', '@', or '!'",
-                cursor_position=len(document.text),
-            )
-        elif user_existing and self.action_type == "create":  # when creating a new user, the username must
-            # not be in use yet
+        elif self.action_type == "create" and document.text in db.return_username_index(self.database):  # when
+            # creating a new user, the username must not be in use yet
             raise ValidationError(
                 message="Username already existing. Please choose another one.",
                 cursor_position=len(document.text),
@@ -80,7 +74,8 @@ class HabitNameValidator(Validator):
                 message="Please enter at least one character that is not a space.",
                 cursor_position=len(document.text),
             )
-        elif document.text in self.user.habit_names:  # The user must not already have a habit with the same name
+        elif document.text in an.return_habit_registry(self.user):  # The user must not already have a habit with
+            # the same name
             raise ValidationError(
                 message="Habit already existing. Please choose another name.",
                 cursor_position=len(document.text),